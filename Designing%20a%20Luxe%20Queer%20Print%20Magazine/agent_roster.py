@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+
+# Define AI agent team members and their specialties
+AI_AGENTS = {
+    "cohere": {
+        "name": "Cohere Agent",
+        "specialty": "Long-form content generation and semantic search",
+        "tasks": ["research", "article_drafting", "content_enhancement"]
+    },
+    "anthropic": {
+        "name": "Anthropic Claude",
+        "specialty": "Nuanced cultural analysis and ethical considerations",
+        "tasks": ["cultural_analysis", "trend_forecasting", "ethical_review"]
+    },
+    "nvidia": {
+        "name": "NVIDIA AI",
+        "specialty": "Visual content analysis and generation",
+        "tasks": ["image_analysis", "visual_trend_detection", "style_recommendations"]
+    },
+    "hermes": {
+        "name": "Hermes Agent",
+        "specialty": "Multilingual content and international perspectives",
+        "tasks": ["translation", "international_trends", "global_market_analysis"]
+    },
+    "hume": {
+        "name": "Hume AI",
+        "specialty": "Emotional intelligence and reader engagement",
+        "tasks": ["sentiment_analysis", "engagement_optimization", "audience_insights"]
+    },
+    "mistral": {
+        "name": "Mistral AI",
+        "specialty": "Technical writing and technology trend analysis",
+        "tasks": ["tech_reporting", "product_reviews", "technical_accuracy"]
+    },
+    "gemma": {
+        "name": "Gemma Agent",
+        "specialty": "Data analysis and visualization",
+        "tasks": ["data_analysis", "chart_generation", "statistical_insights"]
+    },
+    "huggingface": {
+        "name": "Hugging Face Agent",
+        "specialty": "Content classification and organization",
+        "tasks": ["content_tagging", "categorization", "metadata_enhancement"]
+    },
+    "llama": {
+        "name": "Llama Agent",
+        "specialty": "Creative writing and narrative development",
+        "tasks": ["storytelling", "creative_features", "narrative_structure"]
+    }
+}
+
+# Which agents work on each section, content type and workflow stage
+AGENT_ASSIGNMENT_SYSTEM = {
+    "sections": {
+        "fashion": {
+            "primary_agents": ["cohere", "nvidia", "llama"],
+            "supporting_agents": ["anthropic", "hume"]
+        },
+        "art": {
+            "primary_agents": ["nvidia", "anthropic", "llama"],
+            "supporting_agents": ["huggingface", "cohere"]
+        },
+        "culture": {
+            "primary_agents": ["anthropic", "hermes", "llama"],
+            "supporting_agents": ["hume", "huggingface"]
+        },
+        "travel": {
+            "primary_agents": ["hermes", "cohere", "hume"],
+            "supporting_agents": ["nvidia", "gemma"]
+        },
+        "technology": {
+            "primary_agents": ["mistral", "nvidia", "gemma"],
+            "supporting_agents": ["cohere", "huggingface"]
+        },
+        "luxury": {
+            "primary_agents": ["cohere", "anthropic", "llama"],
+            "supporting_agents": ["nvidia", "hermes"]
+        }
+    },
+    "content_types": {
+        "feature_article": {
+            "primary_agents": ["cohere", "llama", "anthropic"],
+            "supporting_agents": ["huggingface", "hume"]
+        },
+        "interview": {
+            "primary_agents": ["anthropic", "hume", "cohere"],
+            "supporting_agents": ["huggingface", "llama"]
+        },
+        "review": {
+            "primary_agents": ["mistral", "hume", "cohere"],
+            "supporting_agents": ["anthropic", "huggingface"]
+        },
+        "photo_essay": {
+            "primary_agents": ["nvidia", "llama", "cohere"],
+            "supporting_agents": ["anthropic", "huggingface"]
+        },
+        "data_feature": {
+            "primary_agents": ["gemma", "mistral", "cohere"],
+            "supporting_agents": ["huggingface", "nvidia"]
+        },
+        "trend_report": {
+            "primary_agents": ["anthropic", "hume", "mistral"],
+            "supporting_agents": ["gemma", "cohere"]
+        }
+    },
+    "workflow_stages": {
+        "research": ["cohere", "hermes", "huggingface"],
+        "drafting": ["cohere", "llama", "anthropic"],
+        "editing": ["anthropic", "mistral", "hume"],
+        "visual_elements": ["nvidia", "gemma", "huggingface"],
+        "fact_checking": ["mistral", "gemma", "cohere"],
+        "engagement_optimization": ["hume", "cohere", "huggingface"]
+    }
+}
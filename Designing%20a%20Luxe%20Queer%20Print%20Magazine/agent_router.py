@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+
+import json
+import time
+import asyncio
+from collections import deque
+
+class AgentStats:
+    """Rolling latency and outcome statistics for one agent backend"""
+
+    def __init__(self, window=100, alpha=0.2):
+        self.samples = deque(maxlen=window)
+        self.alpha = alpha
+        self.ewma_latency_s = None
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.in_flight = 0
+
+    def record(self, latency_s, outcome):
+        self.calls += 1
+        self.errors += outcome == "error"
+        self.timeouts += outcome == "timeout"
+        self.samples.append((latency_s, outcome))
+        if outcome != "ok":
+            # Failed calls say little about how long a successful one takes
+            return
+        if self.ewma_latency_s is None:
+            self.ewma_latency_s = latency_s
+        else:
+            self.ewma_latency_s = self.alpha * latency_s + (1 - self.alpha) * self.ewma_latency_s
+
+    @property
+    def error_rate(self):
+        if not self.samples:
+            return 0.0
+        return sum(1 for _, outcome in self.samples if outcome != "ok") / len(self.samples)
+
+    def to_dict(self):
+        latencies = sorted(latency for latency, outcome in self.samples if outcome == "ok")
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "in_flight": self.in_flight,
+            "error_rate": self.error_rate,
+            "ewma_latency_s": self.ewma_latency_s,
+            "p50_latency_s": latencies[len(latencies) // 2] if latencies else None,
+            "p95_latency_s": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else None,
+        }
+
+class AgentRouter:
+    def __init__(self, timeout_s=30.0, default_latency_s=1.0, window=100, max_decisions=1000):
+        """Route each task to the eligible agent expected to finish it first.
+
+        Expected completion time is the agent's smoothed latency, plus the
+        queueing delay implied by its in-flight tasks and concurrency limit,
+        inflated by its recent failure rate. The fastest primary agent is
+        tried first; on a timeout or error the task fails over to the
+        supporting agents and then the remaining primaries, best first.
+        Agents with no history are assumed to take default_latency_s.
+        """
+        self.timeout_s = timeout_s
+        self.default_latency_s = default_latency_s
+        self.window = window
+        self.stats = {}
+        self.decisions = deque(maxlen=max_decisions)
+
+    def agent_stats(self, agent_id):
+        if agent_id not in self.stats:
+            self.stats[agent_id] = AgentStats(self.window)
+        return self.stats[agent_id]
+
+    def candidates(self, assignments, stage, article):
+        """Split the agents staffed on stage into (primary, supporting) for this article"""
+        stage_agents = assignments["workflow_stages"][stage]
+        groups = (("sections", article.get("section")), ("content_types", article.get("content_type")))
+
+        def staffed(role):
+            agents = [agent for group, key in groups for agent in assignments.get(group, {}).get(key, {}).get(role, [])]
+            return [agent for agent in dict.fromkeys(agents) if agent in stage_agents]
+
+        primary = staffed("primary_agents") or list(stage_agents)
+        supporting = [agent for agent in staffed("supporting_agents") if agent not in primary]
+        if not supporting:
+            # Nobody in a supporting role is staffed on this stage; fall back to the rest of the stage's agents
+            supporting = [agent for agent in stage_agents if agent not in primary]
+        return primary, supporting
+
+    def expected_completion_s(self, agent_id, limit):
+        stats = self.agent_stats(agent_id)
+        latency = stats.ewma_latency_s if stats.ewma_latency_s is not None else self.default_latency_s
+        queued_ahead = max(0, stats.in_flight - limit + 1)
+        return latency * (1 + queued_ahead / limit) / max(0.05, 1 - stats.error_rate)
+
+    async def execute(self, scheduler, stage, article, inputs):
+        """Run one stage through the scheduler's backend, failing over between agents"""
+        primary, supporting = self.candidates(scheduler.assignments, stage, article)
+
+        def limit(agent_id):
+            return scheduler.agent_limits.get(agent_id, scheduler.default_agent_limit)
+
+        estimates = {agent: self.expected_completion_s(agent, limit(agent)) for agent in primary + supporting}
+        first = min(primary, key=estimates.get)
+        # Supporting agents back up the chosen one first, then any other primary
+        order = [first] + sorted(supporting, key=estimates.get) + sorted(
+            (agent for agent in primary if agent != first), key=estimates.get)
+        decision = {
+            "article": article.get("slug", article.get("title")),
+            "stage": stage,
+            "chosen": first,
+            "estimates_s": estimates,
+            "attempts": [],
+        }
+        self.decisions.append(decision)
+
+        for agent_id in order:
+            stats = self.agent_stats(agent_id)
+            stats.in_flight += 1
+            try:
+                async with scheduler._agent_semaphore(agent_id):
+                    started = time.perf_counter()
+                    try:
+                        output = await asyncio.wait_for(
+                            scheduler.backend.run(agent_id, stage, article, inputs), timeout=self.timeout_s
+                        )
+                        outcome, error = "ok", None
+                    except asyncio.TimeoutError:
+                        output, outcome, error = None, "timeout", f"{agent_id} timed out after {self.timeout_s}s"
+                    except Exception as e:
+                        output, outcome, error = None, "error", str(e)
+                    elapsed = time.perf_counter() - started
+            finally:
+                stats.in_flight -= 1
+            stats.record(elapsed, outcome)
+            decision["attempts"].append({"agent": agent_id, "outcome": outcome, "elapsed_s": elapsed})
+            if outcome == "ok":
+                return {"stage": stage, "agent": agent_id, "status": "completed", "output": output,
+                        "error": None, "elapsed_s": elapsed, "attempts": len(decision["attempts"])}
+
+        return {"stage": stage, "agent": order[-1], "status": "failed", "output": None,
+                "error": error, "elapsed_s": elapsed, "attempts": len(decision["attempts"])}
+
+    def export_stats(self, path=None):
+        """Return per-agent stats and recent routing decisions, optionally writing them as JSON"""
+        report = {
+            "agents": {agent_id: stats.to_dict() for agent_id, stats in sorted(self.stats.items())},
+            "failovers": sum(1 for decision in self.decisions if len(decision["attempts"]) > 1),
+            "decisions": list(self.decisions),
+        }
+        if path:
+            with open(path, 'w') as f:
+                json.dump(report, f, indent=2)
+        return report
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+
+import json
+import time
+import random
+import asyncio
+from graphlib import TopologicalSorter
+
+# Which workflow stages must finish before a stage can start
+STAGE_DEPENDENCIES = {
+    "research": [],
+    "drafting": ["research"],
+    "editing": ["drafting"],
+    "visual_elements": ["drafting"],
+    "fact_checking": ["editing"],
+    "engagement_optimization": ["fact_checking", "visual_elements"],
+}
+
+def load_assignment_system(assignments):
+    """Accept the assignment mapping as a dict or a path to ai_agent_assignments.json"""
+    if isinstance(assignments, dict):
+        return assignments
+    with open(assignments, 'r') as f:
+        return json.load(f)
+
+def build_stage_dag(assignments, dependencies=STAGE_DEPENDENCIES):
+    """Return {stage: [prerequisite stages]} for the stages the assignment system staffs.
+
+    Prerequisites that are not staffed are skipped over, so removing a stage
+    from the mapping keeps the rest of the ordering intact.
+    """
+    stages = list(assignments["workflow_stages"])
+
+    def staffed_prerequisites(stage, seen=()):
+        prerequisites = []
+        for dependency in dependencies.get(stage, []):
+            if dependency in seen:
+                raise ValueError(f"Workflow stage cycle through {dependency}")
+            if dependency in assignments["workflow_stages"]:
+                prerequisites.append(dependency)
+            else:
+                prerequisites.extend(staffed_prerequisites(dependency, seen + (stage,)))
+        return prerequisites
+
+    dag = {stage: sorted(set(staffed_prerequisites(stage))) for stage in stages}
+    # Raises graphlib.CycleError on cyclic dependencies
+    tuple(TopologicalSorter(dag).static_order())
+    return dag
+
+def eligible_agents(assignments, stage, article):
+    """Agents staffed on stage, ordered by how well they fit the article's section and content type"""
+    stage_agents = assignments["workflow_stages"][stage]
+    groups = (("sections", article.get("section")), ("content_types", article.get("content_type")))
+    preferred = [
+        agent
+        for role in ("primary_agents", "supporting_agents")
+        for group, key in groups
+        for agent in assignments.get(group, {}).get(key, {}).get(role, [])
+    ]
+    ranked = [agent for agent in dict.fromkeys(preferred) if agent in stage_agents]
+    return ranked + [agent for agent in stage_agents if agent not in ranked]
+
+def first_eligible_agent(assignments, stage, article):
+    return eligible_agents(assignments, stage, article)[0]
+
+class StubAgentBackend:
+    """Offline stand-in for the agent APIs: sleeps for a per-agent latency and echoes a result"""
+
+    def __init__(self, latency_ms=None, default_latency_ms=50, jitter=0.2, error_rate=0.0, seed=0):
+        self.latency_ms = latency_ms or {}
+        self.default_latency_ms = default_latency_ms
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.calls = 0
+
+    async def run(self, agent_id, stage, article, inputs):
+        self.calls += 1
+        latency = self.latency_ms.get(agent_id, self.default_latency_ms) / 1000.0
+        await asyncio.sleep(latency * (1 + self.rng.uniform(-self.jitter, self.jitter)))
+        if self.error_rate and self.rng.random() < self.error_rate:
+            raise RuntimeError(f"{agent_id} failed on {stage}")
+        return f"[{agent_id}] {stage} for {article.get('title', article.get('slug', 'article'))}"
+
+class AgentTaskScheduler:
+    def __init__(self, assignments, backend, agent_limits=None, default_agent_limit=2,
+                 max_concurrent_articles=None, select_agent=None, router=None):
+        """Run every article in a plan through the workflow stage DAG.
+
+        Stages of one article start as soon as their prerequisites finish, and
+        different articles progress independently. Each agent handles at most
+        its entry in agent_limits (default_agent_limit otherwise) tasks at
+        once. select_agent(assignments, stage, article) picks the agent for a
+        task and may be a coroutine function; by default the best-fitting
+        staffed agent is used. A router (see agent_router.AgentRouter) takes
+        over agent choice and failover instead.
+        """
+        self.assignments = load_assignment_system(assignments)
+        self.dag = build_stage_dag(self.assignments)
+        self.backend = backend
+        self.agent_limits = agent_limits or {}
+        self.default_agent_limit = default_agent_limit
+        self.max_concurrent_articles = max_concurrent_articles
+        self.select_agent = select_agent or first_eligible_agent
+        self.router = router
+        self._agent_semaphores = {}
+
+    def _agent_semaphore(self, agent_id):
+        if agent_id not in self._agent_semaphores:
+            limit = self.agent_limits.get(agent_id, self.default_agent_limit)
+            self._agent_semaphores[agent_id] = asyncio.Semaphore(limit)
+        return self._agent_semaphores[agent_id]
+
+    async def _run_stage(self, stage, article, prerequisites):
+        results = await asyncio.gather(*prerequisites.values())
+        inputs = dict(zip(prerequisites, results))
+        if any(result["status"] != "completed" for result in results):
+            return {"stage": stage, "agent": None, "status": "skipped", "output": None, "error": "prerequisite failed"}
+
+        if self.router is not None:
+            return await self.router.execute(self, stage, article, {k: v["output"] for k, v in inputs.items()})
+
+        agent_id = self.select_agent(self.assignments, stage, article)
+        if asyncio.iscoroutine(agent_id):
+            agent_id = await agent_id
+        async with self._agent_semaphore(agent_id):
+            started = time.perf_counter()
+            try:
+                output = await self.backend.run(agent_id, stage, article, {k: v["output"] for k, v in inputs.items()})
+                status, error = "completed", None
+            except Exception as e:
+                output, status, error = None, "failed", str(e)
+            elapsed = time.perf_counter() - started
+        return {"stage": stage, "agent": agent_id, "status": status, "output": output, "error": error, "elapsed_s": elapsed}
+
+    async def run_article(self, article):
+        """Schedule one article's stages; returns {stage: result}"""
+        tasks = {}
+        for stage in TopologicalSorter(self.dag).static_order():
+            prerequisites = {dependency: tasks[dependency] for dependency in self.dag[stage]}
+            tasks[stage] = asyncio.ensure_future(self._run_stage(stage, article, prerequisites))
+        results = await asyncio.gather(*tasks.values())
+        return dict(zip(tasks, results))
+
+    async def run(self, articles):
+        """Run all articles concurrently; returns one {"article", "stages"} dict per article, in order"""
+        # Semaphores belong to the running event loop, so start each run with fresh ones
+        self._agent_semaphores = {}
+        article_limit = asyncio.Semaphore(self.max_concurrent_articles) if self.max_concurrent_articles else None
+
+        async def run_one(article):
+            if article_limit is None:
+                return {"article": article, "stages": await self.run_article(article)}
+            async with article_limit:
+                return {"article": article, "stages": await self.run_article(article)}
+
+        return await asyncio.gather(*(run_one(article) for article in articles))
+
+def summarize_run(results, elapsed_s):
+    """Task counts, throughput and per-agent busy time for a scheduler run"""
+    tasks = [stage for result in results for stage in result["stages"].values()]
+    per_agent = {}
+    for task in tasks:
+        if task["agent"]:
+            stats = per_agent.setdefault(task["agent"], {"tasks": 0, "busy_s": 0.0})
+            stats["tasks"] += 1
+            stats["busy_s"] += task.get("elapsed_s", 0.0)
+    completed = sum(1 for task in tasks if task["status"] == "completed")
+    return {
+        "articles": len(results),
+        "tasks": len(tasks),
+        "completed": completed,
+        "failed": sum(1 for task in tasks if task["status"] == "failed"),
+        "skipped": sum(1 for task in tasks if task["status"] == "skipped"),
+        "elapsed_s": elapsed_s,
+        "tasks_per_second": completed / elapsed_s if elapsed_s else 0.0,
+        "agents": per_agent,
+    }
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import hashlib
+from issue_html_renderer import CompiledTemplate
+
+# Markdown, so nothing is HTML-escaped
+WORKFLOW_DOCUMENT = CompiledTemplate("""# Luxe Queer Magazine - AI Agent Team Workflow
+
+## Overview
+This document outlines the integration of an AI agent team into the content creation process for Luxe Queer magazine. The team consists of specialized AI agents from various companies, each contributing their unique capabilities to enhance the magazine's content while maintaining human oversight and editorial direction.
+
+## AI Agent Team Members
+
+{agent_team}
+
+## Workflow Stage Staffing
+
+{stage_staffing}
+## Content Creation Workflow
+
+### 1. Content Planning Phase
+- **Human Editors**: Define issue themes, section focus areas, and specific article topics
+- **AI Support**:
+  - Mistral AI: Provide technology trend analysis for upcoming topics
+  - Anthropic Claude: Analyze cultural relevance and ethical considerations
+  - Hume AI: Provide audience engagement predictions for proposed topics
+
+### 2. Research Phase
+- **Human Researchers**: Define research questions and evaluate sources
+- **AI Support**:
+  - Cohere Agent: Conduct semantic search across relevant sources
+  - Hugging Face Agent: Organize and categorize research findings
+  - Hermes Agent: Provide international perspectives and multilingual research
+
+### 3. Content Creation Phase
+- **Human Writers**: Develop article outlines, provide creative direction, and maintain brand voice
+- **AI Support**:
+  - Llama Agent: Generate creative narrative structures and storytelling elements
+  - Cohere Agent: Draft initial content based on research and outlines
+  - Anthropic Claude: Ensure cultural sensitivity and ethical representation
+
+### 4. Visual Content Phase
+- **Human Designers**: Direct visual aesthetic, select key imagery, and maintain brand identity
+- **AI Support**:
+  - NVIDIA AI: Analyze visual trends and suggest complementary imagery
+  - Gemma Agent: Generate data visualizations and infographics
+  - Hugging Face Agent: Tag and categorize visual assets
+
+### 5. Editing and Refinement Phase
+- **Human Editors**: Provide critical feedback, ensure quality standards, and approve final content
+- **AI Support**:
+  - Mistral AI: Check technical accuracy in technology articles
+  - Hume AI: Analyze emotional impact and reader engagement
+  - Cohere Agent: Enhance prose and stylistic elements
+
+### 6. Publication Preparation Phase
+- **Human Production Team**: Finalize layout, approve print-ready files, and manage publication
+- **AI Support**:
+  - Gemma Agent: Optimize content organization and metadata
+  - Hermes Agent: Prepare content for international audiences
+  - Hugging Face Agent: Ensure consistent tagging and categorization
+
+## AI Content Attribution Guidelines
+
+1. **Transparency Level**:
+   - **Full Disclosure**: Articles primarily written by AI with human editing
+   - **Collaborative Attribution**: Content co-created by human writers and AI
+   - **Tool Attribution**: AI used as a research or enhancement tool only
+
+2. **Attribution Format**:
+   - Articles with significant AI contribution will include the note: "This article was created in collaboration with [AI Agent Name]"
+   - The masthead will include an "AI Contributors" section listing the AI agents involved in each issue
+   - A dedicated page on the website will explain the AI collaboration process
+
+3. **Quality Control Process**:
+   - All AI-generated content must pass through human editorial review
+   - Content must meet the same quality standards as human-written content
+   - Final approval authority always rests with human editors
+
+## Implementation Technical Details
+
+### API Integration
+- Each AI agent will be integrated via their respective APIs
+- A central orchestration system will manage workflow and agent assignments
+- Content will be stored and managed in Ghost CMS
+
+### Content Tagging
+- All content will include metadata indicating AI involvement level
+- Ghost CMS tags will be used to track AI contribution types
+- Internal tags will facilitate workflow management
+
+### Monitoring and Evaluation
+- Regular quality assessments of AI contributions
+- Performance metrics tracking for each AI agent
+- Feedback loop for continuous improvement
+
+## Ethical Guidelines
+
+1. **Authenticity**: Maintain transparency about AI involvement in content creation
+2. **Representation**: Ensure AI-generated content upholds diverse and authentic queer perspectives
+3. **Human Oversight**: Preserve human creative direction and editorial judgment
+4. **Quality Standards**: Hold AI-generated content to the same high standards as human content
+5. **Privacy**: Respect data privacy in AI training and implementation
+
+This workflow is designed to leverage the strengths of both human creativity and AI capabilities, creating a sophisticated publication that speaks directly to affluent queer individuals seeking luxury content that reflects their identity and interests.
+""", safe=("agent_team", "stage_staffing"))
+
+AGENT_ENTRY = CompiledTemplate("""### {name}
+- **Specialty**: {specialty}
+- **Key Tasks**:
+{tasks}
+""", safe=("name", "specialty", "tasks"))
+
+TASK_ENTRY = CompiledTemplate("""  - {task}
+""", safe=("task",))
+
+STAGE_ENTRY = CompiledTemplate("""- **{stage}**: {agents}
+""", safe=("stage", "agents"))
+
+# The last rendered document by roster/assignment digest; only one is kept, so
+# a long-running process that keeps editing assignments doesn't grow it
+_rendered = {}
+
+def workflow_inputs_digest(agents, assignments):
+    """Stable hash of everything the workflow document is rendered from"""
+    payload = json.dumps({"agents": agents, "assignments": assignments}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def format_agent_team_list(agents):
+    """Markdown section describing each agent, its specialty and tasks"""
+    return "".join(
+        AGENT_ENTRY.render(
+            name=agent['name'],
+            specialty=agent['specialty'],
+            tasks="".join(TASK_ENTRY.render(task=task.replace('_', ' ').title()) for task in agent['tasks']),
+        )
+        for agent in agents.values()
+    )
+
+def format_stage_staffing(agents, assignments):
+    """Markdown list of the agents staffed on each workflow stage"""
+    return "".join(
+        STAGE_ENTRY.render(
+            stage=stage.replace('_', ' ').title(),
+            agents=", ".join(agents[agent_id]['name'] if agent_id in agents else agent_id for agent_id in stage_agents),
+        )
+        for stage, stage_agents in assignments.get("workflow_stages", {}).items()
+    )
+
+def render_workflow_document(agents, assignments):
+    """Render the workflow document, reusing the last rendering for the same roster and assignments"""
+    digest = workflow_inputs_digest(agents, assignments)
+    if digest not in _rendered:
+        document = WORKFLOW_DOCUMENT.render(
+            agent_team=format_agent_team_list(agents),
+            stage_staffing=format_stage_staffing(agents, assignments),
+        )
+        _rendered.clear()
+        _rendered[digest] = document
+    return _rendered[digest]
+
+def write_if_changed(path, text):
+    """Write text to path unless the file already holds exactly that; returns whether it was written"""
+    data = text.encode('utf-8')
+    if os.path.exists(path) and os.path.getsize(path) == len(data):
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return True
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Agent Workflow Document Test Script for Luxe Queer Magazine
+Checks the rendering cache and the write-if-changed behaviour offline
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import agent_workflow_document
+from ai_integration import AIAgentTeamIntegration
+
+def test_workflow_document_cached_and_not_rewritten(tmp_path, monkeypatch):
+    """Test that a second render is a cache hit and an unchanged document is not rewritten"""
+    print("\n===== Testing Workflow Document Cache =====")
+
+    renders = []
+    original_render = agent_workflow_document.WORKFLOW_DOCUMENT.render
+    monkeypatch.setattr(agent_workflow_document, "_rendered", {})
+    monkeypatch.setattr(agent_workflow_document.WORKFLOW_DOCUMENT, "render",
+                        lambda **fields: renders.append(fields) or original_render(**fields))
+
+    integration = AIAgentTeamIntegration(None, str(tmp_path))
+    path = integration.create_agent_workflow_document()
+    first = os.stat(path)
+    with open(path, 'r') as f:
+        document = f.read()
+    assert "Workflow Stage Staffing" in document
+    assert integration.ai_agents["cohere"]["name"] in document
+
+    assert integration.create_agent_workflow_document() == path
+    second = os.stat(path)
+    assert len(renders) == 1 and len(agent_workflow_document._rendered) == 1
+    print("✓ Second render served from the cache")
+    assert (second.st_ino, second.st_mtime_ns) == (first.st_ino, first.st_mtime_ns)
+    print("✓ Unchanged document left untouched on disk")
+
+    integration.ai_agents["cohere"]["specialty"] = "Research, darling"
+    integration.create_agent_workflow_document()
+    assert len(renders) == 2 and len(agent_workflow_document._rendered) == 1
+    with open(path, 'r') as f:
+        assert "Research, darling" in f.read()
+    assert not os.path.exists(f"{path}.tmp")
+    print("✓ Roster changes re-render and rewrite the document, replacing the cached one")
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
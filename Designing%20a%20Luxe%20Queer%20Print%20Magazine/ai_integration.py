@@ -1,9 +1,13 @@
 #!/usr/bin/env python3
 
 import os
+import copy
 import json
 import requests
 from ghost_api_client import GhostApiClient
+from agent_roster import AI_AGENTS, AGENT_ASSIGNMENT_SYSTEM
+from agent_scheduler import AgentTaskScheduler
+from agent_workflow_document import render_workflow_document, format_agent_team_list, write_if_changed
 
 class AIAgentTeamIntegration:
     def __init__(self, client, output_dir):
@@ -15,242 +19,35 @@ class AIAgentTeamIntegration:
         os.makedirs(output_dir, exist_ok=True)
         
         # Define AI agent team members and their specialties
-        self.ai_agents = {
-            "cohere": {
-                "name": "Cohere Agent",
-                "specialty": "Long-form content generation and semantic search",
-                "tasks": ["research", "article_drafting", "content_enhancement"]
-            },
-            "anthropic": {
-                "name": "Anthropic Claude",
-                "specialty": "Nuanced cultural analysis and ethical considerations",
-                "tasks": ["cultural_analysis", "trend_forecasting", "ethical_review"]
-            },
-            "nvidia": {
-                "name": "NVIDIA AI",
-                "specialty": "Visual content analysis and generation",
-                "tasks": ["image_analysis", "visual_trend_detection", "style_recommendations"]
-            },
-            "hermes": {
-                "name": "Hermes Agent",
-                "specialty": "Multilingual content and international perspectives",
-                "tasks": ["translation", "international_trends", "global_market_analysis"]
-            },
-            "hume": {
-                "name": "Hume AI",
-                "specialty": "Emotional intelligence and reader engagement",
-                "tasks": ["sentiment_analysis", "engagement_optimization", "audience_insights"]
-            },
-            "mistral": {
-                "name": "Mistral AI",
-                "specialty": "Technical writing and technology trend analysis",
-                "tasks": ["tech_reporting", "product_reviews", "technical_accuracy"]
-            },
-            "gemma": {
-                "name": "Gemma Agent",
-                "specialty": "Data analysis and visualization",
-                "tasks": ["data_analysis", "chart_generation", "statistical_insights"]
-            },
-            "huggingface": {
-                "name": "Hugging Face Agent",
-                "specialty": "Content classification and organization",
-                "tasks": ["content_tagging", "categorization", "metadata_enhancement"]
-            },
-            "llama": {
-                "name": "Llama Agent",
-                "specialty": "Creative writing and narrative development",
-                "tasks": ["storytelling", "creative_features", "narrative_structure"]
-            }
-        }
+        self.ai_agents = copy.deepcopy(AI_AGENTS)
     
     def create_agent_workflow_document(self):
         """Create a document outlining the AI agent team workflow"""
-        workflow_doc = f"""# Luxe Queer Magazine - AI Agent Team Workflow
-
-## Overview
-This document outlines the integration of an AI agent team into the content creation process for Luxe Queer magazine. The team consists of specialized AI agents from various companies, each contributing their unique capabilities to enhance the magazine's content while maintaining human oversight and editorial direction.
-
-## AI Agent Team Members
-
-{self._format_agent_team_list()}
-
-## Content Creation Workflow
-
-### 1. Content Planning Phase
-- **Human Editors**: Define issue themes, section focus areas, and specific article topics
-- **AI Support**:
-  - Mistral AI: Provide technology trend analysis for upcoming topics
-  - Anthropic Claude: Analyze cultural relevance and ethical considerations
-  - Hume AI: Provide audience engagement predictions for proposed topics
-
-### 2. Research Phase
-- **Human Researchers**: Define research questions and evaluate sources
-- **AI Support**:
-  - Cohere Agent: Conduct semantic search across relevant sources
-  - Hugging Face Agent: Organize and categorize research findings
-  - Hermes Agent: Provide international perspectives and multilingual research
-
-### 3. Content Creation Phase
-- **Human Writers**: Develop article outlines, provide creative direction, and maintain brand voice
-- **AI Support**:
-  - Llama Agent: Generate creative narrative structures and storytelling elements
-  - Cohere Agent: Draft initial content based on research and outlines
-  - Anthropic Claude: Ensure cultural sensitivity and ethical representation
-
-### 4. Visual Content Phase
-- **Human Designers**: Direct visual aesthetic, select key imagery, and maintain brand identity
-- **AI Support**:
-  - NVIDIA AI: Analyze visual trends and suggest complementary imagery
-  - Gemma Agent: Generate data visualizations and infographics
-  - Hugging Face Agent: Tag and categorize visual assets
-
-### 5. Editing and Refinement Phase
-- **Human Editors**: Provide critical feedback, ensure quality standards, and approve final content
-- **AI Support**:
-  - Mistral AI: Check technical accuracy in technology articles
-  - Hume AI: Analyze emotional impact and reader engagement
-  - Cohere Agent: Enhance prose and stylistic elements
-
-### 6. Publication Preparation Phase
-- **Human Production Team**: Finalize layout, approve print-ready files, and manage publication
-- **AI Support**:
-  - Gemma Agent: Optimize content organization and metadata
-  - Hermes Agent: Prepare content for international audiences
-  - Hugging Face Agent: Ensure consistent tagging and categorization
-
-## AI Content Attribution Guidelines
-
-1. **Transparency Level**:
-   - **Full Disclosure**: Articles primarily written by AI with human editing
-   - **Collaborative Attribution**: Content co-created by human writers and AI
-   - **Tool Attribution**: AI used as a research or enhancement tool only
-
-2. **Attribution Format**:
-   - Articles with significant AI contribution will include the note: "This article was created in collaboration with [AI Agent Name]"
-   - The masthead will include an "AI Contributors" section listing the AI agents involved in each issue
-   - A dedicated page on the website will explain the AI collaboration process
-
-3. **Quality Control Process**:
-   - All AI-generated content must pass through human editorial review
-   - Content must meet the same quality standards as human-written content
-   - Final approval authority always rests with human editors
-
-## Implementation Technical Details
-
-### API Integration
-- Each AI agent will be integrated via their respective APIs
-- A central orchestration system will manage workflow and agent assignments
-- Content will be stored and managed in Ghost CMS
-
-### Content Tagging
-- All content will include metadata indicating AI involvement level
-- Ghost CMS tags will be used to track AI contribution types
-- Internal tags will facilitate workflow management
-
-### Monitoring and Evaluation
-- Regular quality assessments of AI contributions
-- Performance metrics tracking for each AI agent
-- Feedback loop for continuous improvement
-
-## Ethical Guidelines
-
-1. **Authenticity**: Maintain transparency about AI involvement in content creation
-2. **Representation**: Ensure AI-generated content upholds diverse and authentic queer perspectives
-3. **Human Oversight**: Preserve human creative direction and editorial judgment
-4. **Quality Standards**: Hold AI-generated content to the same high standards as human content
-5. **Privacy**: Respect data privacy in AI training and implementation
-
-This workflow is designed to leverage the strengths of both human creativity and AI capabilities, creating a sophisticated publication that speaks directly to affluent queer individuals seeking luxury content that reflects their identity and interests.
-"""
+        workflow_doc = render_workflow_document(self.ai_agents, self.get_agent_assignment_system())
         
-        # Save the workflow document
+        # Save the workflow document, leaving it untouched if nothing changed
         workflow_path = os.path.join(self.output_dir, 'ai_agent_workflow.md')
-        with open(workflow_path, 'w') as f:
-            f.write(workflow_doc)
-        
-        print(f"AI agent workflow document created: {workflow_path}")
+        if write_if_changed(workflow_path, workflow_doc):
+            print(f"AI agent workflow document created: {workflow_path}")
+        else:
+            print(f"AI agent workflow document unchanged: {workflow_path}")
         return workflow_path
     
     def _format_agent_team_list(self):
         """Format the AI agent team list for the workflow document"""
-        formatted_list = ""
-        
-        for agent_id, agent in self.ai_agents.items():
-            formatted_list += f"### {agent['name']}\n"
-            formatted_list += f"- **Specialty**: {agent['specialty']}\n"
-            formatted_list += "- **Key Tasks**:\n"
-            
-            for task in agent['tasks']:
-                formatted_list += f"  - {task.replace('_', ' ').title()}\n"
-            
-            formatted_list += "\n"
-        
-        return formatted_list
+        return format_agent_team_list(self.ai_agents)
+    
+    def get_agent_assignment_system(self):
+        """Return the mapping from sections, content types and workflow stages to agents"""
+        return copy.deepcopy(AGENT_ASSIGNMENT_SYSTEM)
+    
+    def create_agent_scheduler(self, backend, **kwargs):
+        """Create an AgentTaskScheduler that dispatches workflow stages to agents via backend"""
+        return AgentTaskScheduler(self.get_agent_assignment_system(), backend, **kwargs)
     
     def create_agent_assignment_system(self):
         """Create a system for assigning content tasks to AI agents"""
-        assignment_system = {
-            "sections": {
-                "fashion": {
-                    "primary_agents": ["cohere", "nvidia", "llama"],
-                    "supporting_agents": ["anthropic", "hume"]
-                },
-                "art": {
-                    "primary_agents": ["nvidia", "anthropic", "llama"],
-                    "supporting_agents": ["huggingface", "cohere"]
-                },
-                "culture": {
-                    "primary_agents": ["anthropic", "hermes", "llama"],
-                    "supporting_agents": ["hume", "huggingface"]
-                },
-                "travel": {
-                    "primary_agents": ["hermes", "cohere", "hume"],
-                    "supporting_agents": ["nvidia", "gemma"]
-                },
-                "technology": {
-                    "primary_agents": ["mistral", "nvidia", "gemma"],
-                    "supporting_agents": ["cohere", "huggingface"]
-                },
-                "luxury": {
-                    "primary_agents": ["cohere", "anthropic", "llama"],
-                    "supporting_agents": ["nvidia", "hermes"]
-                }
-            },
-            "content_types": {
-                "feature_article": {
-                    "primary_agents": ["cohere", "llama", "anthropic"],
-                    "supporting_agents": ["huggingface", "hume"]
-                },
-                "interview": {
-                    "primary_agents": ["anthropic", "hume", "cohere"],
-                    "supporting_agents": ["huggingface", "llama"]
-                },
-                "review": {
-                    "primary_agents": ["mistral", "hume", "cohere"],
-                    "supporting_agents": ["anthropic", "huggingface"]
-                },
-                "photo_essay": {
-                    "primary_agents": ["nvidia", "llama", "cohere"],
-                    "supporting_agents": ["anthropic", "huggingface"]
-                },
-                "data_feature": {
-                    "primary_agents": ["gemma", "mistral", "cohere"],
-                    "supporting_agents": ["huggingface", "nvidia"]
-                },
-                "trend_report": {
-                    "primary_agents": ["anthropic", "hume", "mistral"],
-                    "supporting_agents": ["gemma", "cohere"]
-                }
-            },
-            "workflow_stages": {
-                "research": ["cohere", "hermes", "huggingface"],
-                "drafting": ["cohere", "llama", "anthropic"],
-                "editing": ["anthropic", "mistral", "hume"],
-                "visual_elements": ["nvidia", "gemma", "huggingface"],
-                "fact_checking": ["mistral", "gemma", "cohere"],
-                "engagement_optimization": ["hume", "cohere", "huggingface"]
-            }
-        }
+        assignment_system = self.get_agent_assignment_system()
         
         # Save the assignment system
         assignment_path = os.path.join(self.output_dir, 'ai_agent_assignments.json')
@@ -301,5 +98,28 @@ This workflow is designed to leverage the strengths of both human creativity and
         
         <h2>The Privacy Paradox</h2>
         
-        <p>For affluent queer consumers, the tension between visibility and privacy creates unique challenges and opportunities in the luxury technology space. While many embrace the visibility afforded by social platforms and digital communities, others value technologies that protect p
-(Content truncated due to size limit. Use line ranges to read in chunks)
\ No newline at end of file
+        <p>For affluent queer consumers, the tension between visibility and privacy creates unique challenges and opportunities in the luxury technology space.</p>
+        
+        <!-- PLACEHOLDER: the rest of this section is to be supplied by the editorial team -->
+        """
+        
+        # Save the sample article
+        article_path = os.path.join(self.output_dir, 'sample_ai_enhanced_article.html')
+        with open(article_path, 'w') as f:
+            f.write(article_html)
+        
+        print(f"Sample AI-enhanced article created: {article_path}")
+        return article_path
+
+# Example usage
+if __name__ == "__main__":
+    # Ghost instance URL and API credentials, from the environment
+    ghost_url = os.environ.get("GHOST_URL", "https://rainbow-millipede.pikapod.net")
+    admin_key = os.environ["GHOST_ADMIN_KEY"]
+    content_key = os.environ["GHOST_CONTENT_KEY"]
+    
+    client = GhostApiClient(ghost_url, admin_key, content_key)
+    integration = AIAgentTeamIntegration(client, "ai_integration")
+    integration.create_agent_workflow_document()
+    integration.create_agent_assignment_system()
+    integration.create_sample_ai_enhanced_article()
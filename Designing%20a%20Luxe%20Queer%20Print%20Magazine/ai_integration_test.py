@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+AI Agent Team Integration Test Script for Luxe Queer Magazine
+Runs offline against the stub agent backend, no Ghost or agent APIs needed
+"""
+
+import os
+import sys
+import json
+import asyncio
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from agent_roster import AGENT_ASSIGNMENT_SYSTEM
+from agent_scheduler import StubAgentBackend, summarize_run
+from ai_integration import AIAgentTeamIntegration
+
+def test_assignment_system_is_a_copy(tmp_path):
+    """Test that callers get their own copy of the assignment system"""
+    print("\n===== Testing Agent Assignment System =====")
+
+    integration = AIAgentTeamIntegration(None, str(tmp_path))
+    assignments = integration.get_agent_assignment_system()
+    assert assignments == AGENT_ASSIGNMENT_SYSTEM
+    assignments["workflow_stages"].clear()
+    assert AGENT_ASSIGNMENT_SYSTEM["workflow_stages"]
+    print("✓ Editing the returned system leaves the roster untouched")
+
+    with open(integration.create_agent_assignment_system(), 'r') as f:
+        assert json.load(f) == AGENT_ASSIGNMENT_SYSTEM
+    print("✓ Assignment system saved as JSON")
+
+def test_agent_scheduler_runs_every_stage(tmp_path):
+    """Test that the scheduler built by the integration staffs and completes every workflow stage"""
+    print("\n===== Testing Agent Scheduler Wiring =====")
+
+    integration = AIAgentTeamIntegration(None, str(tmp_path))
+    scheduler = integration.create_agent_scheduler(StubAgentBackend(default_latency_ms=1, jitter=0), default_agent_limit=4)
+    sections = list(AGENT_ASSIGNMENT_SYSTEM["sections"])[:3]
+    plan = [
+        {"slug": f"article-{i}", "title": f"Article {i}", "section": section, "content_type": "feature_article"}
+        for i, section in enumerate(sections)
+    ]
+    results = asyncio.run(scheduler.run(plan))
+    summary = summarize_run(results, 1.0)
+
+    assert summary["articles"] == len(plan)
+    assert summary["completed"] == summary["tasks"] and summary["failed"] == summary["skipped"] == 0
+    for result in results:
+        for stage, task in result["stages"].items():
+            assert task["agent"] in AGENT_ASSIGNMENT_SYSTEM["workflow_stages"][stage], (stage, task)
+    print(f"✓ {summary['tasks']} stage tasks completed by staffed agents")
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    with tempfile.TemporaryDirectory() as tmp:
+        test_assignment_system_is_a_copy(pathlib.Path(tmp))
+        test_agent_scheduler_runs_every_stage(pathlib.Path(tmp))
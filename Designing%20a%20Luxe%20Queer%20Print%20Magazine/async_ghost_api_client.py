@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+
+import json
+import asyncio
+import aiohttp
+from ghost_api_client import RETRY_STATUS_CODES, AdminTokenCache, GhostApiError, _browse_params
+
+class AsyncGhostApiClient:
+    def __init__(self, url, admin_key, content_key, concurrency=8, timeout=30,
+                 max_retries=3, backoff_factor=0.5):
+        """Initialize an asyncio Ghost client.
+
+        At most `concurrency` requests are in flight at once. Requests answered
+        with 429/5xx are retried up to max_retries times with exponential
+        backoff; POSTs are only retried on 429 so creates are never duplicated.
+        Use it as an async context manager so the connection pool is closed.
+        """
+        self.url = url
+        self.admin_key = admin_key
+        self.content_key = content_key
+        self.admin_api_url = f"{url}/ghost/api/v3/admin"
+        self.content_api_url = f"{url}/ghost/api/v3/content"
+        self.concurrency = concurrency
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.admin_tokens = AdminTokenCache(admin_key)
+        self.session = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def open(self):
+        """Create the pooled session; called automatically by the context manager"""
+        if self.session is None:
+            connector = aiohttp.TCPConnector(limit=self.concurrency)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.timeout,
+                headers={'Content-Type': 'application/json'},
+            )
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _admin_headers(self):
+        # Admin API requires a JWT signed with the admin key; one token is shared until it nears expiry
+        return {'Authorization': f"Ghost {self.admin_tokens.get_token()}"}
+
+    async def _request(self, method, endpoint, **kwargs):
+        """Send a request under the concurrency limit, retrying rate limits and server errors"""
+        await self.open()
+        attempt = 0
+        while True:
+            async with self._semaphore:
+                async with self.session.request(method, endpoint, **kwargs) as response:
+                    retryable = response.status in RETRY_STATUS_CODES and (method != 'POST' or response.status == 429)
+                    if not retryable or attempt >= self.max_retries:
+                        return await self._read_response(response)
+                    retry_after = response.headers.get('Retry-After')
+            # Sleep outside the semaphore so waiting retries don't block other requests
+            delay = float(retry_after) if retry_after and retry_after.isdigit() else self.backoff_factor * (2 ** attempt)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    async def _read_response(response):
+        """Decode a JSON body, reporting non-JSON bodies and error statuses in Ghost's errors format.
+
+        Proxies answer 502/504 with HTML pages, and some errors come without an
+        errors array; both become {"errors": [...]} so callers see a failure.
+        """
+        try:
+            data = await response.json(content_type=None)
+        except ValueError:
+            data = None
+        if response.status >= 400 and not (isinstance(data, dict) and "errors" in data):
+            return {"errors": [{"message": f"HTTP {response.status} {response.reason}", "type": "HttpError"}]}
+        if not isinstance(data, dict):
+            return {"errors": [{"message": f"Invalid JSON response (HTTP {response.status})", "type": "InvalidResponseError"}]}
+        return data
+
+    async def get_site_info(self):
+        """Get basic information about the Ghost site"""
+        endpoint = f"{self.content_api_url}/settings"
+        params = {'key': self.content_key}
+        return await self._request('GET', endpoint, params=params)
+
+    async def get_posts(self, limit=5, page=None, filter=None, fields=None, include='tags,authors', order=None):
+        """Get one page of posts from the Ghost site, optionally filtered with Ghost NQL"""
+        endpoint = f"{self.content_api_url}/posts"
+        params = _browse_params(self.content_key, limit, page, filter, fields, include, order)
+        return await self._request('GET', endpoint, params=params)
+
+    async def get_tags(self, limit='all', page=None, filter=None, fields=None, include=None, order=None):
+        """Get tags from the Ghost site (all of them unless a limit is given)"""
+        endpoint = f"{self.content_api_url}/tags"
+        params = _browse_params(self.content_key, limit, page, filter, fields, include, order)
+        return await self._request('GET', endpoint, params=params)
+
+    async def _iter_pages(self, fetch_page, resource):
+        """Yield every item of a paginated browse endpoint, fetching the next page in the background"""
+        pending = asyncio.ensure_future(fetch_page(1))
+        try:
+            while pending is not None:
+                data = await pending
+                pending = None
+                if resource not in data:
+                    raise GhostApiError(data.get('errors', data))
+                next_page = data.get('meta', {}).get('pagination', {}).get('next')
+                if next_page:
+                    pending = asyncio.ensure_future(fetch_page(next_page))
+                for item in data[resource]:
+                    yield item
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    def iter_posts(self, filter=None, fields=None, include='tags,authors', order=None, page_size=100):
+        """Async iterator over all posts matching filter, page_size posts per request"""
+        def fetch_page(page):
+            return self.get_posts(limit=page_size, page=page, filter=filter, fields=fields, include=include, order=order)
+        return self._iter_pages(fetch_page, 'posts')
+
+    def iter_tags(self, filter=None, fields=None, include=None, order=None, page_size=100):
+        """Async iterator over all tags matching filter, page_size tags per request"""
+        def fetch_page(page):
+            return self.get_tags(limit=page_size, page=page, filter=filter, fields=fields, include=include, order=order)
+        return self._iter_pages(fetch_page, 'tags')
+
+    async def create_tag(self, name, slug, description=None, feature_image=None):
+        """Create a new tag using the Admin API"""
+        endpoint = f"{self.admin_api_url}/tags"
+        tag = {"name": name, "slug": slug}
+        if description:
+            tag["description"] = description
+        if feature_image:
+            tag["feature_image"] = feature_image
+        return await self._request('POST', endpoint, json={"tags": [tag]}, headers=self._admin_headers())
+
+    async def create_post(self, title, html_content, status="draft", tags=None, featured=False):
+        """Create a new post using the Admin API"""
+        endpoint = f"{self.admin_api_url}/posts"
+        post = {"title": title, "html": html_content, "status": status, "featured": featured}
+        if tags:
+            post["tags"] = tags
+        return await self._request('POST', endpoint, json={"posts": [post]}, headers=self._admin_headers())
+
+    async def update_settings(self, settings_data):
+        """Update Ghost settings using the Admin API"""
+        endpoint = f"{self.admin_api_url}/settings"
+        return await self._request('PUT', endpoint, json=settings_data, headers=self._admin_headers())
+
+    async def _run_bulk(self, create, items):
+        """Run `create(**item)` for every item concurrently and collect per-item outcomes"""
+        async def run_one(item):
+            try:
+                result = await create(**item)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                return {"item": item, "result": None, "error": str(e)}
+            # Ghost reports validation failures (e.g. duplicate slugs) in an errors array
+            error = result.get("errors") if isinstance(result, dict) else "Invalid response"
+            return {"item": item, "result": None if error else result, "error": error}
+
+        return await asyncio.gather(*(run_one(item) for item in items))
+
+    async def create_tags_bulk(self, tags):
+        """Create many tags concurrently.
+
+        `tags` is a list of create_tag keyword dicts. Returns one
+        {"item", "result", "error"} dict per tag, in input order.
+        """
+        return await self._run_bulk(self.create_tag, tags)
+
+    async def create_posts_bulk(self, posts):
+        """Create many posts concurrently.
+
+        `posts` is a list of create_post keyword dicts. Returns one
+        {"item", "result", "error"} dict per post, in input order.
+        """
+        return await self._run_bulk(self.create_post, posts)
+
+# Example usage
+if __name__ == "__main__":
+    # Ghost instance URL
+    ghost_url = "https://rainbow-millipede.pikapod.net"
+
+    # Updated API credentials
+    admin_key = "67ef67107bdbb900014522e2:a83281ff2c5c9eb4ee94242f87cd1e8ace9d4cb9317358acda25f8ec1f266d73"
+    content_key = "bbc75241a46836b87673d05b12"
+
+    async def main():
+        async with AsyncGhostApiClient(ghost_url, admin_key, content_key) as client:
+            site_info, posts = await asyncio.gather(client.get_site_info(), client.get_posts())
+            print("Site Information:")
+            print(json.dumps(site_info, indent=2))
+            print("\nPosts:")
+            print(json.dumps(posts, indent=2))
+
+    asyncio.run(main())
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Async Ghost Client Test Script for the Luxe Queer Ghost Client
+Runs against the local mock Ghost server, no real Ghost instance needed
+"""
+
+import os
+import sys
+import asyncio
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+pytest.importorskip("aiohttp")
+
+from async_ghost_api_client import AsyncGhostApiClient
+from mock_ghost_server import MOCK_ADMIN_KEY, start_mock_server
+
+def _create_tags(server, tags):
+    async def run():
+        async with AsyncGhostApiClient(server.url, MOCK_ADMIN_KEY, "local-content-key", max_retries=0) as client:
+            return await client.create_tags_bulk(tags)
+    return asyncio.run(run())
+
+def test_bulk_survives_html_error_pages():
+    """Test that a proxy's HTML 502 page becomes a per-item error instead of failing the whole bulk call"""
+    print("\n===== Testing Bulk Calls Against HTML Error Pages =====")
+
+    server = start_mock_server(error_rate=1.0, error_html=True)
+    try:
+        tags = [{"name": f"Tag {i}", "slug": f"tag-{i}"} for i in range(5)]
+        results = _create_tags(server, tags)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert [outcome["item"] for outcome in results] == tags
+    assert all(outcome["result"] is None for outcome in results)
+    assert all(outcome["error"][0]["message"] == "HTTP 502 Bad Gateway" for outcome in results), results
+    print("✓ Every item reports the 502 and none is counted as created")
+
+def test_bulk_reports_partial_failures():
+    """Test that successes and Ghost validation errors are reported per item"""
+    print("\n===== Testing Partial Bulk Failures =====")
+
+    server = start_mock_server()
+    try:
+        results = _create_tags(server, [{"name": "Fashion", "slug": "fashion"}, {"name": "New", "slug": "brand-new"}])
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert results[0]["error"] is not None and results[0]["result"] is None
+    assert results[1]["error"] is None and results[1]["result"]["tags"][0]["slug"] == "brand-new"
+    print("✓ Duplicate slug fails on its own while the other tag is created")
+
+if __name__ == "__main__":
+    test_bulk_survives_html_error_pages()
+    test_bulk_reports_partial_failures()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+import json
+import time
+import asyncio
+import argparse
+from agent_roster import AGENT_ASSIGNMENT_SYSTEM
+from agent_router import AgentRouter
+from agent_scheduler import AgentTaskScheduler, StubAgentBackend, summarize_run
+
+# Rough relative response times of the agent APIs, in milliseconds
+STUB_LATENCY_MS = {
+    "cohere": 120, "anthropic": 150, "nvidia": 200, "hermes": 90, "hume": 60,
+    "mistral": 80, "gemma": 70, "huggingface": 40, "llama": 110,
+}
+
+def synthetic_plan(num_articles):
+    """An issue plan cycling through every section and content type"""
+    sections = list(AGENT_ASSIGNMENT_SYSTEM["sections"])
+    content_types = list(AGENT_ASSIGNMENT_SYSTEM["content_types"])
+    return [
+        {
+            "slug": f"article-{i}",
+            "title": f"Article {i}",
+            "section": sections[i % len(sections)],
+            "content_type": content_types[(i // len(sections)) % len(content_types)],
+        }
+        for i in range(num_articles)
+    ]
+
+async def run_scheduler(plan, latency_ms, **scheduler_options):
+    backend = StubAgentBackend(latency_ms)
+    scheduler = AgentTaskScheduler(AGENT_ASSIGNMENT_SYSTEM, backend, **scheduler_options)
+    start = time.perf_counter()
+    results = await scheduler.run(plan)
+    return summarize_run(results, time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the agent task scheduler against the stub backend")
+    parser.add_argument("--articles", type=int, default=24)
+    parser.add_argument("--agent_limit", type=int, default=4, help="Concurrent tasks per agent")
+    parser.add_argument("--latency_scale", type=float, default=0.25, help="Multiplier on the stub agent latencies")
+    parser.add_argument("--degrade", default="cohere", help="Agent whose latency is multiplied by --degrade_factor")
+    parser.add_argument("--degrade_factor", type=float, default=8.0)
+    parser.add_argument("--timeout_s", type=float, default=1.0, help="Router timeout before failing over")
+    parser.add_argument("--output", default=None, help="Write the summaries to this JSON file")
+    args = parser.parse_args()
+
+    plan = synthetic_plan(args.articles)
+    print(f"Scheduling {len(plan)} articles through {len(AGENT_ASSIGNMENT_SYSTEM['workflow_stages'])} stages")
+
+    latency_ms = {agent: ms * args.latency_scale for agent, ms in STUB_LATENCY_MS.items()}
+
+    # Baseline: one article at a time, one task per agent, stages strictly in order
+    sequential = asyncio.run(run_scheduler(plan, latency_ms, default_agent_limit=1, max_concurrent_articles=1))
+    concurrent = asyncio.run(run_scheduler(plan, latency_ms, default_agent_limit=args.agent_limit))
+
+    # With one agent degraded, compare static assignment with load-aware routing
+    degraded_ms = dict(latency_ms, **{args.degrade: latency_ms[args.degrade] * args.degrade_factor})
+    degraded = asyncio.run(run_scheduler(plan, degraded_ms, default_agent_limit=args.agent_limit))
+    router = AgentRouter(timeout_s=args.timeout_s, default_latency_s=0.05)
+    routed = asyncio.run(run_scheduler(plan, degraded_ms, default_agent_limit=args.agent_limit, router=router))
+
+    summaries = {"sequential": sequential, "concurrent": concurrent, "degraded": degraded, "degraded_routed": routed}
+    for name, summary in summaries.items():
+        print(f"{name:<16} {summary['elapsed_s']:6.2f}s  {summary['tasks_per_second']:6.1f} tasks/s  "
+              f"({summary['completed']}/{summary['tasks']} completed)")
+    print(f"Concurrency speedup: {sequential['elapsed_s'] / concurrent['elapsed_s']:.1f}x")
+    print(f"Routing speedup with {args.degrade} degraded {args.degrade_factor:g}x: "
+          f"{degraded['elapsed_s'] / routed['elapsed_s']:.1f}x")
+    busiest = max(concurrent["agents"].items(), key=lambda item: item[1]["busy_s"])
+    print(f"Busiest agent without routing: {busiest[0]} ({busiest[1]['tasks']} tasks, {busiest[1]['busy_s']:.2f}s busy)")
+    summaries["router"] = router.export_stats()
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(summaries, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+import time
+import argparse
+import requests
+from ghost_api_client import GhostApiClient
+from mock_ghost_server import MOCK_ADMIN_KEY, start_mock_server
+
+def run_unpooled(server, content_key, iterations, verify=True):
+    """Baseline: one module-level requests.get per call, as the client used to do"""
+    endpoint = f"{server.url}/ghost/api/v3/content/posts"
+    params = {'key': content_key, 'limit': 5, 'include': 'tags,authors'}
+    start = time.perf_counter()
+    for _ in range(iterations):
+        requests.get(endpoint, params=params, verify=verify).json()
+    return time.perf_counter() - start
+
+def run_pooled(client, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        client.get_posts(limit=5)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark GhostApiClient against the local stand-in Ghost server")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--posts", type=int, default=300, help="Number of synthetic posts on the mock server")
+    parser.add_argument("--latency_ms", type=float, default=0, help="Artificial server latency per request")
+    parser.add_argument("--error_rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--certfile", default=None, help="TLS certificate, to include handshake cost")
+    parser.add_argument("--keyfile", default=None, help="TLS private key")
+    args = parser.parse_args()
+
+    server = start_mock_server(
+        num_posts=args.posts, certfile=args.certfile, keyfile=args.keyfile,
+        latency_ms=args.latency_ms, error_rate=args.error_rate,
+    )
+    content_key = "local-content-key"
+    admin_key = MOCK_ADMIN_KEY
+    verify = not args.certfile
+
+    print(f"Benchmarking {args.iterations} get_posts calls against {server.url}")
+
+    # The baseline has no retries, so it is only meaningful without injected failures
+    if args.error_rate == 0:
+        connections_before = server.connection_count
+        unpooled_s = run_unpooled(server, content_key, args.iterations, verify)
+        unpooled_connections = server.connection_count - connections_before
+        print(f"Unpooled: {unpooled_s:.3f}s ({args.iterations / unpooled_s:.1f} req/s), "
+              f"{unpooled_connections} connections")
+
+    connections_before = server.connection_count
+    with GhostApiClient(server.url, admin_key, content_key, verify=verify) as client:
+        pooled_s = run_pooled(client, args.iterations)
+        stats = client.get_latency_stats()
+    pooled_connections = server.connection_count - connections_before
+    print(f"Pooled:   {pooled_s:.3f}s ({args.iterations / pooled_s:.1f} req/s), "
+          f"{pooled_connections} connections")
+
+    print("\nPer-endpoint latency:")
+    for endpoint, endpoint_stats in stats.items():
+        print(f"  {endpoint}: {endpoint_stats['count']} calls, {endpoint_stats['errors']} errors, "
+              f"avg {endpoint_stats['avg_s'] * 1000:.2f}ms, p95 {endpoint_stats['p95_s'] * 1000:.2f}ms")
+
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
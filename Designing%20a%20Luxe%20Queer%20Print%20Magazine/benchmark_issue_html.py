@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+
+import io
+import os
+import time
+import argparse
+import tempfile
+import tracemalloc
+from datetime import datetime
+from issue_html_renderer import IssueHtmlRenderer
+from mock_ghost_server import MockGhostStore, _shape_post
+
+def legacy_create_issue_html(posts, title):
+    """Baseline: the f-string and += builder create_issue_html used to be"""
+    html = f"""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="UTF-8">
+            <title>{title}</title>
+        </head>
+        <body>
+            <div class="cover-page">
+                <div class="cover-issue">Luxe Queer Magazine</div>
+                <h1 class="cover-title">{title}</h1>
+                <div class="cover-subtitle">Fashion, Art, Culture, Travel, Technology, and Luxury from a Queer Perspective</div>
+                <div class="cover-issue">{datetime.now().strftime("%B %Y")}</div>
+            </div>
+
+            <div class="page-break"></div>
+
+            <h1>Table of Contents</h1>
+        """
+    page_counter = 3
+    for post in posts:
+        html += f"""
+            <div class="toc-entry">
+                <span class="toc-title">{post.get('title', 'Untitled')}</span>
+                <span class="toc-page">{page_counter}</span>
+            </div>
+            """
+        page_counter += max(1, len(post.get('html', '')) // 3000)
+    for post in posts:
+        html += f"""
+            <div class="page-break"></div>
+
+            <article>
+                <div class="article-tag">{post.get('primary_tag', {}).get('name', '')}</div>
+                <h1>{post.get('title', 'Untitled')}</h1>
+
+                <div class="article-meta">
+                    By {post.get('primary_author', {}).get('name', 'Anonymous')} |
+                    {post.get('published_at', '').split('T')[0]}
+                </div>
+
+                <div class="two-column">
+                    {post.get('html', '')}
+                </div>
+            </article>
+            """
+    html += """
+        </body>
+        </html>
+        """
+    return html
+
+def toc_entries(posts):
+    entries, page = [], 3
+    for post in posts:
+        entries.append({'title': post['title'], 'page': page})
+        page += max(1, len(post.get('html', '')) // 3000)
+    return entries
+
+def measure(name, build, repeats):
+    """Best wall time over repeats, plus peak traced memory of one run"""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        build()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    build()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<28} {min(times) * 1000:8.1f} ms {peak / 2**20:8.2f} MiB peak")
+    return min(times), peak
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the legacy issue HTML builder with the streaming renderer")
+    parser.add_argument("--articles", type=int, default=300, help="Number of synthetic articles in the issue")
+    parser.add_argument("--paragraphs", type=int, default=200, help="Paragraphs per article")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    store = MockGhostStore(num_posts=args.articles)
+    body = "".join(f"<p>Paragraph {j}: luxury is a point of view, darling & always will be.</p>" for j in range(args.paragraphs))
+    posts = [_shape_post(dict(post, html=body), {"include": "tags,authors"}) for post in store.posts]
+    title = "January/February 2025: Future Issue"
+    issue_date = datetime.now().strftime("%B %Y")
+    entries = toc_entries(posts)
+    renderer = IssueHtmlRenderer()
+    html_path = os.path.join(tempfile.mkdtemp(), "issue.html")
+
+    print(f"Issue of {len(posts)} articles, {len(body) / 1024:.0f} KiB of body HTML each\n")
+    legacy_time, legacy_peak = measure("legacy += builder", lambda: legacy_create_issue_html(posts, title), args.repeats)
+    measure("renderer -> StringIO", lambda: renderer.write_issue(io.StringIO(), posts, title, issue_date, entries), args.repeats)
+    file_time, file_peak = measure(
+        "renderer -> file", lambda: renderer.render_issue_to_file(html_path, posts, title, issue_date, entries), args.repeats
+    )
+    print(f"\nStreaming to a file vs legacy: {file_time / legacy_time:.2f}x the time, "
+          f"{file_peak / legacy_peak:.3f}x the peak memory")
+
+if __name__ == "__main__":
+    main()
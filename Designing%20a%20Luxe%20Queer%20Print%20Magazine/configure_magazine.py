@@ -3,218 +3,143 @@
 import requests
 import json
 import os
+import sys
+import asyncio
 from ghost_api_client import GhostApiClient
+from async_ghost_api_client import AsyncGhostApiClient
 
-def configure_magazine_structure(client):
-    """Configure the Ghost CMS instance for Luxe Queer magazine structure"""
-    
-    # Create main section tags based on our content structure
-    sections = [
-        {
-            "name": "FASHION",
-            "slug": "fashion",
-            "description": "High-end fashion editorials and analysis with a queer lens"
-        },
-        {
-            "name": "ART",
-            "slug": "art",
-            "description": "Contemporary art showcases and critical analysis from queer perspectives"
-        },
-        {
-            "name": "CULTURE",
-            "slug": "culture",
-            "description": "Film, literature, music, and performance through a queer lens"
-        },
-        {
-            "name": "TRAVEL",
-            "slug": "travel",
-            "description": "Luxury travel guides and experiences with queer-friendly focus"
-        },
-        {
-            "name": "TECHNOLOGY",
-            "slug": "technology",
-            "description": "Cutting-edge tech with luxury applications and queer innovation"
-        },
-        {
-            "name": "LUXURY",
-            "slug": "luxury",
-            "description": "Fine timepieces, automobiles, real estate, and premium lifestyle"
-        }
+# Main section tags based on our content structure
+SECTIONS = [
+    {
+        "name": "FASHION",
+        "slug": "fashion",
+        "description": "High-end fashion editorials and analysis with a queer lens"
+    },
+    {
+        "name": "ART",
+        "slug": "art",
+        "description": "Contemporary art showcases and critical analysis from queer perspectives"
+    },
+    {
+        "name": "CULTURE",
+        "slug": "culture",
+        "description": "Film, literature, music, and performance through a queer lens"
+    },
+    {
+        "name": "TRAVEL",
+        "slug": "travel",
+        "description": "Luxury travel guides and experiences with queer-friendly focus"
+    },
+    {
+        "name": "TECHNOLOGY",
+        "slug": "technology",
+        "description": "Cutting-edge tech with luxury applications and queer innovation"
+    },
+    {
+        "name": "LUXURY",
+        "slug": "luxury",
+        "description": "Fine timepieces, automobiles, real estate, and premium lifestyle"
+    }
+]
+
+# Subsection tags for each main section
+SUBSECTIONS = {
+    "fashion": [
+        {"name": "Runway Report", "slug": "runway-report"},
+        {"name": "Style Icons", "slug": "style-icons"},
+        {"name": "Luxury Closet", "slug": "luxury-closet"},
+        {"name": "Designer Spotlight", "slug": "designer-spotlight"},
+        {"name": "Bespoke", "slug": "bespoke"}
+    ],
+    "art": [
+        {"name": "Gallery", "slug": "gallery"},
+        {"name": "Collector's Guide", "slug": "collectors-guide"},
+        {"name": "Exhibition Reviews", "slug": "exhibition-reviews"},
+        {"name": "Art Market", "slug": "art-market"},
+        {"name": "Studio Visit", "slug": "studio-visit"}
+    ],
+    "culture": [
+        {"name": "Screen", "slug": "screen"},
+        {"name": "Page", "slug": "page"},
+        {"name": "Stage", "slug": "stage"},
+        {"name": "Sound", "slug": "sound"},
+        {"name": "Digital", "slug": "digital-culture"}
+    ],
+    "travel": [
+        {"name": "Destinations", "slug": "destinations"},
+        {"name": "Properties", "slug": "properties"},
+        {"name": "Experiences", "slug": "experiences"},
+        {"name": "City Guide", "slug": "city-guide"},
+        {"name": "Escape", "slug": "escape"}
+    ],
+    "technology": [
+        {"name": "Innovation", "slug": "innovation"},
+        {"name": "Digital Lifestyle", "slug": "digital-lifestyle"},
+        {"name": "Future Forward", "slug": "future-forward"},
+        {"name": "Tech Titans", "slug": "tech-titans"},
+        {"name": "Design Objects", "slug": "design-objects"}
+    ],
+    "luxury": [
+        {"name": "Timepieces", "slug": "timepieces"},
+        {"name": "Automobiles", "slug": "automobiles"},
+        {"name": "Real Estate", "slug": "real-estate"},
+        {"name": "Spirits & Wine", "slug": "spirits-wine"},
+        {"name": "Wellness", "slug": "wellness"}
     ]
-    
-    # Create subsection tags for each main section
-    subsections = {
-        "fashion": [
-            {"name": "Runway Report", "slug": "runway-report"},
-            {"name": "Style Icons", "slug": "style-icons"},
-            {"name": "Luxury Closet", "slug": "luxury-closet"},
-            {"name": "Designer Spotlight", "slug": "designer-spotlight"},
-            {"name": "Bespoke", "slug": "bespoke"}
-        ],
-        "art": [
-            {"name": "Gallery", "slug": "gallery"},
-            {"name": "Collector's Guide", "slug": "collectors-guide"},
-            {"name": "Exhibition Reviews", "slug": "exhibition-reviews"},
-            {"name": "Art Market", "slug": "art-market"},
-            {"name": "Studio Visit", "slug": "studio-visit"}
-        ],
-        "culture": [
-            {"name": "Screen", "slug": "screen"},
-            {"name": "Page", "slug": "page"},
-            {"name": "Stage", "slug": "stage"},
-            {"name": "Sound", "slug": "sound"},
-            {"name": "Digital", "slug": "digital-culture"}
-        ],
-        "travel": [
-            {"name": "Destinations", "slug": "destinations"},
-            {"name": "Properties", "slug": "properties"},
-            {"name": "Experiences", "slug": "experiences"},
-            {"name": "City Guide", "slug": "city-guide"},
-            {"name": "Escape", "slug": "escape"}
-        ],
-        "technology": [
-            {"name": "Innovation", "slug": "innovation"},
-            {"name": "Digital Lifestyle", "slug": "digital-lifestyle"},
-            {"name": "Future Forward", "slug": "future-forward"},
-            {"name": "Tech Titans", "slug": "tech-titans"},
-            {"name": "Design Objects", "slug": "design-objects"}
+}
+
+# Special feature tags
+FEATURES = [
+    {"name": "Cover Story", "slug": "cover-story"},
+    {"name": "Portfolio", "slug": "portfolio"},
+    {"name": "Long-form", "slug": "long-form"},
+    {"name": "Luxury Report", "slug": "luxury-report"},
+    {"name": "Philanthropy", "slug": "philanthropy"}
+]
+
+# Issue tags for editorial calendar
+ISSUES = [
+    {"name": "January/February: Future Issue", "slug": "jan-feb-2025"},
+    {"name": "March/April: Style Issue", "slug": "mar-apr-2025"},
+    {"name": "May/June: Pride Issue", "slug": "may-jun-2025"},
+    {"name": "July/August: Travel Issue", "slug": "jul-aug-2025"},
+    {"name": "September/October: Design Issue", "slug": "sep-oct-2025"},
+    {"name": "November/December: Luxury Issue", "slug": "nov-dec-2025"}
+]
+
+# Internal tags for workflow
+INTERNAL_TAGS = [
+    {"name": "#draft", "slug": "hash-draft"},
+    {"name": "#review", "slug": "hash-review"},
+    {"name": "#ready", "slug": "hash-ready"},
+    {"name": "#print", "slug": "hash-print"},
+    {"name": "#digital-only", "slug": "hash-digital-only"},
+    {"name": "#ai-enhanced", "slug": "hash-ai-enhanced"}
+]
+
+# Site settings applied after the tags are created
+SITE_SETTINGS = {
+    "settings": {
+        "title": "Luxe Queer",
+        "description": "Fashion, Art, Culture, Travel, Technology, and Luxury from a Queer Perspective",
+        "meta_title": "Luxe Queer | Premium Queer Lifestyle Magazine",
+        "meta_description": "The definitive luxury lifestyle magazine for the affluent queer community, covering fashion, art, culture, travel, technology, and luxury.",
+        "navigation": [
+            {"label": "FASHION", "url": "/tag/fashion/"},
+            {"label": "ART", "url": "/tag/art/"},
+            {"label": "CULTURE", "url": "/tag/culture/"},
+            {"label": "TRAVEL", "url": "/tag/travel/"},
+            {"label": "TECHNOLOGY", "url": "/tag/technology/"},
+            {"label": "LUXURY", "url": "/tag/luxury/"}
         ],
-        "luxury": [
-            {"name": "Timepieces", "slug": "timepieces"},
-            {"name": "Automobiles", "slug": "automobiles"},
-            {"name": "Real Estate", "slug": "real-estate"},
-            {"name": "Spirits & Wine", "slug": "spirits-wine"},
-            {"name": "Wellness", "slug": "wellness"}
+        "secondary_navigation": [
+            {"label": "Subscribe", "url": "#/portal/"},
+            {"label": "About", "url": "/about/"}
         ]
     }
-    
-    # Create special feature tags
-    features = [
-        {"name": "Cover Story", "slug": "cover-story"},
-        {"name": "Portfolio", "slug": "portfolio"},
-        {"name": "Long-form", "slug": "long-form"},
-        {"name": "Luxury Report", "slug": "luxury-report"},
-        {"name": "Philanthropy", "slug": "philanthropy"}
-    ]
-    
-    # Create issue tags for editorial calendar
-    issues = [
-        {"name": "January/February: Future Issue", "slug": "jan-feb-2025"},
-        {"name": "March/April: Style Issue", "slug": "mar-apr-2025"},
-        {"name": "May/June: Pride Issue", "slug": "may-jun-2025"},
-        {"name": "July/August: Travel Issue", "slug": "jul-aug-2025"},
-        {"name": "September/October: Design Issue", "slug": "sep-oct-2025"},
-        {"name": "November/December: Luxury Issue", "slug": "nov-dec-2025"}
-    ]
-    
-    # Create internal tags for workflow
-    internal_tags = [
-        {"name": "#draft", "slug": "hash-draft"},
-        {"name": "#review", "slug": "hash-review"},
-        {"name": "#ready", "slug": "hash-ready"},
-        {"name": "#print", "slug": "hash-print"},
-        {"name": "#digital-only", "slug": "hash-digital-only"},
-        {"name": "#ai-enhanced", "slug": "hash-ai-enhanced"}
-    ]
-    
-    # Create main section tags
-    print("Creating main section tags...")
-    for section in sections:
-        try:
-            result = client.create_tag(
-                name=section["name"],
-                slug=section["slug"],
-                description=section["description"]
-            )
-            print(f"Created tag: {section['name']}")
-        except Exception as e:
-            print(f"Error creating tag {section['name']}: {str(e)}")
-    
-    # Create subsection tags
-    print("\nCreating subsection tags...")
-    for parent, subs in subsections.items():
-        for sub in subs:
-            try:
-                result = client.create_tag(
-                    name=sub["name"],
-                    slug=sub["slug"],
-                    description=f"Part of the {parent.upper()} section"
-                )
-                print(f"Created tag: {sub['name']}")
-            except Exception as e:
-                print(f"Error creating tag {sub['name']}: {str(e)}")
-    
-    # Create feature tags
-    print("\nCreating feature tags...")
-    for feature in features:
-        try:
-            result = client.create_tag(
-                name=feature["name"],
-                slug=feature["slug"],
-                description="Special feature content"
-            )
-            print(f"Created tag: {feature['name']}")
-        except Exception as e:
-            print(f"Error creating tag {feature['name']}: {str(e)}")
-    
-    # Create issue tags
-    print("\nCreating issue tags...")
-    for issue in issues:
-        try:
-            result = client.create_tag(
-                name=issue["name"],
-                slug=issue["slug"],
-                description="Bimonthly issue"
-            )
-            print(f"Created tag: {issue['name']}")
-        except Exception as e:
-            print(f"Error creating tag {issue['name']}: {str(e)}")
-    
-    # Create internal tags
-    print("\nCreating internal tags...")
-    for tag in internal_tags:
-        try:
-            result = client.create_tag(
-                name=tag["name"],
-                slug=tag["slug"],
-                description="Internal workflow tag"
-            )
-            print(f"Created tag: {tag['name']}")
-        except Exception as e:
-            print(f"Error creating tag {tag['name']}: {str(e)}")
-    
-    # Update site settings
-    print("\nUpdating site settings...")
-    settings = {
-        "settings": {
-            "title": "Luxe Queer",
-            "description": "Fashion, Art, Culture, Travel, Technology, and Luxury from a Queer Perspective",
-            "meta_title": "Luxe Queer | Premium Queer Lifestyle Magazine",
-            "meta_description": "The definitive luxury lifestyle magazine for the affluent queer community, covering fashion, art, culture, travel, technology, and luxury.",
-            "navigation": [
-                {"label": "FASHION", "url": "/tag/fashion/"},
-                {"label": "ART", "url": "/tag/art/"},
-                {"label": "CULTURE", "url": "/tag/culture/"},
-                {"label": "TRAVEL", "url": "/tag/travel/"},
-                {"label": "TECHNOLOGY", "url": "/tag/technology/"},
-                {"label": "LUXURY", "url": "/tag/luxury/"}
-            ],
-            "secondary_navigation": [
-                {"label": "Subscribe", "url": "#/portal/"},
-                {"label": "About", "url": "/about/"}
-            ]
-        }
-    }
-    
-    try:
-        result = client.update_settings(settings)
-        print("Site settings updated successfully")
-    except Exception as e:
-        print(f"Error updating site settings: {str(e)}")
-    
-    # Create welcome post
-    print("\nCreating welcome post...")
-    welcome_html = """
+}
+
+WELCOME_HTML = """
     <h2>Welcome to Luxe Queer</h2>
     
     <p>Luxe Queer is a premium lifestyle magazine for the affluent queer community, covering fashion, art, culture, travel, technology, and luxury from a distinctly queer perspective.</p>
@@ -247,21 +172,8 @@ def configure_magazine_structure(client):
     
     <p>Subscribe now to receive our inaugural issue and join our community of discerning readers who appreciate the finer things in life through a queer lens.</p>
     """
-    
-    try:
-        result = client.create_post(
-            title="Welcome to Luxe Queer Magazine",
-            html_content=welcome_html,
-            status="published",
-            featured=True
-        )
-        print("Welcome post created successfully")
-    except Exception as e:
-        print(f"Error creating welcome post: {str(e)}")
-    
-    # Create about page
-    print("\nCreating about page...")
-    about_html = """
+
+ABOUT_HTML = """
     <h2>About Luxe Queer</h2>
     
     <p>Luxe Queer is a premium lifestyle magazine for the affluent queer community, published 6 times per year in both print and digital formats.</p>
@@ -292,11 +204,62 @@ def configure_magazine_structure(client):
     
     <p>For editorial inquiries, advertising opportunities, or subscription information, please contact us at info@luxequeer.com.</p>
     """
+
+def magazine_tag_groups():
+    """Return the tags to create as (group label, [create_tag kwargs]) in creation order"""
+    subsection_tags = [
+        {"name": sub["name"], "slug": sub["slug"], "description": f"Part of the {parent.upper()} section"}
+        for parent, subs in SUBSECTIONS.items()
+        for sub in subs
+    ]
+    return [
+        ("main section", [dict(section) for section in SECTIONS]),
+        ("subsection", subsection_tags),
+        ("feature", [dict(feature, description="Special feature content") for feature in FEATURES]),
+        ("issue", [dict(issue, description="Bimonthly issue") for issue in ISSUES]),
+        ("internal", [dict(tag, description="Internal workflow tag") for tag in INTERNAL_TAGS]),
+    ]
+
+def configure_magazine_structure(client):
+    """Configure the Ghost CMS instance for Luxe Queer magazine structure"""
+    
+    # Create section, subsection, feature, issue and internal tags
+    for i, (group, tags) in enumerate(magazine_tag_groups()):
+        print(f"{chr(10) if i else ''}Creating {group} tags...")
+        for tag in tags:
+            try:
+                result = client.create_tag(**tag)
+                print(f"Created tag: {tag['name']}")
+            except Exception as e:
+                print(f"Error creating tag {tag['name']}: {str(e)}")
+    
+    # Update site settings
+    print("\nUpdating site settings...")
+    try:
+        result = client.update_settings(SITE_SETTINGS)
+        print("Site settings updated successfully")
+    except Exception as e:
+        print(f"Error updating site settings: {str(e)}")
     
+    # Create welcome post
+    print("\nCreating welcome post...")
+    try:
+        result = client.create_post(
+            title="Welcome to Luxe Queer Magazine",
+            html_content=WELCOME_HTML,
+            status="published",
+            featured=True
+        )
+        print("Welcome post created successfully")
+    except Exception as e:
+        print(f"Error creating welcome post: {str(e)}")
+    
+    # Create about page
+    print("\nCreating about page...")
     try:
         result = client.create_post(
             title="About Luxe Queer",
-            html_content=about_html,
+            html_content=ABOUT_HTML,
             status="published",
             featured=False
         )
@@ -306,6 +269,47 @@ def configure_magazine_structure(client):
     
     print("\nGhost CMS configuration for Luxe Queer magazine completed successfully!")
 
+async def configure_magazine_structure_async(client):
+    """Configure the magazine structure with concurrent Admin API calls.
+    
+    All tags are created at once under the client's concurrency limit; the
+    settings update and the welcome/about posts then run concurrently too.
+    Returns the per-item results of the bulk calls.
+    """
+    tags = [tag for _, group_tags in magazine_tag_groups() for tag in group_tags]
+    print(f"Creating {len(tags)} tags concurrently (limit {client.concurrency})...")
+    tag_results = await client.create_tags_bulk(tags)
+    for outcome in tag_results:
+        if outcome["error"]:
+            print(f"Error creating tag {outcome['item']['name']}: {outcome['error']}")
+    print(f"Created {sum(1 for outcome in tag_results if not outcome['error'])}/{len(tags)} tags")
+    
+    print("\nUpdating site settings and creating welcome and about posts...")
+    posts = [
+        {"title": "Welcome to Luxe Queer Magazine", "html_content": WELCOME_HTML, "status": "published", "featured": True},
+        {"title": "About Luxe Queer", "html_content": ABOUT_HTML, "status": "published", "featured": False},
+    ]
+    settings_result, post_results = await asyncio.gather(
+        client.update_settings(SITE_SETTINGS),
+        client.create_posts_bulk(posts),
+        return_exceptions=True,
+    )
+    if isinstance(settings_result, Exception) or "errors" in settings_result:
+        print(f"Error updating site settings: {settings_result}")
+    else:
+        print("Site settings updated successfully")
+    if isinstance(post_results, Exception):
+        print(f"Error creating posts: {post_results}")
+        post_results = []
+    for outcome in post_results:
+        if outcome["error"]:
+            print(f"Error creating post {outcome['item']['title']}: {outcome['error']}")
+        else:
+            print(f"Created post: {outcome['item']['title']}")
+    
+    print("\nGhost CMS configuration for Luxe Queer magazine completed successfully!")
+    return {"tags": tag_results, "posts": post_results}
+
 if __name__ == "__main__":
     # Ghost instance URL
     ghost_url = "https://rainbow-millipede.pikapod.net"
@@ -314,8 +318,15 @@ if __name__ == "__main__":
     admin_key = "67ef67107bdbb900014522e2:a83281ff2c5c9eb4ee94242f87cd1e8ace9d4cb9317358acda25f8ec1f266d73"
     content_key = "bbc75241a46836b87673d05b12"
     
-    # Initialize the client
-    client = GhostApiClient(ghost_url, admin_key, content_key)
-    
-    # Configure the magazine structure
-    configure_magazine_structure(client)
+    if "--concurrent" in sys.argv:
+        # Create tags and posts concurrently with the asyncio client
+        async def run():
+            async with AsyncGhostApiClient(ghost_url, admin_key, content_key) as client:
+                await configure_magazine_structure_async(client)
+        asyncio.run(run())
+    else:
+        # Initialize the client
+        client = GhostApiClient(ghost_url, admin_key, content_key)
+        
+        # Configure the magazine structure
+        configure_magazine_structure(client)
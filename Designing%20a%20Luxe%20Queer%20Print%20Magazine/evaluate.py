@@ -2,6 +2,7 @@
 # coding=utf-8
 
 import os
+import sys
 import json
 import argparse
 import torch
@@ -13,12 +14,9 @@ from datasets import load_dataset
 from evaluate import load
 from rouge_score import rouge_scorer
 
-def format_prompt(instruction, input_text=None):
-    """Format the instruction and input into a prompt."""
-    if input_text:
-        return f"### Instruction:\n{instruction}\n\n### Input:\n{input_text}\n\n### Response:\n"
-    else:
-        return f"### Instruction:\n{instruction}\n\n### Response:\n"
+# The prompt template shared with the training scripts lives at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from prompt_template import prompt_template, decode_new_tokens
 
 def main():
     parser = argparse.ArgumentParser()
@@ -36,6 +34,9 @@ def main():
     # Load tokenizer
     print(f"Loading tokenizer from {args.base_model}")
     tokenizer = AutoTokenizer.from_pretrained(args.base_model, trust_remote_code=True)
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
+    tokenizer.padding_side = "left"  # Prompts must end where generation starts
     
     # Load model
     print(f"Loading model from {args.base_model}")
@@ -75,11 +76,8 @@ def main():
     model.eval()
     
     for i, example in enumerate(tqdm(eval_dataset)):
-        # Format prompt
-        prompt = format_prompt(example["instruction"], example["input"])
-        
-        # Tokenize prompt
-        inputs = tokenizer(prompt, return_tensors="pt").to(model.device)
+        # Tokenize prompt from the pre-tokenized template segments, as in training
+        inputs = prompt_template(tokenizer).prompt_inputs([example["instruction"]], [example["input"]]).to(model.device)
         
         # Generate response
         with torch.no_grad():
@@ -89,9 +87,8 @@ def main():
                 do_sample=False,  # Use greedy decoding for evaluation
             )
         
-        # Decode and extract response
-        full_response = tokenizer.decode(outputs[0], skip_special_tokens=True)
-        generated_response = full_response[len(prompt):]
+        # Decode just the response (the tokens after the prompt)
+        generated_response = decode_new_tokens(tokenizer, outputs, inputs["input_ids"].shape[1])[0]
         
         # Calculate metrics
         # BERTScore
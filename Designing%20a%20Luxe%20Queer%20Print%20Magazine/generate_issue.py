@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import time
+import argparse
+from html import escape
+from ghost_api_client import GhostApiClient
+from ai_integration import AIAgentTeamIntegration
+from agent_scheduler import eligible_agents
+
+# The local generation stack (inference.py, adapter_pool.py) lives at the repository root
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+from adapter_names import BASE_ADAPTER
+
+DRAFT_INSTRUCTION = (
+    "Write a {content_type} for the {section} section of Luxe Queer Magazine in the voice of "
+    "Octavia Opulence, titled \"{title}\"."
+)
+
+def load_article_plan(path):
+    """Load the articles to draft from a JSON list or a JSONL file.
+
+    Each article needs a title and section; content_type, slug, brief (used
+    as the generation input) and adapter are optional.
+    """
+    with open(path, 'r') as f:
+        if path.endswith('.jsonl'):
+            articles = [json.loads(line) for line in f if line.strip()]
+        else:
+            articles = json.load(f)
+    for article in articles:
+        article.setdefault('content_type', 'feature_article')
+        article.setdefault('slug', article['title'].lower().replace(' ', '-'))
+    return articles
+
+def draft_request(article, assignments, adapter_map):
+    """The generation request for one article: drafting agent, adapter, instruction and input.
+
+    The adapter is the article's own, else the one mapped to its section, else
+    the one mapped to its drafting agent, else the base model.
+    """
+    agent = eligible_agents(assignments, 'drafting', article)[0]
+    adapter = article.get('adapter') or adapter_map.get(article['section']) or adapter_map.get(agent) or BASE_ADAPTER
+    return {
+        'slug': article['slug'],
+        'agent': agent,
+        'adapter': adapter,
+        'instruction': DRAFT_INSTRUCTION.format(
+            content_type=article['content_type'].replace('_', ' '), section=article['section'], title=article['title']
+        ),
+        'input': article.get('brief'),
+    }
+
+def draft_to_html(text):
+    """Turn a generated plain-text draft into paragraphs of HTML"""
+    paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
+    return ''.join(f"<p>{escape(p)}</p>" for p in paragraphs)
+
+class GenerationCheckpoint:
+    """Append-only JSONL record of drafted and published articles, keyed by slug"""
+
+    def __init__(self, path):
+        self.path = path
+        self.records = {}
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        self.records.setdefault(record['slug'], {}).update(record)
+
+    def get(self, slug):
+        return self.records.get(slug, {})
+
+    def update(self, slug, **fields):
+        record = self.records.setdefault(slug, {'slug': slug})
+        record.update(fields)
+        # One line per update; later lines win when the file is reloaded
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(dict(fields, slug=slug)) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+class LocalModelGenerator:
+    def __init__(self, base_model, adapters=None, max_resident=4, device="auto", num_threads=None, **generation_kwargs):
+        """Batch generation through inference.py's adapter pool.
+
+        Requests in one call may name different adapters; they are served
+        from a single loaded base model.
+        """
+        import torch
+        from transformers import AutoTokenizer, GenerationConfig
+        from adapter_pool import AdapterPool, parse_adapter_specs
+        from inference import load_model, generate_batch_responses
+        from quantize_cpu import set_cpu_threads
+
+        tokenizer = AutoTokenizer.from_pretrained(base_model, trust_remote_code=True)
+        if tokenizer.pad_token is None:
+            tokenizer.pad_token = tokenizer.eos_token
+        tokenizer.padding_side = "left"
+        if device == "cpu" or not torch.cuda.is_available():
+            set_cpu_threads(num_threads)
+        self.pool = AdapterPool(load_model(base_model, device), tokenizer, max_resident=max_resident)
+        for name, path in parse_adapter_specs(adapters).items():
+            self.pool.register(name, path)
+        generation_kwargs.setdefault('do_sample', True)
+        generation_kwargs.setdefault('pad_token_id', tokenizer.pad_token_id)
+        self.generation_config = GenerationConfig(**generation_kwargs)
+        self._generate_batch_responses = generate_batch_responses
+
+    @property
+    def adapters(self):
+        return self.pool.names()
+
+    def __call__(self, requests):
+        return self._generate_batch_responses(self.pool, self.generation_config, requests)
+
+def stub_generator(requests):
+    """Offline stand-in for a model: echoes each request as a short draft"""
+    return [f"[{r['adapter']}] {r['instruction']}\n\n{r.get('input') or ''}" for r in requests]
+
+class IssueGenerationRunner:
+    def __init__(self, integration, generate, checkpoint, adapter_map=None, batch_size=8, publish=True):
+        """Draft every article of an issue in batches and push the drafts to Ghost.
+
+        generate(requests) takes a list of request dicts with adapter,
+        instruction and input, and returns one text per request. Requests are
+        grouped by adapter so each batch runs a single adapter, and every
+        draft and post is checkpointed as soon as it exists, so a rerun
+        resumes where the last one stopped.
+        """
+        self.integration = integration
+        self.client = integration.client
+        self.assignments = integration.get_agent_assignment_system()
+        self.generate = generate
+        self.checkpoint = checkpoint
+        self.adapter_map = adapter_map or {}
+        self.batch_size = batch_size
+        self.publish = publish
+
+    def plan_batches(self, requests):
+        """Group requests by adapter, keeping plan order within each adapter, and split into batches"""
+        by_adapter = {}
+        for request in requests:
+            by_adapter.setdefault(request['adapter'], []).append(request)
+        return [
+            group[i:i + self.batch_size]
+            for group in by_adapter.values()
+            for i in range(0, len(group), self.batch_size)
+        ]
+
+    def publish_draft(self, issue_tag, article, record):
+        """Create the Ghost draft post for a generated article and return its id"""
+        # Ghost reads plain-string tags as names and would create new tags; refer to the existing ones by slug
+        tags = [{"slug": issue_tag}, {"slug": article['section']}]
+        result = self.client.create_post(article['title'], draft_to_html(record['draft']), status="draft", tags=tags)
+        return result['posts'][0]['id']
+
+    def run(self, issue_tag, articles):
+        """Generate and publish every article that the checkpoint doesn't already cover"""
+        stats = {'articles': len(articles), 'generated': 0, 'published': 0, 'resumed': 0, 'failed': 0, 'batches': 0}
+        articles_by_slug = {article['slug']: article for article in articles}
+        pending = [
+            draft_request(article, self.assignments, self.adapter_map)
+            for article in articles
+            if 'draft' not in self.checkpoint.get(article['slug'])
+        ]
+        stats['resumed'] = len(articles) - len(pending)
+
+        start = time.perf_counter()
+        for batch in self.plan_batches(pending):
+            stats['batches'] += 1
+            print(f"Generating {len(batch)} drafts with adapter '{batch[0]['adapter']}'")
+            for request, draft in zip(batch, self.generate(batch)):
+                self.checkpoint.update(request['slug'], agent=request['agent'], adapter=request['adapter'], draft=draft)
+                stats['generated'] += 1
+        stats['generation_s'] = time.perf_counter() - start
+
+        if self.publish:
+            for slug, article in articles_by_slug.items():
+                record = self.checkpoint.get(slug)
+                if 'post_id' in record:
+                    continue
+                try:
+                    self.checkpoint.update(slug, post_id=self.publish_draft(issue_tag, article, record))
+                    stats['published'] += 1
+                except Exception as e:
+                    stats['failed'] += 1
+                    print(f"Error publishing {slug}: {str(e)}")
+        stats['elapsed_s'] = time.perf_counter() - start
+        return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Draft every article of an issue and push the drafts to Ghost")
+    parser.add_argument("--issue_tag", required=True, help="Ghost tag slug of the issue, e.g. jan-feb-2025")
+    parser.add_argument("--plan", required=True, help="JSON or JSONL article plan")
+    parser.add_argument("--output_dir", default="issue_generation", help="Where the checkpoint and agent files go")
+    parser.add_argument("--checkpoint", default=None, help="Checkpoint file (default: OUTPUT_DIR/ISSUE_TAG.checkpoint.jsonl)")
+    parser.add_argument("--base_model", default=None, help="Base model for local generation")
+    parser.add_argument("--adapters", nargs="*", default=None, help="Adapters as NAME=PATH, a JSON name->path file, or a directory")
+    parser.add_argument("--adapter_map", default=None, help="JSON file mapping sections or agents to adapter names")
+    parser.add_argument("--max_resident_adapters", type=int, default=4)
+    parser.add_argument("--device", default="auto", choices=["auto", "cpu"])
+    parser.add_argument("--num_threads", type=int, default=None)
+    parser.add_argument("--batch_size", type=int, default=8, help="Drafts per forward pass")
+    parser.add_argument("--max_new_tokens", type=int, default=1024)
+    parser.add_argument("--temperature", type=float, default=0.7)
+    parser.add_argument("--top_p", type=float, default=0.9)
+    parser.add_argument("--stub", action="store_true", help="Use the offline stub generator instead of a model")
+    parser.add_argument("--no_publish", action="store_true", help="Generate and checkpoint drafts without creating posts")
+    parser.add_argument("--ghost_url", default=os.environ.get("GHOST_URL", "https://rainbow-millipede.pikapod.net"))
+    parser.add_argument("--admin_key", default=os.environ.get("GHOST_ADMIN_KEY"), help="Ghost Admin API key (default: $GHOST_ADMIN_KEY)")
+    parser.add_argument("--content_key", default=os.environ.get("GHOST_CONTENT_KEY"), help="Ghost Content API key (default: $GHOST_CONTENT_KEY)")
+    args = parser.parse_args()
+
+    if not args.stub and not args.base_model:
+        parser.error("one of --base_model or --stub is required")
+    if not args.admin_key or not args.content_key:
+        parser.error("--admin_key and --content_key (or GHOST_ADMIN_KEY and GHOST_CONTENT_KEY) are required")
+
+    client = GhostApiClient(args.ghost_url, args.admin_key, args.content_key)
+    integration = AIAgentTeamIntegration(client, args.output_dir)
+    checkpoint = GenerationCheckpoint(
+        args.checkpoint or os.path.join(args.output_dir, f"{args.issue_tag}.checkpoint.jsonl")
+    )
+    adapter_map = {}
+    if args.adapter_map:
+        with open(args.adapter_map, 'r') as f:
+            adapter_map = json.load(f)
+
+    if args.stub:
+        generate = stub_generator
+    else:
+        generate = LocalModelGenerator(
+            args.base_model, args.adapters, args.max_resident_adapters, args.device, args.num_threads,
+            max_new_tokens=args.max_new_tokens, temperature=args.temperature, top_p=args.top_p,
+        )
+
+    runner = IssueGenerationRunner(
+        integration, generate, checkpoint, adapter_map, batch_size=args.batch_size, publish=not args.no_publish
+    )
+    stats = runner.run(args.issue_tag, load_article_plan(args.plan))
+    print(json.dumps(stats, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Issue Generation Smoke Test for Luxe Queer Magazine
+Runs generate_issue.py with the stub generator against the local mock Ghost server
+"""
+
+import os
+import sys
+import json
+import subprocess
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+from mock_ghost_server import MOCK_ADMIN_KEY, start_mock_server
+
+PLAN = [
+    {"title": "Blue Lipstick Forever", "section": "fashion", "brief": "A love letter to the signature shade."},
+    {"title": "Gallery Nights", "section": "art", "content_type": "profile"},
+    {"title": "Velvet Rooms", "section": "luxury"},
+]
+
+def _run_cli(*args):
+    # Never pick up real Ghost credentials from the environment
+    env = {name: value for name, value in os.environ.items() if not name.startswith("GHOST_")}
+    return subprocess.run(
+        [sys.executable, os.path.join(HERE, "generate_issue.py"), *args],
+        capture_output=True, text=True, timeout=60, cwd=HERE, env=env,
+    )
+
+def test_cli_help():
+    """Test that the CLI imports and parses its arguments"""
+    print("\n===== Testing generate_issue.py --help =====")
+
+    result = _run_cli("--help")
+    assert result.returncode == 0, result.stderr
+    assert "--issue_tag" in result.stdout
+    print("✓ CLI starts")
+
+def test_cli_requires_ghost_keys(tmp_path):
+    """Test that the CLI refuses to publish without explicit Ghost keys"""
+    print("\n===== Testing generate_issue.py Without Keys =====")
+
+    plan_path = tmp_path / "plan.json"
+    plan_path.write_text(json.dumps(PLAN))
+    result = _run_cli("--issue_tag", "jan-feb-2025", "--plan", str(plan_path), "--output_dir", str(tmp_path), "--stub")
+    assert result.returncode == 2
+    assert "--admin_key" in result.stderr
+    assert not os.path.exists(tmp_path / "jan-feb-2025.checkpoint.jsonl")
+    print("✓ No keys, no drafts")
+
+def test_stub_issue_against_mock_server(tmp_path):
+    """Test drafting and publishing a whole issue offline, then resuming from the checkpoint"""
+    print("\n===== Testing Stub Issue Generation Against Mock Ghost =====")
+
+    plan_path = tmp_path / "plan.json"
+    plan_path.write_text(json.dumps(PLAN))
+    server = start_mock_server()
+    try:
+        args = [
+            "--issue_tag", "jan-feb-2025", "--plan", str(plan_path), "--output_dir", str(tmp_path / "issue"),
+            "--stub", "--batch_size", "2",
+            "--ghost_url", server.url, "--admin_key", MOCK_ADMIN_KEY, "--content_key", "local-content-key",
+        ]
+        result = _run_cli(*args)
+        assert result.returncode == 0, result.stderr
+        stats = json.loads(result.stdout[result.stdout.index("{"):])
+        assert stats["generated"] == stats["published"] == len(PLAN) and stats["failed"] == 0
+        print(f"✓ {len(PLAN)} drafts generated and published in {stats['batches']} batches")
+
+        store = server.store
+        issue_tag = store.tag_by_slug("jan-feb-2025")
+        assert len(store.posts) == len(PLAN)
+        for post, article in zip(store.posts, PLAN):
+            assert post["status"] == "draft" and post["title"] == article["title"]
+            assert post["tags"][0] is issue_tag
+            assert post["tags"][1] is store.tag_by_slug(article["section"])
+        assert store.tag_by_slug("jan-feb-2025-2") is None
+        print("✓ Drafts carry the existing issue and section tags")
+
+        result = _run_cli(*args)
+        assert result.returncode == 0, result.stderr
+        stats = json.loads(result.stdout[result.stdout.index("{"):])
+        assert stats["resumed"] == len(PLAN) and stats["generated"] == stats["published"] == 0
+        assert len(store.posts) == len(PLAN)
+        print("✓ Rerun resumes from the checkpoint without duplicating posts")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    test_cli_help()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_cli_requires_ghost_keys(pathlib.Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_stub_issue_against_mock_server(pathlib.Path(tmp))
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Admin API Token Test Script for the Luxe Queer Ghost Client
+Runs against the local mock Ghost server, no real Ghost instance needed
+"""
+
+import os
+import sys
+import json
+import time
+import base64
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+def _decode(segment):
+    return json.loads(base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4)))
+
+def test_token_format():
+    """Test that minted tokens carry the claims Ghost checks"""
+    print("\n===== Testing Admin Token Format =====")
+
+    from ghost_api_client import ADMIN_TOKEN_AUDIENCE, mint_admin_token
+    from mock_ghost_server import MOCK_ADMIN_KEY, verify_admin_token
+    print("✓ Successfully imported ghost_api_client and mock_ghost_server")
+
+    token = mint_admin_token(MOCK_ADMIN_KEY, now=1_700_000_000)
+    header_b64, payload_b64, _ = token.split(".")
+    header, payload = _decode(header_b64), _decode(payload_b64)
+    assert header == {"alg": "HS256", "typ": "JWT", "kid": MOCK_ADMIN_KEY.split(":")[0]}
+    assert payload == {"iat": 1_700_000_000, "exp": 1_700_000_300, "aud": ADMIN_TOKEN_AUDIENCE}
+    print("✓ Header and payload claims are correct")
+
+    assert verify_admin_token(token, MOCK_ADMIN_KEY, now=1_700_000_100) is None
+    assert verify_admin_token(token, MOCK_ADMIN_KEY, now=1_700_000_300) == "Token expired"
+    other_key = MOCK_ADMIN_KEY.split(":")[0] + ":" + "11" * 32
+    assert verify_admin_token(token, other_key, now=1_700_000_100) == "Invalid token signature"
+    print("✓ Signature and expiry verify against the mock server's checks")
+
+def test_token_cache():
+    """Test that tokens are reused until they are close to expiring"""
+    print("\n===== Testing Admin Token Cache =====")
+
+    from ghost_api_client import AdminTokenCache
+    from mock_ghost_server import MOCK_ADMIN_KEY
+
+    clock = [1_700_000_000.0]
+    cache = AdminTokenCache(MOCK_ADMIN_KEY, ttl=300, refresh_margin=60, clock=lambda: clock[0])
+    first = cache.get_token()
+    clock[0] += 200
+    assert cache.get_token() == first and cache.mint_count == 1
+    print("✓ Token reused while it has more than the refresh margin left")
+
+    clock[0] += 45
+    assert cache.get_token() != first and cache.mint_count == 2
+    print("✓ Token re-minted inside the refresh margin")
+
+    cache.invalidate()
+    cache.get_token()
+    assert cache.mint_count == 3
+    print("✓ invalidate() forces a new token")
+
+def test_admin_calls_against_mock_server():
+    """Test sync and async admin calls authenticate against the mock Ghost server"""
+    print("\n===== Testing Admin Calls Against Mock Ghost =====")
+
+    from ghost_api_client import GhostApiClient
+    from mock_ghost_server import MOCK_ADMIN_KEY, start_mock_server
+
+    server = start_mock_server()
+    try:
+        with GhostApiClient(server.url, MOCK_ADMIN_KEY, "local-content-key") as client:
+            for i in range(20):
+                result = client.create_tag(f"Test Tag {i}", f"test-tag-{i}")
+                assert "tags" in result, result
+            assert client.admin_tokens.mint_count == 1
+            print("✓ 20 admin calls succeeded with a single minted token")
+
+        wrong_key = MOCK_ADMIN_KEY.split(":")[0] + ":" + "11" * 32
+        with GhostApiClient(server.url, wrong_key, "local-content-key") as client:
+            result = client.create_tag("Rejected", "rejected")
+            assert result["errors"][0]["message"] == "Invalid token signature"
+            assert server.store.tag_by_slug("rejected") is None
+        print("✓ Tokens signed with the wrong secret are rejected with 401")
+
+        import asyncio
+        pytest.importorskip("aiohttp", reason="aiohttp not installed, skipping async client check")
+        from async_ghost_api_client import AsyncGhostApiClient
+
+        async def create_tags():
+            async with AsyncGhostApiClient(server.url, MOCK_ADMIN_KEY, "local-content-key") as client:
+                results = await client.create_tags_bulk(
+                    [{"name": f"Async Tag {i}", "slug": f"async-tag-{i}"} for i in range(10)]
+                )
+                return results, client.admin_tokens.mint_count
+
+        results, mint_count = asyncio.run(create_tags())
+        assert all(outcome["error"] is None for outcome in results), results
+        assert mint_count == 1
+        print("✓ Async bulk admin calls share one minted token")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+if __name__ == "__main__":
+    print("=================================================")
+    print("  Luxe Queer Ghost Admin API Token Test")
+    print("=================================================")
+
+    start_time = time.time()
+
+    tests = {
+        "Token Format": test_token_format,
+        "Token Cache": test_token_cache,
+        "Mock Server Admin Calls": test_admin_calls_against_mock_server,
+    }
+    results = {}
+    for name, test in tests.items():
+        try:
+            test()
+            results[name] = True
+        except (AssertionError, ImportError, pytest.skip.Exception) as e:
+            print(f"✗ {name}: {e}")
+            results[name] = False
+
+    elapsed_time = time.time() - start_time
+
+    print("\n=================================================")
+    print("Test Summary:")
+    for name, success in results.items():
+        print(f"{name}: {'✅ Success' if success else '❌ Failed'}")
+    print(f"Test completed in {elapsed_time:.1f}s")
+    print("=================================================")
@@ -3,51 +3,257 @@
 import requests
 import json
 import os
+import time
+import hmac
+import base64
+import hashlib
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Audience claim Ghost expects in v3 Admin API tokens
+ADMIN_TOKEN_AUDIENCE = "/v3/admin/"
+
+def _b64url(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+def mint_admin_token(admin_key, audience=ADMIN_TOKEN_AUDIENCE, ttl=300, now=None):
+    """Create a short-lived HS256 JWT for the Ghost Admin API.
+    
+    admin_key is Ghost's "<id>:<hex secret>" Admin API key; the id becomes
+    the kid header and the hex-decoded secret signs the token.
+    """
+    key_id, _, secret = admin_key.partition(':')
+    if not key_id or not secret:
+        raise ValueError("Admin API key must look like '<id>:<secret>'")
+    iat = int(time.time() if now is None else now)
+    header = {"alg": "HS256", "typ": "JWT", "kid": key_id}
+    payload = {"iat": iat, "exp": iat + ttl, "aud": audience}
+    signing_input = ".".join(
+        _b64url(json.dumps(part, separators=(",", ":")).encode("utf-8")) for part in (header, payload)
+    )
+    signature = hmac.new(bytes.fromhex(secret), signing_input.encode("ascii"), hashlib.sha256).digest()
+    return f"{signing_input}.{_b64url(signature)}"
+
+class AdminTokenCache:
+    """Hand out one admin JWT until it is close to expiring, then mint a new one"""
+    
+    def __init__(self, admin_key, audience=ADMIN_TOKEN_AUDIENCE, ttl=300, refresh_margin=60, clock=time.time):
+        self.admin_key = admin_key
+        self.audience = audience
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self.clock = clock
+        self.mint_count = 0
+        self._token = None
+        self._expires_at = 0
+        self._lock = threading.Lock()
+    
+    def get_token(self):
+        with self._lock:
+            now = self.clock()
+            if self._token is None or now >= self._expires_at - self.refresh_margin:
+                self._token = mint_admin_token(self.admin_key, self.audience, self.ttl, now)
+                self._expires_at = int(now) + self.ttl
+                self.mint_count += 1
+            return self._token
+    
+    def invalidate(self):
+        with self._lock:
+            self._token = None
+
+class GhostApiError(Exception):
+    """Raised when a Ghost API response carries errors instead of the requested resource"""
+
+def _browse_params(content_key, limit, page, filter, fields, include, order):
+    """Build Content API browse parameters, leaving out the ones not set"""
+    params = {'key': content_key, 'limit': limit}
+    for name, value in (('page', page), ('filter', filter), ('fields', fields), ('include', include), ('order', order)):
+        if value:
+            params[name] = value
+    return params
+
+class GhostRetry(Retry):
+    """Retry policy that also retries POSTs when Ghost rate limits them.
+
+    A 429 means the request was rejected before it was processed, so
+    resending a create is safe; other POST failures are not retried to
+    avoid creating duplicate posts.
+    """
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if method and method.upper() == "POST" and status_code == 429 and self.total:
+            return True
+        return super().is_retry(method, status_code, has_retry_after)
 
 class GhostApiClient:
-    def __init__(self, url, admin_key, content_key):
+    def __init__(self, url, admin_key, content_key, pool_size=10, timeout=(5, 30),
+                 max_retries=3, backoff_factor=0.5, verify=True):
+        """Initialize the client with a pooled keep-alive session.
+        
+        pool_size caps the number of kept-alive connections, timeout is a
+        (connect, read) pair in seconds, and failed requests answered with
+        429/5xx are retried up to max_retries times with exponential backoff.
+        """
         self.url = url
         self.admin_key = admin_key
         self.content_key = content_key
-        self.admin_api_url = f"{url}/ghost/api/admin/v3"
+        self.admin_api_url = f"{url}/ghost/api/v3/admin"
         self.content_api_url = f"{url}/ghost/api/v3/content"
+        self.timeout = timeout
+        self.admin_tokens = AdminTokenCache(admin_key)
+        
+        retry = GhostRetry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({'Content-Type': 'application/json'})
+        self.session.verify = verify
+        
+        # Per-endpoint latency statistics, keyed by "METHOD endpoint"
+        self.latency_stats = {}
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """Close the pooled connections"""
+        self.session.close()
+    
+    def _request(self, method, endpoint, **kwargs):
+        """Send a request through the pooled session and record its latency"""
+        kwargs.setdefault('timeout', self.timeout)
+        name = f"{method} {endpoint.replace(self.url, '', 1)}"
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, endpoint, **kwargs)
+        except requests.RequestException:
+            self._record_latency(name, time.perf_counter() - start, error=True)
+            raise
+        self._record_latency(name, time.perf_counter() - start, error=response.status_code >= 400)
+        return response
+    
+    def _admin_headers(self):
+        """Authorization header carrying a cached short-lived admin JWT"""
+        return {'Authorization': f"Ghost {self.admin_tokens.get_token()}"}
+    
+    def _admin_request(self, method, endpoint, **kwargs):
+        """Send an Admin API request, re-minting the token once if Ghost rejects it"""
+        response = self._request(method, endpoint, headers=self._admin_headers(), **kwargs)
+        if response.status_code == 401:
+            # e.g. clock skew between us and Ghost; a fresh token usually fixes it
+            self.admin_tokens.invalidate()
+            response = self._request(method, endpoint, headers=self._admin_headers(), **kwargs)
+        return response
+    
+    def _record_latency(self, name, elapsed, error=False):
+        stats = self.latency_stats.get(name)
+        if stats is None:
+            stats = self.latency_stats[name] = {
+                'count': 0, 'errors': 0, 'total_s': 0.0, 'min_s': None, 'max_s': 0.0,
+                'samples': deque(maxlen=1000),
+            }
+        stats['count'] += 1
+        stats['errors'] += int(error)
+        stats['total_s'] += elapsed
+        stats['min_s'] = elapsed if stats['min_s'] is None else min(stats['min_s'], elapsed)
+        stats['max_s'] = max(stats['max_s'], elapsed)
+        stats['samples'].append(elapsed)
+    
+    def get_latency_stats(self):
+        """Return per-endpoint call counts, errors and latency percentiles in seconds"""
+        report = {}
+        for name, stats in self.latency_stats.items():
+            samples = sorted(stats['samples'])
+            report[name] = {
+                'count': stats['count'],
+                'errors': stats['errors'],
+                'avg_s': stats['total_s'] / stats['count'],
+                'min_s': stats['min_s'],
+                'max_s': stats['max_s'],
+                'p50_s': samples[len(samples) // 2],
+                'p95_s': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+            }
+        return report
     
     def get_site_info(self):
         """Get basic information about the Ghost site"""
         endpoint = f"{self.content_api_url}/settings"
-        headers = {'Content-Type': 'application/json'}
         params = {'key': self.content_key}
         
-        response = requests.get(endpoint, headers=headers, params=params)
+        response = self._request('GET', endpoint, params=params)
         return response.json()
     
-    def get_posts(self, limit=5):
-        """Get posts from the Ghost site"""
+    def get_posts(self, limit=5, page=None, filter=None, fields=None, include='tags,authors', order=None):
+        """Get one page of posts from the Ghost site, optionally filtered with Ghost NQL"""
         endpoint = f"{self.content_api_url}/posts"
-        headers = {'Content-Type': 'application/json'}
-        params = {
-            'key': self.content_key,
-            'limit': limit,
-            'include': 'tags,authors'
-        }
+        params = _browse_params(self.content_key, limit, page, filter, fields, include, order)
         
-        response = requests.get(endpoint, headers=headers, params=params)
+        response = self._request('GET', endpoint, params=params)
         return response.json()
     
-    def get_tags(self):
-        """Get all tags from the Ghost site"""
+    def get_tags(self, limit='all', page=None, filter=None, fields=None, include=None, order=None):
+        """Get tags from the Ghost site (all of them unless a limit is given)"""
         endpoint = f"{self.content_api_url}/tags"
-        headers = {'Content-Type': 'application/json'}
-        params = {'key': self.content_key, 'limit': 'all'}
+        params = _browse_params(self.content_key, limit, page, filter, fields, include, order)
         
-        response = requests.get(endpoint, headers=headers, params=params)
+        response = self._request('GET', endpoint, params=params)
         return response.json()
     
+    def _iter_pages(self, fetch_page, resource, prefetch=True):
+        """Yield every item of a paginated browse endpoint.
+        
+        fetch_page(page) returns one decoded response. With prefetch the
+        next page is requested on a background thread while the caller
+        works through the current one.
+        """
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            page = 1
+            pending = executor.submit(fetch_page, page) if executor else None
+            while page:
+                data = pending.result() if executor else fetch_page(page)
+                if resource not in data:
+                    raise GhostApiError(data.get('errors', data))
+                next_page = data.get('meta', {}).get('pagination', {}).get('next')
+                if executor and next_page:
+                    pending = executor.submit(fetch_page, next_page)
+                yield from data[resource]
+                page = next_page
+        finally:
+            if executor:
+                executor.shutdown(wait=True, cancel_futures=True)
+    
+    def iter_posts(self, filter=None, fields=None, include='tags,authors', order=None, page_size=100, prefetch=True):
+        """Lazily yield all posts matching filter, fetching page_size posts per request"""
+        def fetch_page(page):
+            return self.get_posts(limit=page_size, page=page, filter=filter, fields=fields, include=include, order=order)
+        return self._iter_pages(fetch_page, 'posts', prefetch)
+    
+    def iter_tags(self, filter=None, fields=None, include=None, order=None, page_size=100, prefetch=True):
+        """Lazily yield all tags matching filter, fetching page_size tags per request"""
+        def fetch_page(page):
+            return self.get_tags(limit=page_size, page=page, filter=filter, fields=fields, include=include, order=order)
+        return self._iter_pages(fetch_page, 'tags', prefetch)
+    
     def create_tag(self, name, slug, description=None, feature_image=None):
         """Create a new tag using the Admin API"""
         endpoint = f"{self.admin_api_url}/tags"
-        headers = {'Content-Type': 'application/json'}
         
         data = {
             "tags": [
@@ -64,17 +270,13 @@ class GhostApiClient:
         if feature_image:
             data["tags"][0]["feature_image"] = feature_image
         
-        # Admin API requires authentication with the admin key
-        admin_auth = self.admin_key.split(':')
-        auth = (admin_auth[0], admin_auth[1])
-        
-        response = requests.post(endpoint, headers=headers, json=data, auth=auth)
+        # Admin API requires a JWT signed with the admin key
+        response = self._admin_request('POST', endpoint, json=data)
         return response.json()
     
     def create_post(self, title, html_content, status="draft", tags=None, featured=False):
         """Create a new post using the Admin API"""
         endpoint = f"{self.admin_api_url}/posts"
-        headers = {'Content-Type': 'application/json'}
         
         data = {
             "posts": [
@@ -90,23 +292,16 @@ class GhostApiClient:
         if tags:
             data["posts"][0]["tags"] = tags
         
-        # Admin API requires authentication with the admin key
-        admin_auth = self.admin_key.split(':')
-        auth = (admin_auth[0], admin_auth[1])
-        
-        response = requests.post(endpoint, headers=headers, json=data, auth=auth)
+        # Admin API requires a JWT signed with the admin key
+        response = self._admin_request('POST', endpoint, json=data)
         return response.json()
     
     def update_settings(self, settings_data):
         """Update Ghost settings using the Admin API"""
         endpoint = f"{self.admin_api_url}/settings"
-        headers = {'Content-Type': 'application/json'}
-        
-        # Admin API requires authentication with the admin key
-        admin_auth = self.admin_key.split(':')
-        auth = (admin_auth[0], admin_auth[1])
         
-        response = requests.put(endpoint, headers=headers, json=settings_data, auth=auth)
+        # Admin API requires a JWT signed with the admin key
+        response = self._admin_request('PUT', endpoint, json=settings_data)
         return response.json()
 
 # Example usage
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+
+import json
+import time
+import sqlite3
+from datetime import datetime, timezone
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    id TEXT PRIMARY KEY,
+    slug TEXT,
+    published_at TEXT,
+    updated_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS post_tags (
+    post_id TEXT NOT NULL,
+    tag_slug TEXT NOT NULL,
+    PRIMARY KEY (post_id, tag_slug)
+);
+CREATE INDEX IF NOT EXISTS post_tags_by_tag ON post_tags (tag_slug);
+CREATE TABLE IF NOT EXISTS tags (
+    slug TEXT PRIMARY KEY,
+    id TEXT,
+    name TEXT,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    resource TEXT PRIMARY KEY,
+    last_updated_at TEXT,
+    synced_at REAL
+);
+"""
+
+def _nql_timestamp(value):
+    """Convert a Ghost ISO timestamp to the 'YYYY-MM-DD HH:MM:SS' form NQL filters expect"""
+    return value.replace("T", " ")[:19]
+
+class GhostContentCache:
+    def __init__(self, client, db_path="ghost_content_cache.sqlite3", max_age=60, reconcile_interval=3600):
+        """Persistent SQLite cache of Ghost posts and tags.
+
+        Posts are synced incrementally: each sync only asks Ghost for posts
+        whose updated_at is at or after the newest one already cached. Syncs
+        closer together than max_age seconds are skipped, so several reads in
+        one build cost a single round trip.
+
+        Deleted or unpublished posts never show up in an incremental sync, so
+        at most every reconcile_interval seconds (and on every forced sync) a
+        reconciliation pass lists the ids Ghost still serves, drops the rest,
+        and refreshes all tags.
+        """
+        self.client = client
+        self.db_path = db_path
+        self.max_age = max_age
+        self.reconcile_interval = reconcile_interval
+        self.db = sqlite3.connect(db_path)
+        self.db.executescript(SCHEMA)
+        self.stats = {"hits": 0, "misses": 0, "syncs": 0, "posts_synced": 0, "tags_synced": 0,
+                      "reconciles": 0, "posts_removed": 0, "tags_removed": 0}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.db.close()
+
+    def _sync_state(self, resource):
+        row = self.db.execute("SELECT last_updated_at, synced_at FROM sync_state WHERE resource = ?", (resource,)).fetchone()
+        return row if row else (None, None)
+
+    def _set_sync_state(self, resource, last_updated_at):
+        self.db.execute(
+            "INSERT OR REPLACE INTO sync_state (resource, last_updated_at, synced_at) VALUES (?, ?, ?)",
+            (resource, last_updated_at, time.time()),
+        )
+
+    def sync_posts(self, force=False):
+        """Pull posts changed since the last sync; returns the ids that were (re)fetched"""
+        last_updated_at, synced_at = self._sync_state("posts")
+        if not force and synced_at and time.time() - synced_at < self.max_age:
+            return set()
+
+        # >= rather than > so posts sharing the newest second are not missed; upserts make the overlap harmless
+        filter_expr = f"updated_at:>='{_nql_timestamp(last_updated_at)}'" if last_updated_at else None
+        fetched = set()
+        newest = last_updated_at
+        for post in self.client.iter_posts(filter=filter_expr, include="tags,authors", order="updated_at asc"):
+            self._store_post(post)
+            fetched.add(post["id"])
+            if post.get("updated_at") and (newest is None or post["updated_at"] > newest):
+                newest = post["updated_at"]
+        self._set_sync_state("posts", newest)
+        self.db.commit()
+
+        self.stats["syncs"] += 1
+        self.stats["posts_synced"] += len(fetched)
+        self.reconcile(force=force)
+        return fetched
+
+    def reconcile(self, force=False):
+        """Drop cached posts Ghost no longer serves and refresh every tag; returns the removed post ids.
+
+        Posts are listed with fields=id, so the sweep costs one small request
+        per page. Runs at most every reconcile_interval seconds unless forced.
+        """
+        _, reconciled_at = self._sync_state("reconcile")
+        if not force and reconciled_at and time.time() - reconciled_at < self.reconcile_interval:
+            return set()
+
+        live_ids = {post["id"] for post in self.client.iter_posts(fields="id", include=None)}
+        cached_ids = {row[0] for row in self.db.execute("SELECT id FROM posts")}
+        removed = cached_ids - live_ids
+        self.db.executemany("DELETE FROM posts WHERE id = ?", [(post_id,) for post_id in removed])
+        self.db.executemany("DELETE FROM post_tags WHERE post_id = ?", [(post_id,) for post_id in removed])
+
+        tags = list(self.client.iter_tags())
+        slugs_by_id = {tag["id"]: tag["slug"] for tag in tags if tag.get("id") and tag.get("slug")}
+        # A renamed slug keeps its id; move the post links over so tag lookups still find the posts
+        for tag_id, old_slug in self.db.execute("SELECT id, slug FROM tags").fetchall():
+            new_slug = slugs_by_id.get(tag_id)
+            if new_slug and new_slug != old_slug:
+                self.db.execute("UPDATE OR REPLACE post_tags SET tag_slug = ? WHERE tag_slug = ?", (new_slug, old_slug))
+        live_slugs = set(slugs_by_id.values())
+        stale_slugs = [row[0] for row in self.db.execute("SELECT slug FROM tags") if row[0] not in live_slugs]
+        self.db.executemany("DELETE FROM tags WHERE slug = ?", [(slug,) for slug in stale_slugs])
+        for tag in tags:
+            if tag.get("slug"):
+                self._store_tag(tag)
+        self._set_sync_state("reconcile", None)
+        self.db.commit()
+
+        self.stats["reconciles"] += 1
+        self.stats["posts_removed"] += len(removed)
+        self.stats["tags_removed"] += len(stale_slugs)
+        self.stats["tags_synced"] += len(tags)
+        return removed
+
+    def _store_post(self, post):
+        self.db.execute(
+            "INSERT OR REPLACE INTO posts (id, slug, published_at, updated_at, data) VALUES (?, ?, ?, ?, ?)",
+            (post["id"], post.get("slug"), post.get("published_at"), post.get("updated_at"), json.dumps(post)),
+        )
+        self.db.execute("DELETE FROM post_tags WHERE post_id = ?", (post["id"],))
+        self.db.executemany(
+            "INSERT OR IGNORE INTO post_tags (post_id, tag_slug) VALUES (?, ?)",
+            [(post["id"], tag["slug"]) for tag in post.get("tags", []) if tag.get("slug")],
+        )
+        for tag in post.get("tags", []):
+            if tag.get("slug"):
+                self._store_tag(tag)
+
+    def _store_tag(self, tag):
+        self.db.execute(
+            "INSERT OR REPLACE INTO tags (slug, id, name, data) VALUES (?, ?, ?, ?)",
+            (tag["slug"], tag.get("id"), tag.get("name"), json.dumps(tag)),
+        )
+
+    def get_posts_by_tag(self, tag_slug, sync=True):
+        """Return the posts carrying tag_slug, newest first, syncing changes from Ghost first"""
+        fetched = self.sync_posts() if sync else set()
+        rows = self.db.execute(
+            "SELECT p.id, p.data FROM posts p JOIN post_tags t ON t.post_id = p.id "
+            "WHERE t.tag_slug = ? ORDER BY p.published_at DESC",
+            (tag_slug,),
+        ).fetchall()
+        misses = sum(1 for post_id, _ in rows if post_id in fetched)
+        self.stats["misses"] += misses
+        self.stats["hits"] += len(rows) - misses
+        return [json.loads(data) for _, data in rows]
+
+    def get_tag(self, slug):
+        """Return a tag by slug, asking Ghost only when it is not cached"""
+        row = self.db.execute("SELECT data FROM tags WHERE slug = ?", (slug,)).fetchone()
+        if row:
+            self.stats["hits"] += 1
+            return json.loads(row[0])
+
+        self.stats["misses"] += 1
+        tag = next(self.client.iter_tags(filter=f"slug:{slug}", prefetch=False), None)
+        if tag:
+            self._store_tag(tag)
+            self.db.commit()
+            self.stats["tags_synced"] += 1
+        return tag
+
+    def invalidate(self, post_id=None, tag_slug=None):
+        """Drop cached entries so the next read refetches them.
+
+        With no arguments the whole cache is cleared and the next sync is a
+        full one. Dropping a single post also rewinds the sync watermark,
+        because a post that has not changed upstream would otherwise never be
+        fetched again.
+        """
+        if post_id is None and tag_slug is None:
+            for table in ("posts", "post_tags", "tags", "sync_state"):
+                self.db.execute(f"DELETE FROM {table}")
+        if post_id is not None:
+            self.db.execute("DELETE FROM posts WHERE id = ?", (post_id,))
+            self.db.execute("DELETE FROM post_tags WHERE post_id = ?", (post_id,))
+            self.db.execute("DELETE FROM sync_state WHERE resource = 'posts'")
+        if tag_slug is not None:
+            self.db.execute("DELETE FROM tags WHERE slug = ?", (tag_slug,))
+        self.db.commit()
+
+    def get_stats(self):
+        """Return hit/miss counters plus the hit rate and cache size"""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        last_updated_at, synced_at = self._sync_state("posts")
+        _, reconciled_at = self._sync_state("reconcile")
+        return dict(
+            self.stats,
+            hit_rate=self.stats["hits"] / lookups if lookups else 0.0,
+            cached_posts=self.db.execute("SELECT COUNT(*) FROM posts").fetchone()[0],
+            cached_tags=self.db.execute("SELECT COUNT(*) FROM tags").fetchone()[0],
+            last_updated_at=last_updated_at,
+            last_synced=datetime.fromtimestamp(synced_at, timezone.utc).isoformat() if synced_at else None,
+            last_reconciled=datetime.fromtimestamp(reconciled_at, timezone.utc).isoformat() if reconciled_at else None,
+        )
+
+# Example usage
+if __name__ == "__main__":
+    from ghost_api_client import GhostApiClient
+
+    # Ghost instance URL
+    ghost_url = "https://rainbow-millipede.pikapod.net"
+
+    # Updated API credentials
+    admin_key = "67ef67107bdbb900014522e2:a83281ff2c5c9eb4ee94242f87cd1e8ace9d4cb9317358acda25f8ec1f266d73"
+    content_key = "bbc75241a46836b87673d05b12"
+
+    client = GhostApiClient(ghost_url, admin_key, content_key)
+    with GhostContentCache(client) as cache:
+        posts = cache.get_posts_by_tag("jan-feb-2025")
+        print(f"{len(posts)} posts in jan-feb-2025")
+        print(json.dumps(cache.get_stats(), indent=2))
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Content Cache Test Script for the Luxe Queer Ghost Client
+Runs against the local mock Ghost server, no real Ghost instance needed
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ghost_api_client import GhostApiClient
+from ghost_content_cache import GhostContentCache
+from mock_ghost_server import MOCK_ADMIN_KEY, start_mock_server
+
+def test_reconcile_drops_deleted_posts_and_renamed_tags(tmp_path):
+    """Test that posts deleted or unpublished in Ghost and renamed tags stop being served"""
+    print("\n===== Testing Cache Reconciliation =====")
+
+    server = start_mock_server(num_posts=24)
+    try:
+        with GhostApiClient(server.url, MOCK_ADMIN_KEY, "local-content-key") as client, \
+                GhostContentCache(client, str(tmp_path / "cache.sqlite3")) as cache:
+            issue_posts = cache.get_posts_by_tag("jan-feb-2025")
+            assert len(issue_posts) == 4
+            deleted, unpublished = issue_posts[0]["id"], issue_posts[1]["id"]
+
+            store = server.store
+            store.posts = [post for post in store.posts if post["id"] != deleted]
+            next(post for post in store.posts if post["id"] == unpublished)["status"] = "draft"
+            store.tag_by_slug("jan-feb-2025")["slug"] = "january-february-2025"
+
+            # Incremental syncs can't see any of this; the watermark only finds changed posts
+            assert len(cache.get_posts_by_tag("jan-feb-2025")) == 4
+            print("✓ Incremental sync alone keeps serving the stale posts")
+
+            cache.sync_posts(force=True)
+            remaining = cache.get_posts_by_tag("january-february-2025", sync=False)
+            assert {post["id"] for post in remaining} == {post["id"] for post in issue_posts[2:]}
+            assert cache.get_posts_by_tag("jan-feb-2025", sync=False) == []
+            assert cache.get_stats()["posts_removed"] == 2
+            print("✓ Forced sync drops the deleted and unpublished posts")
+
+            assert cache.get_tag("january-february-2025")["id"] == store.tag_by_slug("january-february-2025")["id"]
+            assert cache.db.execute("SELECT COUNT(*) FROM tags WHERE slug = 'jan-feb-2025'").fetchone()[0] == 0
+            print("✓ Renamed tag is served under its new slug with its posts")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    with tempfile.TemporaryDirectory() as tmp:
+        test_reconcile_drops_deleted_posts_and_renamed_tags(pathlib.Path(tmp))
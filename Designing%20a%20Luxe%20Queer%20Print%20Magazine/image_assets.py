@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+
+import io
+import os
+import re
+import json
+import hashlib
+import requests
+import threading
+from html import unescape
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from PIL import Image, ImageOps
+
+try:
+    from PIL import ImageCms
+    SRGB_PROFILE = ImageCms.createProfile("sRGB")
+except ImportError:  # Pillow built without littlecms; embedded profiles are then ignored
+    ImageCms = None
+    SRGB_PROFILE = None
+
+IMG_SRC = re.compile(r'(<img\b[^>]*?\bsrc\s*=\s*)(["\'])(.*?)\2', re.IGNORECASE)
+
+class ImageAssetStage:
+    def __init__(self, cache_dir, content_width_in, dpi=300, column_count=1, column_gap_in=0.0,
+                 quality=85, max_workers=8, timeout=(5, 30)):
+        """Fetch, downsample and cache the images an issue uses.
+
+        Images are resampled to at most `dpi` pixels per inch of the width they
+        can occupy on the page (the full content width for feature images, one
+        column for inline images), converted to sRGB JPEG and cached on disk by
+        URL plus transform parameters, so later builds skip the download.
+        """
+        self.cache_dir = cache_dir
+        self.dpi = dpi
+        self.quality = quality
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_width_px = {
+            'feature': round(content_width_in * dpi),
+            'inline': round((content_width_in - column_gap_in * (column_count - 1)) / column_count * dpi),
+        }
+        self.stats = {'cached': 0, 'fetched': 0, 'failed': 0, 'bytes_in': 0, 'bytes_out': 0}
+        self._stats_lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def cache_path(self, url, kind):
+        """Cache file for url under the current transform parameters"""
+        params = {'url': url, 'max_width_px': self.max_width_px[kind], 'quality': self.quality, 'format': 'jpeg-srgb'}
+        key = hashlib.sha256(json.dumps(params, sort_keys=True).encode('utf-8')).hexdigest()[:24]
+        return os.path.join(self.cache_dir, f"{key}.jpg")
+
+    def process_image(self, data, max_width_px):
+        """Downsample to max_width_px and convert to an sRGB JPEG; returns the encoded bytes"""
+        image = Image.open(io.BytesIO(data))
+        image = ImageOps.exif_transpose(image)
+
+        icc_profile = image.info.get('icc_profile')
+        if icc_profile and ImageCms is not None and image.mode in ('RGB', 'RGBA', 'CMYK'):
+            try:
+                source_profile = ImageCms.ImageCmsProfile(io.BytesIO(icc_profile))
+                image = ImageCms.profileToProfile(image, source_profile, SRGB_PROFILE, outputMode='RGB')
+            except ImageCms.PyCMSError:
+                pass
+        if image.mode in ('RGBA', 'LA', 'P'):
+            # JPEG has no alpha; flatten onto the white page
+            image = image.convert('RGBA')
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel('A'))
+            image = background
+        elif image.mode != 'RGB':
+            image = image.convert('RGB')
+
+        if image.width > max_width_px:
+            height = max(1, round(image.height * max_width_px / image.width))
+            image = image.resize((max_width_px, height), Image.LANCZOS, reducing_gap=3.0)
+
+        out = io.BytesIO()
+        image.save(out, 'JPEG', quality=self.quality, optimize=True, progressive=True, dpi=(self.dpi, self.dpi))
+        return out.getvalue()
+
+    def _prepare(self, url, kind):
+        """Return the local file for url, fetching and processing it on a cache miss"""
+        path = self.cache_path(url, kind)
+        if os.path.exists(path):
+            self._count(cached=1)
+            return path
+
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        encoded = self.process_image(response.content, self.max_width_px[kind])
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(encoded)
+        os.replace(tmp_path, path)
+        self._count(fetched=1, bytes_in=len(response.content), bytes_out=len(encoded))
+        return path
+
+    def _count(self, **increments):
+        with self._stats_lock:
+            for name, value in increments.items():
+                self.stats[name] += value
+
+    def prepare(self, images):
+        """Prepare (url, kind) pairs concurrently; returns {url: local path} for the ones that succeeded"""
+        # Feature images need the larger rendition, so they win when a URL is used both ways
+        wanted = {}
+        for url, kind in images:
+            # data: URIs and local files need no fetching
+            if url and url.startswith(('http://', 'https://')) and wanted.get(url) != 'feature':
+                wanted[url] = kind
+
+        local_paths = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {url: executor.submit(self._prepare, url, kind) for url, kind in wanted.items()}
+            for url, future in futures.items():
+                try:
+                    local_paths[url] = future.result()
+                except (requests.RequestException, OSError, Image.DecompressionBombError) as e:
+                    # Leave the original URL in place so WeasyPrint can still try it
+                    self._count(failed=1)
+                    print(f"Could not prepare image {url}: {str(e)}")
+        return local_paths
+
+    def localize_posts(self, posts):
+        """Return copies of posts whose feature and inline images point at prepared local files"""
+        images = []
+        for post in posts:
+            images.append((post.get('feature_image'), 'feature'))
+            images.extend((unescape(match.group(3)), 'inline') for match in IMG_SRC.finditer(post.get('html') or ''))
+        local_paths = self.prepare(images)
+
+        def local_uri(url):
+            return Path(local_paths[url]).resolve().as_uri() if url in local_paths else url
+
+        def replace_src(match):
+            url = unescape(match.group(3))
+            src = local_uri(url) if url in local_paths else match.group(3)
+            return f"{match.group(1)}{match.group(2)}{src}{match.group(2)}"
+
+        localized = []
+        for post in posts:
+            post = dict(post)
+            if post.get('feature_image'):
+                post['feature_image'] = local_uri(post['feature_image'])
+            if post.get('html'):
+                post['html'] = IMG_SRC.sub(replace_src, post['html'])
+            localized.append(post)
+        return localized
@@ -2,18 +2,16 @@
 # coding=utf-8
 
 import os
+import sys
 import json
 import argparse
 import torch
 from transformers import AutoModelForCausalLM, AutoTokenizer, GenerationConfig
 from peft import PeftModel
 
-def format_prompt(instruction, input_text=None):
-    """Format the instruction and input into a prompt."""
-    if input_text:
-        return f"### Instruction:\n{instruction}\n\n### Input:\n{input_text}\n\n### Response:\n"
-    else:
-        return f"### Instruction:\n{instruction}\n\n### Response:\n"
+# The prompt template shared with the training scripts lives at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from prompt_template import format_prompt, prompt_template, decode_new_tokens
 
 def main():
     parser = argparse.ArgumentParser()
@@ -32,6 +30,9 @@ def main():
     # Load tokenizer
     print(f"Loading tokenizer from {args.base_model}")
     tokenizer = AutoTokenizer.from_pretrained(args.base_model, trust_remote_code=True)
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
+    tokenizer.padding_side = "left"  # Prompts must end where generation starts
     
     # Load model
     print(f"Loading model from {args.base_model}")
@@ -71,8 +72,8 @@ def main():
     print(prompt)
     print("==================\n")
     
-    # Tokenize prompt
-    inputs = tokenizer(prompt, return_tensors="pt").to(model.device)
+    # Tokenize prompt from the pre-tokenized template segments, as in training
+    inputs = prompt_template(tokenizer).prompt_inputs([args.prompt], [args.input]).to(model.device)
     
     # Generate response
     print("Generating response...")
@@ -82,11 +83,8 @@ def main():
             generation_config=generation_config,
         )
     
-    # Decode and print response
-    response = tokenizer.decode(outputs[0], skip_special_tokens=True)
-    
-    # Extract just the response part (after the prompt)
-    response = response[len(prompt):]
+    # Decode just the response part (the tokens after the prompt)
+    response = decode_new_tokens(tokenizer, outputs, inputs["input_ids"].shape[1])[0]
     
     print("\n===== RESPONSE =====")
     print(response)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+from html import escape
+from string import Formatter
+
+class CompiledTemplate:
+    """A str.format-style template parsed once into literal and field segments.
+
+    Field values are HTML-escaped unless the field is listed in `safe`, which
+    is meant for markup that is already HTML, such as a post's body from Ghost.
+    """
+
+    def __init__(self, source, safe=()):
+        self.segments = []
+        for literal, field, _, _ in Formatter().parse(source):
+            if literal:
+                self.segments.append((literal, None))
+            if field is not None:
+                self.segments.append((None, field))
+        self.safe = frozenset(safe)
+
+    def render(self, **context):
+        parts = []
+        for literal, field in self.segments:
+            if field is None:
+                parts.append(literal)
+            elif field in self.safe:
+                parts.append(str(context[field]))
+            else:
+                parts.append(escape(str(context[field])))
+        return "".join(parts)
+
+    def render_to(self, write, context):
+        """Render into a single write() call"""
+        write(self.render(**context))
+
+DOCUMENT_START = CompiledTemplate("""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="UTF-8">
+            <title>{title}</title>
+        </head>
+        <body>
+""")
+
+DOCUMENT_END = CompiledTemplate("""
+        </body>
+        </html>
+""")
+
+COVER = CompiledTemplate("""
+            <div class="cover-page">
+                <div class="cover-issue">Luxe Queer Magazine</div>
+                <h1 class="cover-title">{title}</h1>
+                <div class="cover-subtitle">Fashion, Art, Culture, Travel, Technology, and Luxury from a Queer Perspective</div>
+                <div class="cover-issue">{issue_date}</div>
+            </div>
+""")
+
+TOC_HEADER = CompiledTemplate("""
+            <div class="page-break"></div>
+
+            <h1>Table of Contents</h1>
+""")
+
+TOC_ENTRY = CompiledTemplate("""
+            <div class="toc-entry">
+                <span class="toc-title">{title}</span>
+                <span class="toc-page">{page}</span>
+            </div>
+""")
+
+ARTICLE = CompiledTemplate("""
+            <article>
+                <div class="article-tag">{tag}</div>
+                <h1>{title}</h1>
+
+                <div class="article-meta">
+                    By {author} |
+                    {date}
+                </div>
+                {feature_image}
+                <div class="two-column">
+                    {body}
+                </div>
+            </article>
+""", safe=("feature_image", "body"))
+
+FEATURE_IMAGE = CompiledTemplate("""
+                <img class="feature-image" src="{src}" alt="{alt}">
+""")
+
+PAGE_BREAK = CompiledTemplate("""
+            <div class="page-break"></div>
+""")
+
+def article_context(post):
+    """Pull the fields the article template needs out of a Ghost post"""
+    return {
+        'tag': (post.get('primary_tag') or {}).get('name', ''),
+        'title': post.get('title', 'Untitled'),
+        'author': (post.get('primary_author') or {}).get('name', 'Anonymous'),
+        'date': (post.get('published_at') or '').split('T')[0],
+        'feature_image': FEATURE_IMAGE.render(src=post['feature_image'], alt=post.get('title', '')) if post.get('feature_image') else '',
+        'body': post.get('html') or '',
+    }
+
+class IssueHtmlRenderer:
+    """Streams issue HTML article by article from the module's precompiled templates"""
+
+    def write_document_start(self, write, title):
+        DOCUMENT_START.render_to(write, {'title': title})
+
+    def write_document_end(self, write):
+        DOCUMENT_END.render_to(write, {})
+
+    def write_cover(self, write, title, issue_date):
+        COVER.render_to(write, {'title': title, 'issue_date': issue_date})
+
+    def write_toc(self, write, toc_entries):
+        for entry in toc_entries:
+            TOC_ENTRY.render_to(write, entry)
+
+    def write_article(self, write, post):
+        ARTICLE.render_to(write, article_context(post))
+
+    def write_issue(self, out, posts, title, issue_date, toc_entries):
+        """Write a complete issue to a file-like object without building it in memory"""
+        write = out.write
+        self.write_document_start(write, title)
+        self.write_cover(write, title, issue_date)
+        TOC_HEADER.render_to(write, {})
+        self.write_toc(write, toc_entries)
+        for post in posts:
+            PAGE_BREAK.render_to(write, {})
+            self.write_article(write, post)
+        self.write_document_end(write)
+
+    def render_issue_to_file(self, path, posts, title, issue_date, toc_entries):
+        with open(path, 'w', encoding='utf-8') as f:
+            self.write_issue(f, posts, title, issue_date, toc_entries)
+        return path
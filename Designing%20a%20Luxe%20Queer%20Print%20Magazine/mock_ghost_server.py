@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+
+import re
+import ssl
+import hmac
+import json
+import base64
+import hashlib
+import time
+import random
+import argparse
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# Matches both the v3 URL layouts the client uses for the Content and Admin APIs
+API_PATH = re.compile(r"^/ghost/api/(?:v3/)?(content|admin)(?:/v3)?/([a-z_]+)/?(?:([^/]+)/?)?$")
+
+SECTIONS = ["fashion", "art", "culture", "travel", "technology", "luxury"]
+# Admin API key the mock accepts unless another one is configured
+MOCK_ADMIN_KEY = "000000000000000000000001:" + "00" * 32
+ADMIN_TOKEN_AUDIENCES = ("/v3/admin/", "/admin/")
+
+ISSUES = ["jan-feb-2025", "mar-apr-2025", "may-jun-2025", "jul-aug-2025", "sep-oct-2025", "nov-dec-2025"]
+
+def _b64url_decode(segment):
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+def verify_admin_token(token, admin_key, now=None):
+    """Check an Admin API JWT the way Ghost does; returns an error message or None"""
+    key_id, _, secret = admin_key.partition(":")
+    try:
+        header_b64, payload_b64, signature_b64 = token.split(".")
+        header = json.loads(_b64url_decode(header_b64))
+        payload = json.loads(_b64url_decode(payload_b64))
+        signature = _b64url_decode(signature_b64)
+    except ValueError:
+        return "Malformed token"
+    if header.get("alg") != "HS256":
+        return "Unsupported algorithm"
+    if header.get("kid") != key_id:
+        return "Unknown Admin API Key"
+    expected = hmac.new(bytes.fromhex(secret), f"{header_b64}.{payload_b64}".encode("ascii"), hashlib.sha256).digest()
+    if not hmac.compare_digest(signature, expected):
+        return "Invalid token signature"
+    if payload.get("aud") not in ADMIN_TOKEN_AUDIENCES:
+        return "Invalid token audience"
+    now = time.time() if now is None else now
+    if not isinstance(payload.get("exp"), int) or payload["exp"] <= now:
+        return "Token expired"
+    if payload["exp"] - payload.get("iat", 0) > 5 * 60:
+        return "Token lifetime exceeds 5 minutes"
+    return None
+
+def _timestamp(dt):
+    return dt.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+class MockGhostStore:
+    """In-memory posts, tags and settings for the stand-in Ghost server"""
+
+    def __init__(self, num_posts=0, seed=0):
+        self.lock = threading.Lock()
+        self.settings = {"title": "Luxe Queer (local)", "description": "Local stand-in Ghost site"}
+        self.tags = []
+        self.posts = []
+        self.next_id = 1
+
+        rng = random.Random(seed)
+        for slug in SECTIONS + ISSUES:
+            self.add_tag({"name": slug.replace("-", " ").title(), "slug": slug})
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        for i in range(num_posts):
+            section = self.tag_by_slug(rng.choice(SECTIONS))
+            issue = self.tag_by_slug(ISSUES[i % len(ISSUES)])
+            paragraphs = "".join(f"<p>Paragraph {j} of article {i}, darling.</p>" for j in range(rng.randint(5, 40)))
+            self.add_post({
+                "title": f"Article {i}",
+                "slug": f"article-{i}",
+                "html": f"<h2>Article {i}</h2>{paragraphs}",
+                "status": "published",
+                "featured": i % 10 == 0,
+                "tags": [section, issue],
+                "published_at": _timestamp(start + timedelta(hours=i)),
+                "updated_at": _timestamp(start + timedelta(hours=i)),
+            })
+
+    def _new_id(self):
+        new_id = f"{self.next_id:024x}"
+        self.next_id += 1
+        return new_id
+
+    def tag_by_slug(self, slug):
+        return next((tag for tag in self.tags if tag["slug"] == slug), None)
+
+    def add_tag(self, data):
+        with self.lock:
+            if self.tag_by_slug(data["slug"]):
+                return None
+            tag = dict(data, id=self._new_id())
+            self.tags.append(tag)
+            return tag
+
+    def _resolve_tag(self, tag):
+        """Find or create a post's tag the way Ghost's Admin API does; the caller holds the lock.
+
+        A plain string is a tag *name*, not a slug. A dict is matched by id,
+        then slug, then name. Tags that don't exist yet are created, with a
+        numbered slug if theirs is taken.
+        """
+        if isinstance(tag, str):
+            tag = {"name": tag}
+        for key in ("id", "slug", "name"):
+            if tag.get(key):
+                existing = next((t for t in self.tags if t[key] == tag[key]), None)
+                if existing:
+                    return existing
+        name = tag.get("name") or tag.get("slug")
+        base = tag.get("slug") or re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+        slug, n = base, 1
+        while self.tag_by_slug(slug):
+            n += 1
+            slug = f"{base}-{n}"
+        created = dict(tag, name=name, slug=slug, id=self._new_id())
+        self.tags.append(created)
+        return created
+
+    def add_post(self, data):
+        with self.lock:
+            now = _timestamp(datetime.now(timezone.utc))
+            post = {
+                "id": self._new_id(),
+                "uuid": self._new_id(),
+                "slug": re.sub(r"[^a-z0-9]+", "-", data["title"].lower()).strip("-"),
+                "status": "draft",
+                "featured": False,
+                "excerpt": "",
+                "feature_image": None,
+                "published_at": now,
+                "updated_at": now,
+                "authors": [{"id": "1", "name": "Octavia Opulence", "slug": "octavia"}],
+            }
+            post.update(data)
+            post["tags"] = [self._resolve_tag(tag) for tag in data.get("tags", [])]
+            self.posts.append(post)
+            return post
+
+def _matches_filter(post, filter_expr):
+    """Evaluate the subset of Ghost NQL the clients use: tag:slug and updated_at:>='timestamp', joined by +"""
+    if not filter_expr:
+        return True
+    for clause in filter_expr.split("+"):
+        key, _, value = clause.partition(":")
+        value = value.strip("'\"")
+        if key == "tag":
+            if value not in [tag["slug"] for tag in post.get("tags", [])]:
+                return False
+        elif key in ("updated_at", "published_at"):
+            op = re.match(r"[<>]=?", value)
+            op = op.group(0) if op else ""
+            threshold = value[len(op):].strip("'\"")
+            # Ghost accepts 'YYYY-MM-DD HH:MM:SS'; normalise both sides to comparable strings
+            current = post.get(key, "").replace("T", " ")[:19]
+            threshold = threshold.replace("T", " ")[:19]
+            checks = {">": current > threshold, ">=": current >= threshold, "<": current < threshold,
+                      "<=": current <= threshold, "": current == threshold}
+            if not checks[op]:
+                return False
+        elif str(post.get(key)) != value:
+            return False
+    return True
+
+def _paginate(items, params):
+    limit_param = params.get("limit", "15")
+    total = len(items)
+    if limit_param == "all":
+        limit, page = max(total, 1), 1
+    else:
+        limit, page = int(limit_param), int(params.get("page", "1"))
+    pages = max(1, -(-total // limit))
+    page_items = items[(page - 1) * limit:page * limit]
+    pagination = {
+        "page": page,
+        "limit": limit_param if limit_param == "all" else limit,
+        "pages": pages,
+        "total": total,
+        "next": page + 1 if page < pages else None,
+        "prev": page - 1 if page > 1 else None,
+    }
+    return page_items, {"pagination": pagination}
+
+def _shape_post(post, params):
+    includes = params.get("include", "").split(",")
+    shaped = dict(post)
+    if "tags" in includes:
+        shaped["primary_tag"] = post["tags"][0] if post["tags"] else None
+    else:
+        shaped.pop("tags", None)
+    if "authors" in includes:
+        shaped["primary_author"] = post["authors"][0] if post["authors"] else None
+    else:
+        shaped.pop("authors", None)
+    if params.get("fields"):
+        fields = set(params["fields"].split(",")) | {"id"}
+        shaped = {k: v for k, v in shaped.items() if k in fields or k in ("tags", "authors", "primary_tag", "primary_author")}
+    return shaped
+
+class MockGhostHandler(BaseHTTPRequestHandler):
+    """Serves the Ghost Content and Admin API endpoints used by GhostApiClient"""
+
+    # HTTP/1.1 so clients can keep connections alive between requests, without
+    # Nagle delaying the body that follows the headers on a reused connection
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_html(self, status, html):
+        # What a reverse proxy sends when Ghost itself is unreachable
+        body = html.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        return json.loads(self.body or b"{}")
+
+    def _dispatch(self, method):
+        server = self.server
+        # Always consume the body so injected failures leave the keep-alive connection usable
+        self.body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with server.stats_lock:
+            server.request_count += 1
+        if server.latency_s:
+            time.sleep(server.latency_s)
+        if server.error_rate and random.random() < server.error_rate:
+            if server.error_html:
+                return self._send_html(502, "<html><body><h1>502 Bad Gateway</h1></body></html>")
+            return self._send_json(503, {"errors": [{"message": "Injected failure"}]})
+
+        parsed = urlparse(self.path)
+        match = API_PATH.match(parsed.path)
+        if not match:
+            return self._send_json(404, {"errors": [{"message": "Resource not found"}]})
+        api, resource, _ = match.groups()
+        if api == "admin":
+            auth_error = self._check_admin_auth()
+            if auth_error:
+                return self._send_json(401, {"errors": [{"message": auth_error, "type": "UnauthorizedError"}]})
+        params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        handler = getattr(self, f"_{method.lower()}_{api}_{resource}", None)
+        if handler is None:
+            return self._send_json(404, {"errors": [{"message": "Resource not found"}]})
+        return handler(params)
+
+    def _check_admin_auth(self):
+        scheme, _, token = self.headers.get("Authorization", "").partition(" ")
+        if scheme != "Ghost" or not token:
+            return "Authorization header format is Authorization: Ghost [token]"
+        return verify_admin_token(token, self.server.admin_key)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    # --- Content API ---
+
+    def _get_content_settings(self, params):
+        self._send_json(200, {"settings": self.server.store.settings})
+
+    def _get_content_posts(self, params):
+        store = self.server.store
+        posts = [p for p in store.posts if p["status"] == "published" and _matches_filter(p, params.get("filter"))]
+        if params.get("order", "").startswith("updated_at"):
+            posts.sort(key=lambda p: p["updated_at"], reverse=params["order"].endswith("desc"))
+        page_items, meta = _paginate(posts, params)
+        self._send_json(200, {"posts": [_shape_post(p, params) for p in page_items], "meta": meta})
+
+    def _get_content_tags(self, params):
+        tags = [t for t in self.server.store.tags if _matches_filter(t, params.get("filter"))]
+        page_items, meta = _paginate(tags, params)
+        if params.get("fields"):
+            fields = set(params["fields"].split(",")) | {"id"}
+            page_items = [{k: v for k, v in t.items() if k in fields} for t in page_items]
+        self._send_json(200, {"tags": page_items, "meta": meta})
+
+    # --- Admin API ---
+
+    def _post_admin_tags(self, params):
+        data = self._read_json()["tags"][0]
+        tag = self.server.store.add_tag(data)
+        if tag is None:
+            return self._send_json(422, {"errors": [{"message": "Validation error, cannot save tag.", "context": "Tag already exists."}]})
+        self._send_json(201, {"tags": [tag]})
+
+    def _post_admin_posts(self, params):
+        data = self._read_json()["posts"][0]
+        self._send_json(201, {"posts": [self.server.store.add_post(data)]})
+
+    def _put_admin_settings(self, params):
+        settings = self._read_json().get("settings", {})
+        if isinstance(settings, list):
+            # Ghost's native format is a list of {key, value} pairs
+            settings = {item["key"]: item["value"] for item in settings}
+        self.server.store.settings.update(settings)
+        self._send_json(200, {"settings": self.server.store.settings})
+
+class MockGhostServer(ThreadingHTTPServer):
+    """Threaded stand-in Ghost server with optional latency and failure injection"""
+
+    daemon_threads = True
+
+    def __init__(self, address, store=None, latency_ms=0, error_rate=0.0, verbose=False, admin_key=MOCK_ADMIN_KEY,
+                 error_html=False):
+        super().__init__(address, MockGhostHandler)
+        self.store = store or MockGhostStore()
+        self.admin_key = admin_key
+        self.latency_s = latency_ms / 1000.0
+        self.error_rate = error_rate
+        # Answer injected failures with a proxy's HTML 502 page instead of Ghost's JSON 503
+        self.error_html = error_html
+        self.verbose = verbose
+        self.stats_lock = threading.Lock()
+        self.request_count = 0
+        self.connection_count = 0
+
+    def process_request(self, request, client_address):
+        with self.stats_lock:
+            self.connection_count += 1
+        super().process_request(request, client_address)
+
+    @property
+    def url(self):
+        scheme = "https" if isinstance(self.socket, ssl.SSLSocket) else "http"
+        host, port = self.server_address[:2]
+        return f"{scheme}://{host}:{port}"
+
+def start_mock_server(host="127.0.0.1", port=0, num_posts=0, certfile=None, keyfile=None, **options):
+    """Start a mock Ghost server in a background thread and return it"""
+    server = MockGhostServer((host, port), MockGhostStore(num_posts), **options)
+    if certfile:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(certfile, keyfile)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local stand-in Ghost server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2368)
+    parser.add_argument("--posts", type=int, default=300, help="Number of synthetic posts to seed")
+    parser.add_argument("--latency_ms", type=float, default=0, help="Artificial latency added to every request")
+    parser.add_argument("--error_rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--error_html", action="store_true", help="Answer injected failures with an HTML 502 page")
+    parser.add_argument("--certfile", default=None, help="TLS certificate to serve HTTPS")
+    parser.add_argument("--keyfile", default=None, help="TLS private key")
+    args = parser.parse_args()
+
+    server = start_mock_server(
+        args.host, args.port, args.posts, args.certfile, args.keyfile,
+        latency_ms=args.latency_ms, error_rate=args.error_rate, error_html=args.error_html, verbose=True,
+    )
+    print(f"Mock Ghost server listening on {server.url}")
+    print(f"Admin API key: {server.admin_key}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
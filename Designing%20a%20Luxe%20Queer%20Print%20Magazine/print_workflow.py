@@ -1,18 +1,154 @@
 #!/usr/bin/env python3
 
+import io
 import os
 import json
+import time
+import shutil
+import tarfile
+import zipfile
+import hashlib
+import tempfile
 import requests
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from ghost_api_client import GhostApiClient
+from ghost_content_cache import GhostContentCache
+from image_assets import ImageAssetStage
+from issue_html_renderer import ARTICLE, COVER, DOCUMENT_END, DOCUMENT_START, TOC_HEADER, IssueHtmlRenderer, article_context
 from weasyprint import HTML, CSS
+from weasyprint.text.fonts import FontConfiguration
+from pypdf import PdfReader, PdfWriter
 from datetime import datetime
 
+# Page geometry of the @page rule in create_print_css, used to size images for print
+PRINT_PAGE_WIDTH_IN = 9
+PRINT_MARGIN_IN = 1 / 2.54
+PRINT_COLUMN_COUNT = 2
+PRINT_COLUMN_GAP_IN = 0.5 / 2.54
+
+# Fragments leave out the page number so they can be reused at any position in an issue
+NO_FOLIO_CSS = "@page { @bottom-right { content: none; } }"
+# Blank pages carrying only the page number, stamped over the merged issue
+FOLIO_ONLY_CSS = """
+@page { @bottom-center { content: none; } }
+.folio + .folio { page-break-before: always; }
+"""
+# Front matter layouts tried before giving up on the TOC settling on a page count
+TOC_LAYOUT_PASSES = 3
+
+def _html_document(title, body):
+    """Wrap body markup in a standalone HTML document"""
+    return DOCUMENT_START.render(title=title) + body + DOCUMENT_END.render()
+
+def _file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def _render_pdf(html_content, css_path, pdf_path, extra_css=None):
+    """Render an HTML document to pdf_path and return its page count; runs in worker processes"""
+    stylesheets = [CSS(filename=css_path)]
+    if extra_css:
+        stylesheets.append(CSS(string=extra_css))
+    document = HTML(string=html_content).render(stylesheets=stylesheets)
+    # Write to a temporary name first so an interrupted render never leaves a truncated cache entry
+    tmp_path = f"{pdf_path}.{os.getpid()}.tmp"
+    document.write_pdf(tmp_path)
+    os.replace(tmp_path, pdf_path)
+    return len(document.pages)
+
+ARCHIVE_FORMATS = {'zip': None, 'tar': 'w', 'tar.gz': 'w:gz'}
+
+def _indesign_bundle(post):
+    """Encode one article's HTML and metadata files; returns (slug, {file name: bytes})"""
+    post_slug = post.get('slug', 'article')
+    meta = {
+        'title': post.get('title', 'Untitled'),
+        'author': (post.get('primary_author') or {}).get('name', 'Anonymous'),
+        'date': (post.get('published_at') or '').split('T')[0],
+        'tags': [tag.get('name', '') for tag in post.get('tags', [])],
+        'excerpt': post.get('excerpt', ''),
+        'feature_image': post.get('feature_image', '')
+    }
+    return post_slug, {
+        f"{post_slug}.html": (post.get('html') or '').encode('utf-8'),
+        f"{post_slug}.json": json.dumps(meta, indent=2).encode('utf-8'),
+    }
+
+def _record_bundle(manifest, slug, files):
+    """Add file and per-article checksums for a bundle to the manifest"""
+    article_hash = hashlib.sha256()
+    for name, data in files.items():
+        digest = hashlib.sha256(data).hexdigest()
+        manifest['files'][name] = {'sha256': digest, 'size': len(data)}
+        article_hash.update(f"{name}:{digest}\n".encode('utf-8'))
+    manifest['checksums'][slug] = article_hash.hexdigest()
+
+def _manifest_bytes(manifest):
+    return json.dumps(manifest, indent=2).encode('utf-8')
+
+def _load_manifest(path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _write_file(path, data):
+    with open(path, 'wb') as f:
+        f.write(data)
+
+class _ArchiveWriter:
+    """Streams in-memory files straight into a zip or tar archive"""
+    
+    def __init__(self, path, archive_format):
+        self.path = path
+        self.tmp_path = f"{path}.tmp"
+        if archive_format == 'zip':
+            self.archive = zipfile.ZipFile(self.tmp_path, 'w', compression=zipfile.ZIP_DEFLATED)
+        else:
+            self.archive = tarfile.open(self.tmp_path, ARCHIVE_FORMATS[archive_format])
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.archive.close()
+        if exc_type is None:
+            os.replace(self.tmp_path, self.path)
+        else:
+            os.remove(self.tmp_path)
+    
+    def add(self, name, data):
+        if isinstance(self.archive, zipfile.ZipFile):
+            self.archive.writestr(name, data)
+        else:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = time.time()
+            self.archive.addfile(info, io.BytesIO(data))
+
 class PrintPublicationWorkflow:
-    def __init__(self, client, output_dir):
-        """Initialize the print publication workflow with a Ghost API client and output directory"""
+    def __init__(self, client, output_dir, cache=None, image_dpi=300):
+        """Initialize the print publication workflow with a Ghost API client and output directory
+        
+        Pass a GhostContentCache to serve issue posts and tags from the local
+        cache, syncing only posts that changed since the previous build.
+        Images are downsampled to image_dpi for the print page and cached
+        under output_dir/assets; pass image_dpi=None to embed them as-is.
+        """
         self.client = client
+        self.cache = cache
         self.output_dir = output_dir
         self.css_path = os.path.join(output_dir, 'print_styles.css')
+        self.fragment_dir = os.path.join(output_dir, 'fragments')
+        self.renderer = IssueHtmlRenderer()
+        self.assets = ImageAssetStage(
+            os.path.join(output_dir, 'assets'),
+            content_width_in=PRINT_PAGE_WIDTH_IN - 2 * PRINT_MARGIN_IN,
+            dpi=image_dpi,
+            column_count=PRINT_COLUMN_COUNT,
+            column_gap_in=PRINT_COLUMN_GAP_IN,
+        ) if image_dpi else None
         self.create_print_css()
         
         # Ensure output directories exist
@@ -157,72 +293,63 @@ class PrintPublicationWorkflow:
         with open(self.css_path, 'w') as f:
             f.write(css_content)
     
-    def generate_issue_pdf(self, issue_tag, title=None):
-        """Generate a PDF for a specific issue based on its tag"""
+    def get_issue_posts(self, issue_tag):
+        """Get every post tagged with issue_tag, from the cache when one is configured"""
+        if self.cache:
+            return self.cache.get_posts_by_tag(issue_tag)
+        return list(self.client.iter_posts(filter=f"tag:{issue_tag}"))
+    
+    def get_tag(self, slug):
+        """Look up a single tag by slug, from the cache when one is configured"""
+        if self.cache:
+            return self.cache.get_tag(slug)
+        return next(self.client.iter_tags(filter=f"slug:{slug}", fields='name,slug'), None)
+    
+    def generate_issue_pdf(self, issue_tag, title=None, incremental=True, max_workers=None):
+        """Generate a PDF for a specific issue based on its tag
+        
+        By default articles are rendered as cached per-article fragments in a
+        process pool (see build_issue_pdf_incremental); pass incremental=False
+        to lay the issue out in this process with build_issue_pdf_two_pass.
+        """
         # Get posts for this issue
-        posts = self.client.get_posts(limit=100, filter=f"tag:{issue_tag}")
+        posts = self.get_issue_posts(issue_tag)
         
-        if 'posts' not in posts or not posts['posts']:
+        if not posts:
             print(f"No posts found for issue tag: {issue_tag}")
             return None
         
         # Determine issue title if not provided
         if not title:
             # Try to find the issue tag object to get its name
-            tags = self.client.get_tags()
-            issue_tag_obj = next((tag for tag in tags.get('tags', []) if tag['slug'] == issue_tag), None)
+            issue_tag_obj = self.get_tag(issue_tag)
             title = issue_tag_obj['name'] if issue_tag_obj else f"Luxe Queer - {issue_tag}"
         
-        # Create HTML for the issue
-        html_content = self.create_issue_html(posts['posts'], title)
+        # Fetch and downsample images once, then render from the local copies
+        if self.assets:
+            posts = self.assets.localize_posts(posts)
         
         # Generate PDF filename
         current_date = datetime.now().strftime("%Y%m%d")
         pdf_filename = f"luxe_queer_{issue_tag}_{current_date}.pdf"
         pdf_path = os.path.join(self.output_dir, 'pdf', pdf_filename)
         
-        # Generate PDF
-        html = HTML(string=html_content)
-        css = CSS(filename=self.css_path)
-        html.write_pdf(pdf_path, stylesheets=[css])
+        if incremental:
+            self.build_issue_pdf_incremental(posts, title, pdf_path, max_workers)
+        else:
+            self.build_issue_pdf_two_pass(posts, title, pdf_path)
         
         print(f"PDF generated: {pdf_path}")
         return pdf_path
     
-    def create_issue_html(self, posts, title):
-        """Create HTML content for the issue"""
-        # Sort posts by section and importance
-        # For a real implementation, we would have a more sophisticated sorting mechanism
-        posts.sort(key=lambda x: x.get('featured', False), reverse=True)
-        
-        # Create cover page
-        html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <title>{title}</title>
-        </head>
-        <body>
-            <div class="cover-page">
-                <div class="cover-issue">Luxe Queer Magazine</div>
-                <h1 class="cover-title">{title}</h1>
-                <div class="cover-subtitle">Fashion, Art, Culture, Travel, Technology, and Luxury from a Queer Perspective</div>
-                <div class="cover-issue">{datetime.now().strftime("%B %Y")}</div>
-            </div>
-            
-            <div class="page-break"></div>
-            
-            <h1>Table of Contents</h1>
-        """
-        
-        # Add table of contents
+    def estimate_toc_entries(self, posts):
+        """Estimate TOC page numbers from article length, without laying anything out"""
         page_counter = 3  # Start after cover and TOC
         toc_entries = []
         
-        for i, post in enumerate(posts):
+        for post in posts:
             # Estimate page count (very rough approximation)
-            content_length = len(post.get('html', ''))
+            content_length = len(post.get('html') or '')
             estimated_pages = max(1, content_length // 3000)
             
             toc_entries.append({
@@ -232,92 +359,227 @@ class PrintPublicationWorkflow:
             
             page_counter += estimated_pages
         
-        # Add TOC entries to HTML
-        for entry in toc_entries:
-            html += f"""
-            <div class="toc-entry">
-                <span class="toc-title">{entry['title']}</span>
-                <span class="toc-page">{entry['page']}</span>
-            </div>
-            """
-        
-        # Add articles
-        for i, post in enumerate(posts):
-            html += f"""
-            <div class="page-break"></div>
+        return toc_entries
+    
+    def write_issue_html(self, posts, title, out):
+        """Stream the issue's HTML to a file-like object article by article"""
+        # Sort posts by section and importance
+        # For a real implementation, we would have a more sophisticated sorting mechanism
+        posts.sort(key=lambda x: x.get('featured', False), reverse=True)
+        
+        self.renderer.write_issue(out, posts, title, datetime.now().strftime("%B %Y"), self.estimate_toc_entries(posts))
+        return out
+    
+    def create_issue_html(self, posts, title):
+        """Create HTML content for the issue"""
+        return self.write_issue_html(posts, title, io.StringIO()).getvalue()
+    
+    def create_cover_html(self, title):
+        """Create the cover page markup"""
+        return COVER.render(title=title, issue_date=datetime.now().strftime("%B %Y"))
+    
+    def create_toc_html(self, toc_entries):
+        """Create the table of contents entries markup"""
+        out = io.StringIO()
+        self.renderer.write_toc(out.write, toc_entries)
+        return out.getvalue()
+    
+    def create_front_matter_html(self, title, toc_entries):
+        """Create the cover and table of contents markup"""
+        return self.create_cover_html(title) + TOC_HEADER.render() + self.create_toc_html(toc_entries)
+    
+    def create_article_html(self, post):
+        """Create the markup for a single article"""
+        return ARTICLE.render(**article_context(post))
+    
+    def build_issue_pdf_incremental(self, posts, title, pdf_path, max_workers=None):
+        """Render each article to a cached PDF fragment in parallel and merge them with the cover and TOC.
+        
+        Fragments are keyed on the post's id, updated_at, rendered markup and
+        the print CSS, so re-proofing an issue after one article edit only
+        re-renders that article. Fragments carry no page numbers; the merged
+        issue is stamped with them at the end so a fragment stays valid when
+        articles before it change length.
+        """
+        posts.sort(key=lambda x: x.get('featured', False), reverse=True)
+        css_hash = _file_hash(self.css_path)
+        os.makedirs(self.fragment_dir, exist_ok=True)
+        
+        # Work out which fragments are missing from the cache
+        fragments, jobs = [], {}
+        for post in posts:
+            article_html = _html_document(post.get('title', 'Untitled'), self.create_article_html(post))
+            key = hashlib.sha256(
+                "\0".join([post.get('id', ''), post.get('updated_at') or '', css_hash, article_html]).encode('utf-8')
+            ).hexdigest()[:16]
+            fragment_path = os.path.join(self.fragment_dir, f"{post.get('id') or post.get('slug', 'article')}-{key}.pdf")
+            fragments.append(fragment_path)
+            if not os.path.exists(fragment_path):
+                jobs[fragment_path] = article_html
+        
+        print(f"Rendering {len(jobs)} of {len(posts)} article fragments ({len(posts) - len(jobs)} cached)")
+        if jobs:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(_render_pdf, article_html, self.css_path, fragment_path, NO_FOLIO_CSS)
+                    for fragment_path, article_html in jobs.items()
+                ]
+                for future in futures:
+                    future.result()
+        self._prune_fragments(fragments)
+        
+        # Build the TOC from the real page counts of the fragments
+        page_counts = [len(PdfReader(path).pages) for path in fragments]
+        build_dir = tempfile.mkdtemp(dir=self.fragment_dir)
+        try:
+            front_path = os.path.join(build_dir, 'front_matter.pdf')
+            toc_pages = 1
+            for _ in range(TOC_LAYOUT_PASSES):
+                toc_entries, page = [], 2 + toc_pages  # cover, TOC pages, then articles
+                for post, count in zip(posts, page_counts):
+                    toc_entries.append({'title': post.get('title', 'Untitled'), 'page': page})
+                    page += count
+                front_html = _html_document(title, self.create_front_matter_html(title, toc_entries))
+                front_pages = _render_pdf(front_html, self.css_path, front_path, NO_FOLIO_CSS)
+                # Re-render if the TOC did not fit the number of pages assumed for it
+                if front_pages - 1 == toc_pages:
+                    break
+                toc_pages = front_pages - 1
+            else:
+                raise RuntimeError(f"Table of contents did not settle on a page count after {TOC_LAYOUT_PASSES} layouts")
             
-            <article>
-                <div class="article-tag">{post.get('primary_tag', {}).get('name', '')}</div>
-                <h1>{post.get('title', 'Untitled')}</h1>
-                
-                <div class="article-meta">
-                    By {post.get('primary_author', {}).get('name', 'Anonymous')} | 
-                    {post.get('published_at', '').split('T')[0]}
-                </div>
-                
-                <div class="two-column">
-                    {post.get('html', '')}
-                </div>
-            </article>
-            """
-        
-        html += """
-        </body>
-        </html>
+            # Merge front matter and fragments, then stamp page numbers over the result
+            writer = PdfWriter()
+            for path in [front_path] + fragments:
+                writer.append(path)
+            total_pages = len(writer.pages)
+            folio_path = os.path.join(build_dir, 'folios.pdf')
+            _render_pdf(_html_document(title, '<div class="folio"></div>' * total_pages), self.css_path, folio_path, FOLIO_ONLY_CSS)
+            for page, folio in zip(writer.pages, PdfReader(folio_path).pages):
+                page.merge_page(folio)
+            with open(pdf_path, 'wb') as f:
+                writer.write(f)
+        finally:
+            shutil.rmtree(build_dir, ignore_errors=True)
+        return pdf_path
+    
+    def build_issue_pdf_two_pass(self, posts, title, pdf_path):
+        """Lay the issue out in two passes so the TOC carries real page numbers.
+        
+        The front matter is laid out first with placeholder numbers to learn
+        how many pages the TOC takes. Each article is then laid out once,
+        starting its page counter where the previous one ended, and the TOC
+        is rebuilt from the actual page counts. The final PDF is assembled
+        from the already laid-out pages instead of rendering the issue again.
         """
-        
-        return html
+        posts.sort(key=lambda x: x.get('featured', False), reverse=True)
+        font_config = FontConfiguration()
+        stylesheets = [CSS(filename=self.css_path, font_config=font_config)]
+        
+        def render(html_content, first_page=None):
+            extra = [CSS(string=f"@page :first {{ counter-reset: page {first_page}; }}", font_config=font_config)] if first_page else []
+            return HTML(string=html_content).render(stylesheets=stylesheets + extra, font_config=font_config)
+        
+        def render_front(page_numbers):
+            toc_entries = [{'title': post.get('title', 'Untitled'), 'page': page} for post, page in zip(posts, page_numbers)]
+            return render(_html_document(title, self.create_front_matter_html(title, toc_entries)))
+        
+        # Pass 1: how many pages does the front matter need?
+        front_pages = len(render_front(['000'] * len(posts)).pages)
+        while True:
+            # Pass 2: lay out each article once, numbering its pages from where the previous one ended
+            articles, page_numbers = [], []
+            next_page = front_pages + 1
+            for post in posts:
+                document = render(_html_document(post.get('title', 'Untitled'), self.create_article_html(post)), next_page)
+                articles.append(document)
+                page_numbers.append(next_page)
+                next_page += len(document.pages)
+            
+            front = render_front(page_numbers)
+            # Real numbers can only change the TOC length in pathological cases; lay out again if so
+            if len(front.pages) == front_pages:
+                break
+            front_pages = len(front.pages)
+        
+        all_pages = [page for document in [front] + articles for page in document.pages]
+        front.copy(all_pages).write_pdf(pdf_path)
+        return pdf_path
+    
+    def _prune_fragments(self, keep):
+        """Delete cached fragments of these posts that are superseded by the current ones"""
+        keep = {os.path.basename(path) for path in keep}
+        post_ids = {name.rsplit('-', 1)[0] for name in keep}
+        for name in os.listdir(self.fragment_dir):
+            if name.endswith('.pdf') and name not in keep and name.rsplit('-', 1)[0] in post_ids:
+                os.remove(os.path.join(self.fragment_dir, name))
     
-    def export_for_indesign(self, issue_tag):
-        """Export content in a format suitable for InDesign import"""
+    def export_for_indesign(self, issue_tag, archive=None, max_workers=8):
+        """Export content in a format suitable for InDesign import
+        
+        Article bundles are encoded and written concurrently. manifest.json
+        records a sha256 for every file and article so downstream sync can
+        skip unchanged articles; files whose checksum matches the previous
+        manifest in the same export directory are not rewritten. With
+        archive='zip', 'tar' or 'tar.gz' the export is streamed into a single
+        archive instead of a directory.
+        """
+        if archive not in (None,) + tuple(ARCHIVE_FORMATS):
+            raise ValueError(f"archive must be one of {', '.join(ARCHIVE_FORMATS)}")
+        
         # Get posts for this issue
-        posts = self.client.get_posts(limit=100, filter=f"tag:{issue_tag}")
+        posts = self.get_issue_posts(issue_tag)
         
-        if 'posts' not in posts or not posts['posts']:
+        if not posts:
             print(f"No posts found for issue tag: {issue_tag}")
             return None
         
-        # Create a directory for this issue
         current_date = datetime.now().strftime("%Y%m%d")
-        issue_dir = os.path.join(self.output_dir, 'indesign', f"{issue_tag}_{current_date}")
-        os.makedirs(issue_dir, exist_ok=True)
+        export_name = f"{issue_tag}_{current_date}"
+        indesign_dir = os.path.join(self.output_dir, 'indesign')
         
-        # Export each article as individual HTML and JSON
-        for post in posts['posts']:
-            post_slug = post.get('slug', 'article')
-            
-            # Export HTML
-            html_path = os.path.join(issue_dir, f"{post_slug}.html")
-            with open(html_path, 'w') as f:
-                f.write(post.get('html', ''))
-            
-            # Export metadata as JSON
-            meta = {
-                'title': post.get('title', 'Untitled'),
-                'author': post.get('primary_author', {}).get('name', 'Anonymous'),
-                'date': post.get('published_at', '').split('T')[0],
-                'tags': [tag.get('name', '') for tag in post.get('tags', [])],
-                'excerpt': post.get('excerpt', ''),
-                'feature_image': post.get('feature_image', '')
-            }
-            
-            json_path = os.path.join(issue_dir, f"{post_slug}.json")
-            with open(json_path, 'w') as f:
-                json.dump(meta, f, indent=2)
-        
-        # Create a manifest file
         manifest = {
             'issue': issue_tag,
             'date': current_date,
-            'articles': [post.get('slug', 'article') for post in posts['posts']]
+            'articles': [post.get('slug', 'article') for post in posts],
+            'checksums': {},
+            'files': {},
         }
         
-        manifest_path = os.path.join(issue_dir, 'manifest.json')
-        with open(manifest_path, 'w') as f:
-            json.dump(manifest, f, indent=2)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Bundles are encoded in parallel but yielded in article order
+            bundles = executor.map(_indesign_bundle, posts)
+            
+            if archive:
+                export_path = os.path.join(indesign_dir, f"{export_name}.{archive}")
+                with _ArchiveWriter(export_path, archive) as writer:
+                    for slug, files in bundles:
+                        _record_bundle(manifest, slug, files)
+                        for name, data in files.items():
+                            writer.add(name, data)
+                    writer.add('manifest.json', _manifest_bytes(manifest))
+            else:
+                # Create a directory for this issue
+                export_path = os.path.join(indesign_dir, export_name)
+                os.makedirs(export_path, exist_ok=True)
+                previous_files = _load_manifest(os.path.join(export_path, 'manifest.json')).get('files', {})
+                writes = []
+                for slug, files in bundles:
+                    _record_bundle(manifest, slug, files)
+                    for name, data in files.items():
+                        file_path = os.path.join(export_path, name)
+                        unchanged = previous_files.get(name, {}).get('sha256') == manifest['files'][name]['sha256']
+                        if not unchanged or not os.path.exists(file_path):
+                            writes.append(executor.submit(_write_file, file_path, data))
+                for future in writes:
+                    future.result()
+                print(f"Wrote {len(writes)} of {len(manifest['files'])} files ({len(manifest['files']) - len(writes)} unchanged)")
+                
+                # Create a manifest file
+                _write_file(os.path.join(export_path, 'manifest.json'), _manifest_bytes(manifest))
         
-        print(f"InDesign export completed: {issue_dir}")
-        return issue_dir
+        print(f"InDesign export completed: {export_path}")
+        return export_path
 
 # Example usage
 if __name__ == "__main__":
@@ -331,9 +593,11 @@ if __name__ == "__main__":
     # Initialize the client
     client = GhostApiClient(ghost_url, admin_key, content_key)
     
-    # Initialize the print workflow
+    # Initialize the print workflow, caching Ghost content between builds
     output_dir = "/home/ubuntu/luxe_queer/print"
-    workflow = PrintPublicationWorkflow(client, output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    cache = GhostContentCache(client, os.path.join(output_dir, 'ghost_content_cache.sqlite3'))
+    workflow = PrintPublicationWorkflow(client, output_dir, cache=cache)
     
     # Generate PDF for the first issue (using the tag slug)
     pdf_path = workflow.generate_issue_pdf("jan-feb-2025", "January/February 2025: Future Issue")
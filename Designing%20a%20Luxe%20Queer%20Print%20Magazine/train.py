@@ -2,6 +2,7 @@
 # coding=utf-8
 
 import os
+import sys
 import json
 import argparse
 import logging
@@ -20,6 +21,10 @@ from transformers import (
 from peft import LoraConfig, get_peft_model, prepare_model_for_kbit_training
 from datasets import load_dataset
 
+# The prompt template shared with inference and evaluation lives at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from prompt_template import prompt_template
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -89,25 +94,18 @@ def load_training_config(config_path: str) -> TrainingConfig:
     
     return TrainingConfig(**config_dict)
 
-def format_instruction(example):
-    """Format the instruction, input, and output into a prompt."""
-    if example.get("input"):
-        return f"### Instruction:\n{example['instruction']}\n\n### Input:\n{example['input']}\n\n### Response:\n{example['output']}"
-    else:
-        return f"### Instruction:\n{example['instruction']}\n\n### Response:\n{example['output']}"
-
 def preprocess_function(examples, tokenizer):
     """Preprocess the examples for training."""
-    # Format the examples
-    prompts = [format_instruction({"instruction": instruction, "input": inp, "output": out}) 
-               for instruction, inp, out in zip(examples["instruction"], examples["input"], examples["output"])]
-    
-    # Tokenize the examples
-    tokenized_examples = tokenizer(
-        prompts,
-        truncation=True,
+    # Tokenize the examples from the pre-tokenized template segments,
+    # exactly as inference.py and evaluate.py assemble prompts
+    input_ids, _ = prompt_template(tokenizer).encode_examples(
+        examples["instruction"], examples["input"], examples["output"]
+    )
+    max_length = tokenizer.model_max_length
+    tokenized_examples = tokenizer.pad(
+        {"input_ids": [ids[:max_length] for ids in input_ids]},
         padding="max_length",
-        max_length=tokenizer.model_max_length,
+        max_length=max_length,
         return_tensors="pt",
     )
     
@@ -0,0 +1,7 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+# Adapter names shared by adapter_pool and callers that must run without torch or peft
+
+# Name used to request the plain base model with every adapter disabled
+BASE_ADAPTER = "base"
@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+import os
+import json
+from collections import OrderedDict
+
+import torch
+from peft import PeftModel
+from speculative import speculative_generate
+from adapter_names import BASE_ADAPTER
+
+# Name PEFT uses for base-model rows in a mixed-adapter batch
+PEFT_BASE_ADAPTER = "__base__"
+
+def parse_adapter_specs(specs):
+    """Parse adapter specs into an ordered {name: path} mapping.
+
+    Each spec is either NAME=PATH, a JSON file mapping names to paths, or a
+    directory whose subdirectories are adapters (one per magazine section).
+    """
+    adapters = OrderedDict()
+    for spec in specs or []:
+        if "=" in spec:
+            name, path = spec.split("=", 1)
+            adapters[name.strip()] = path.strip()
+        elif spec.endswith(".json"):
+            with open(spec, 'r') as f:
+                adapters.update(json.load(f))
+        elif os.path.isdir(spec):
+            adapters.update(discover_adapters(spec))
+        else:
+            raise ValueError(f"Invalid adapter spec '{spec}', expected NAME=PATH, a JSON file or a directory")
+    return adapters
+
+def discover_adapters(adapters_dir):
+    """Find LoRA adapters stored as subdirectories of adapters_dir."""
+    adapters = OrderedDict()
+    for name in sorted(os.listdir(adapters_dir)):
+        path = os.path.join(adapters_dir, name)
+        if os.path.isfile(os.path.join(path, "adapter_config.json")):
+            adapters[name] = path
+    return adapters
+
+class AdapterPool:
+    """Serve many LoRA adapters from a single loaded base model.
+
+    Adapters are registered by name and only loaded the first time a request
+    names them. At most `max_resident` adapters stay loaded; the least
+    recently used one is unloaded when another has to come in.
+    """
+
+    def __init__(self, model, tokenizer, adapters=None, max_resident=4):
+        if max_resident < 1:
+            raise ValueError("max_resident must be at least 1")
+        self.base_model = model
+        self.model = model
+        self.tokenizer = tokenizer
+        self.max_resident = max_resident
+        self.adapter_paths = OrderedDict()
+        self.resident = OrderedDict()
+        self.stats = {"hits": 0, "loads": 0, "evictions": 0}
+
+        for name, path in (adapters or {}).items():
+            self.register(name, path)
+
+    @property
+    def device(self):
+        return self.model.device
+
+    def register(self, name, path):
+        """Make an adapter available under `name` without loading it."""
+        if name == BASE_ADAPTER:
+            raise ValueError(f"'{BASE_ADAPTER}' is reserved for the base model")
+        self.adapter_paths[name] = path
+
+    def names(self):
+        """Return the names of all registered adapters."""
+        return list(self.adapter_paths)
+
+    def activate(self, name):
+        """Make `name` the active adapter, loading it on demand, and return the model."""
+        if name == BASE_ADAPTER:
+            return self.model
+        if name not in self.adapter_paths:
+            raise KeyError(f"Unknown adapter '{name}'. Registered adapters: {', '.join(self.names()) or 'none'}")
+
+        if name in self.resident:
+            self.stats["hits"] += 1
+            self.resident.move_to_end(name)
+        else:
+            self._load(name)
+
+        self.model.set_adapter(name)
+        return self.model
+
+    def _load(self, name):
+        """Load an adapter onto the shared base model, evicting the LRU one if needed."""
+        while len(self.resident) >= self.max_resident:
+            self._evict(next(iter(self.resident)))
+
+        path = self.adapter_paths[name]
+        print(f"Loading adapter '{name}' from {path}")
+        if isinstance(self.model, PeftModel):
+            self.model.load_adapter(path, adapter_name=name)
+        else:
+            self.model = PeftModel.from_pretrained(self.base_model, path, adapter_name=name)
+        self.model.eval()
+
+        self.resident[name] = path
+        self.stats["loads"] += 1
+
+    def _evict(self, name):
+        """Unload an adapter and free its weights."""
+        print(f"Evicting adapter '{name}'")
+        self.model.delete_adapter(name)
+        del self.resident[name]
+        self.stats["evictions"] += 1
+
+    def plan_batches(self, adapter_names, batch_size):
+        """Split request indices into batches that fit in the adapter residency limit.
+
+        Requests keep their order; a batch is closed when it is full or when
+        adding another row would need more distinct adapters than can be
+        loaded at once.
+        """
+        batches = []
+        current, current_adapters = [], set()
+        for i, name in enumerate(adapter_names):
+            needed = current_adapters | ({name} - {BASE_ADAPTER})
+            if current and (len(current) >= batch_size or len(needed) > self.max_resident):
+                batches.append(current)
+                current, current_adapters = [], set()
+                needed = {name} - {BASE_ADAPTER}
+            current.append(i)
+            current_adapters = needed
+        if current:
+            batches.append(current)
+        return batches
+
+    def generate_batch(self, inputs, adapter_names, **generate_kwargs):
+        """Run one batched generation where each row uses its own adapter.
+
+        `inputs` is a left-padded tokenizer batch and `adapter_names` names
+        the adapter for each row. All adapters in the batch must fit in the
+        residency limit; use plan_batches to split larger request sets.
+        """
+        distinct = set(adapter_names) - {BASE_ADAPTER}
+        if len(distinct) > self.max_resident:
+            raise ValueError(
+                f"Batch needs {len(distinct)} adapters but only {self.max_resident} can be resident"
+            )
+        for name in distinct:
+            self.activate(name)
+
+        with torch.no_grad():
+            if not distinct and not isinstance(self.model, PeftModel):
+                return self.model.generate(**inputs, **generate_kwargs)
+            if len(set(adapter_names)) == 1:
+                # Single adapter: skip PEFT's per-row routing
+                return self.generate(inputs, adapter_names[0], **generate_kwargs)
+            peft_names = [PEFT_BASE_ADAPTER if name == BASE_ADAPTER else name for name in adapter_names]
+            return self.model.generate(**inputs, adapter_names=peft_names, **generate_kwargs)
+
+    def generate(self, inputs, adapter=BASE_ADAPTER, **generate_kwargs):
+        """Run generation for tokenized `inputs` with the named adapter."""
+        model = self.activate(adapter)
+        with torch.no_grad():
+            if adapter == BASE_ADAPTER and isinstance(model, PeftModel):
+                with model.disable_adapter():
+                    return model.generate(**inputs, **generate_kwargs)
+            return model.generate(**inputs, **generate_kwargs)
+
+    def generate_speculative(self, inputs, adapter, draft_model, **speculative_kwargs):
+        """Speculative generation where the named adapter verifies a draft model's tokens."""
+        model = self.activate(adapter)
+        if adapter == BASE_ADAPTER and isinstance(model, PeftModel):
+            with model.disable_adapter():
+                return speculative_generate(model, draft_model, inputs["input_ids"], **speculative_kwargs)
+        return speculative_generate(model, draft_model, inputs["input_ids"], **speculative_kwargs)
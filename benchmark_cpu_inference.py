@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+import gc
+import os
+import json
+import time
+import argparse
+import resource
+import torch
+import numpy as np
+from tqdm import tqdm
+from transformers import AutoTokenizer
+from bert_score import score as bert_score
+from rouge_score import rouge_scorer
+from inference import format_prompt, load_model
+from quantize_cpu import set_cpu_threads
+
+def load_examples(path, limit=None):
+    """Load instruction/input/output examples from a JSON array or JSONL file."""
+    with open(path, 'r') as f:
+        content = f.read().strip()
+    if content.startswith("["):
+        examples = json.loads(content)
+    else:
+        examples = [json.loads(line) for line in content.splitlines() if line.strip()]
+    return examples[:limit] if limit else examples
+
+def current_rss_mb():
+    """Resident set size of this process in MB."""
+    try:
+        with open("/proc/self/status", 'r') as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # Fall back to peak RSS (reported in kilobytes on Linux) where /proc is unavailable
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def benchmark_model(name, model_path, tokenizer, examples, max_new_tokens):
+    """Generate greedily for every example and record latency, throughput and memory."""
+    rss_before = current_rss_mb()
+    load_start = time.perf_counter()
+    model = load_model(model_path, device="cpu")
+    model.eval()
+    load_time = time.perf_counter() - load_start
+    rss_loaded = current_rss_mb()
+
+    outputs, latencies, new_token_counts = [], [], []
+    for example in tqdm(examples, desc=name):
+        prompt = format_prompt(example["instruction"], example.get("input"))
+        inputs = tokenizer(prompt, return_tensors="pt")
+
+        start = time.perf_counter()
+        with torch.no_grad():
+            generated = model.generate(
+                **inputs,
+                max_new_tokens=max_new_tokens,
+                do_sample=False,
+                pad_token_id=tokenizer.pad_token_id if tokenizer.pad_token_id else tokenizer.eos_token_id,
+            )
+        latencies.append(time.perf_counter() - start)
+
+        new_tokens = generated[0, inputs["input_ids"].shape[1]:]
+        new_token_counts.append(int(new_tokens.shape[0]))
+        outputs.append(tokenizer.decode(new_tokens, skip_special_tokens=True))
+
+    stats = {
+        "model": model_path,
+        "load_time_s": load_time,
+        "rss_after_load_mb": rss_loaded,
+        "rss_model_mb": rss_loaded - rss_before,
+        "rss_after_generation_mb": current_rss_mb(),
+        "avg_latency_s": float(np.mean(latencies)),
+        "p50_latency_s": float(np.percentile(latencies, 50)),
+        "p95_latency_s": float(np.percentile(latencies, 95)),
+        "tokens_per_second": float(sum(new_token_counts) / sum(latencies)),
+    }
+
+    del model
+    gc.collect()
+    return outputs, stats
+
+def score_outputs(predictions, references, rouge_scorer_instance):
+    """Average ROUGE-L and BERTScore F1 of predictions against references."""
+    rouge_l = [rouge_scorer_instance.score(ref, pred)["rougeL"].fmeasure for pred, ref in zip(predictions, references)]
+    # bert_score is used directly because this directory's evaluate.py shadows the evaluate package
+    _, _, bert_f1 = bert_score(predictions, references, lang="en", verbose=False)
+    return {"rougeL_f1": float(np.mean(rouge_l)), "bertscore_f1": float(bert_f1.mean())}
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fp32_model", type=str, required=True, help="Merged fp32 model directory")
+    parser.add_argument("--quantized_model", type=str, required=True, help="Quantized model directory from quantize_cpu.py or merge_lora.py --quantize")
+    parser.add_argument("--eval_data", type=str, default="octavia_voice_validation.jsonl", help="Evaluation examples")
+    parser.add_argument("--output_dir", type=str, required=True, help="Output directory for the benchmark report")
+    parser.add_argument("--max_new_tokens", type=int, default=128, help="Maximum number of new tokens per example")
+    parser.add_argument("--limit", type=int, default=None, help="Only benchmark the first N examples")
+    parser.add_argument("--num_threads", type=int, default=None, help="Number of CPU threads")
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    set_cpu_threads(args.num_threads)
+
+    examples = load_examples(args.eval_data, args.limit)
+    references = [example["output"] for example in examples]
+    tokenizer = AutoTokenizer.from_pretrained(args.fp32_model, trust_remote_code=True)
+
+    print(f"Benchmarking {len(examples)} examples from {args.eval_data}")
+    fp32_outputs, fp32_stats = benchmark_model("fp32", args.fp32_model, tokenizer, examples, args.max_new_tokens)
+    quant_outputs, quant_stats = benchmark_model("quantized", args.quantized_model, tokenizer, examples, args.max_new_tokens)
+
+    rouge_scorer_instance = rouge_scorer.RougeScorer(['rougeL'], use_stemmer=True)
+
+    report = {
+        "num_examples": len(examples),
+        "max_new_tokens": args.max_new_tokens,
+        "num_threads": torch.get_num_threads(),
+        "fp32": fp32_stats,
+        "quantized": quant_stats,
+        "quality": {
+            "fp32_vs_reference": score_outputs(fp32_outputs, references, rouge_scorer_instance),
+            "quantized_vs_reference": score_outputs(quant_outputs, references, rouge_scorer_instance),
+            # Drift: how far quantized greedy outputs move away from fp32 greedy outputs
+            "quantized_vs_fp32": score_outputs(quant_outputs, fp32_outputs, rouge_scorer_instance),
+        },
+        "speedup": fp32_stats["avg_latency_s"] / quant_stats["avg_latency_s"],
+        "samples": [
+            {"instruction": e["instruction"], "fp32": f, "quantized": q}
+            for e, f, q in zip(examples, fp32_outputs, quant_outputs)
+        ],
+    }
+
+    report_path = os.path.join(args.output_dir, "cpu_benchmark.json")
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print("\n===== CPU BENCHMARK SUMMARY =====")
+    for name in ("fp32", "quantized"):
+        stats = report[name]
+        print(f"{name}: {stats['avg_latency_s']:.2f}s/example, {stats['tokens_per_second']:.1f} tokens/s, "
+              f"{stats['rss_model_mb']:.0f} MB model RSS")
+    print(f"Speedup: {report['speedup']:.2f}x")
+    drift = report["quality"]["quantized_vs_fp32"]
+    print(f"Drift vs fp32: ROUGE-L F1 {drift['rougeL_f1']:.4f}, BERTScore F1 {drift['bertscore_f1']:.4f}")
+    print(f"\nDetailed results saved to {report_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+import json
+import time
+import argparse
+import torch
+import numpy as np
+from transformers import AutoTokenizer
+from near_duplicates import load_examples
+from prompt_template import format_prompt, prompt_template, decode_new_tokens
+
+def synthetic_outputs(tokenizer, examples, context_ids, prompt_tokens, max_new_tokens):
+    """Left-padded prompts with prompt_tokens of context as input, followed by each example's response as the "generated" ids.
+
+    Returns (outputs, input_length, prompts), shaped like generate() output
+    for a batch, without running a model.
+    """
+    template = prompt_template(tokenizer)
+    context = tokenizer.decode(context_ids[:prompt_tokens], skip_special_tokens=True)
+    instructions = [example["instruction"] for example in examples]
+    inputs = template.prompt_inputs(instructions, [context] * len(examples))
+    pad_token_id = tokenizer.pad_token_id
+    responses = tokenizer([example["output"] for example in examples], add_special_tokens=False)["input_ids"]
+    new_tokens = torch.tensor([
+        ids[:max_new_tokens] + [pad_token_id] * (max_new_tokens - len(ids[:max_new_tokens])) for ids in responses
+    ])
+    prompts = [format_prompt(instruction, context) for instruction in instructions]
+    return torch.cat([inputs["input_ids"], new_tokens], dim=1), inputs["input_ids"].shape[1], prompts
+
+def decode_full_and_slice(tokenizer, outputs, prompts):
+    """The old extraction: decode every whole sequence, then cut the prompt off by character length."""
+    return [tokenizer.decode(row, skip_special_tokens=True)[len(prompt):] for row, prompt in zip(outputs, prompts)]
+
+def time_call(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return result, float(np.median(timings))
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare decoding whole sequences with decoding only the generated tokens")
+    parser.add_argument("--tokenizer", type=str, required=True, help="Tokenizer name or path")
+    parser.add_argument("--eval_data", type=str, default="octavia_voice_validation.jsonl", help="Examples whose responses stand in for generated tokens")
+    parser.add_argument("--prompt_tokens", type=int, nargs="+", default=[256, 1024, 4096, 16384], help="Prompt context lengths to test")
+    parser.add_argument("--max_new_tokens", type=int, default=128, help="Generated tokens per row")
+    parser.add_argument("--batch_size", type=int, default=8, help="Rows per batch")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per setting; the median is reported")
+    parser.add_argument("--report", type=str, default="decode_benchmark.json", help="Where to write the JSON report")
+    args = parser.parse_args()
+
+    tokenizer = AutoTokenizer.from_pretrained(args.tokenizer, trust_remote_code=True)
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
+    tokenizer.padding_side = "left"
+
+    examples = load_examples([args.eval_data])
+    # Long prompt context: the example responses, repeated until long enough
+    corpus = "\n\n".join(example["output"] for example in examples)
+    context_ids = tokenizer(corpus, add_special_tokens=False)["input_ids"]
+    context_ids = context_ids * (max(args.prompt_tokens) // max(1, len(context_ids)) + 1)
+    batch = (examples * (args.batch_size // len(examples) + 1))[:args.batch_size]
+
+    results = []
+    for prompt_tokens in args.prompt_tokens:
+        outputs, input_length, prompts = synthetic_outputs(tokenizer, batch, context_ids, prompt_tokens, args.max_new_tokens)
+        old, old_s = time_call(lambda: decode_full_and_slice(tokenizer, outputs, prompts), args.repeats)
+        new, new_s = time_call(lambda: decode_new_tokens(tokenizer, outputs, input_length), args.repeats)
+        results.append({
+            "prompt_tokens": int(input_length),
+            "full_decode_ms": old_s * 1000,
+            "new_token_decode_ms": new_s * 1000,
+            "speedup": old_s / new_s,
+            # Rows where cutting the decoded text by len(prompt) gives a different response
+            "mismatched_rows": sum(a != b for a, b in zip(old, new)),
+        })
+        print(f"{input_length:>6} prompt tokens: full decode {old_s * 1000:.2f} ms, new tokens only "
+              f"{new_s * 1000:.2f} ms ({old_s / new_s:.1f}x), {results[-1]['mismatched_rows']} mismatched rows")
+
+    report = {
+        "tokenizer": args.tokenizer,
+        "batch_size": args.batch_size,
+        "max_new_tokens": args.max_new_tokens,
+        "results": results,
+    }
+    with open(args.report, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Report saved to {args.report}")
+
+if __name__ == "__main__":
+    main()
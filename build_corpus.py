@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+import os
+import re
+import ast
+import csv
+import json
+import hashlib
+import argparse
+import unicodedata
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Sources ingested when none are given, in priority order: the first copy of a duplicate is kept
+DEFAULT_SOURCES = [
+    "octavia_voice_examples.jsonl",
+    "octavia_statements.jsonl",
+    "Octavia_voice.json",
+    "octavia_voice_training.csv",
+]
+
+CORPUS_SCHEMA = pa.schema([
+    ("id", pa.string()),
+    ("instruction", pa.string()),
+    ("input", pa.string()),
+    ("output", pa.string()),
+    ("source", pa.string()),
+    ("source_index", pa.int64()),
+])
+
+# Alternative column names for instruction, input and output
+FIELD_ALIASES = {
+    "instruction": ("instruction", "prompt", "question"),
+    "input": ("input", "context_input"),
+    "output": ("output", "response", "answer", "completion"),
+}
+
+# Single "text" records as written by octavia_voice_dataset.py and Octavia_voice.json.
+# Each pattern captures the output; the instruction is either captured or fixed.
+TEXT_PATTERNS = [
+    (re.compile(r"(?P<instruction>Scenario: .+?)\nOctavia Opulence says: (?P<output>.+)", re.S), None),
+    (re.compile(r"(?P<instruction>Describe Octavia Opulence in the scenario: .+?)\nDescription: (?P<output>.+)", re.S), None),
+    (re.compile(r"(?P<instruction>What aspect of Octavia Opulence's character .+?)\nAspect: (?P<output>.+)", re.S), None),
+    (re.compile(r"Question: (?P<instruction>.+?)\nOctavia Opulence: (?P<output>.+)", re.S), None),
+    (re.compile(r"Octavia Opulence's perspective on authenticity and luxury: (?P<output>.+)", re.S),
+     "Share Octavia Opulence's perspective on authenticity and luxury."),
+    (re.compile(r"Octavia Opulence reading someone for filth: (?P<output>.+)", re.S),
+     "Read someone for filth in Octavia Opulence's style."),
+]
+
+# Layout of JSON records in a file: an optional enclosing array, separators, and record starts
+ARRAY_START = re.compile(r"\s*\[?")
+RECORD_SEPARATOR = re.compile(r"[\s,]*")
+RECORD_START = re.compile(r"^\s*\{", re.M)
+
+def read_records(path):
+    """Yield raw records from a CSV, JSON or JSONL file.
+
+    Files named .jsonl that actually hold a JSON array, and .json files that
+    are Python scripts assigning a `data` list (like Octavia_voice.json), are
+    read as well; the script is parsed, never executed.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            yield from csv.DictReader(f)
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    if ext == ".jsonl" or text.lstrip().startswith("["):
+        yield from _iter_json_values(text, path)
+        return
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        data = _literal_data_assignment(text, path)
+    yield from (data if isinstance(data, list) else [data])
+
+def _iter_json_values(text, path):
+    """Decode consecutive JSON values (JSONL, a JSON array, or pretty-printed objects) one at a time.
+
+    A malformed record is skipped by resuming at the next line that opens an
+    object, so one bad record or a truncated tail doesn't lose the rest.
+    """
+    decoder = json.JSONDecoder(strict=False)
+    index = ARRAY_START.match(text).end()
+    skipped = 0
+    while True:
+        index = RECORD_SEPARATOR.match(text, index).end()
+        if index >= len(text) or text[index] == "]":
+            break
+        try:
+            record, index = decoder.raw_decode(text, index)
+        except json.JSONDecodeError as e:
+            skipped += 1
+            resume = RECORD_START.search(text, max(e.pos, index + 1))
+            if resume is None:
+                break
+            index = resume.start()
+            continue
+        yield record
+    if skipped:
+        print(f"Warning: skipped {skipped} malformed or truncated records in {path}")
+
+def _literal_data_assignment(source, path):
+    for node in ast.parse(source, filename=path).body:
+        if isinstance(node, ast.Assign) and any(isinstance(t, ast.Name) and t.id == "data" for t in node.targets):
+            return ast.literal_eval(node.value)
+    raise ValueError(f"{path} is neither JSON nor a script with a literal `data` list")
+
+def clean_text(value):
+    """NFC-normalize, unify newlines and strip; missing values (None, NaN) become empty strings"""
+    if value is None or (isinstance(value, float) and value != value):
+        return ""
+    text = unicodedata.normalize("NFC", str(value)).replace("\r\n", "\n").replace("\r", "\n")
+    return "\n".join(line.rstrip() for line in text.strip().split("\n"))
+
+def normalize_record(record):
+    """Map a raw record to {instruction, input, output}, or None if its shape is unknown"""
+    fields = {
+        name: next((record[alias] for alias in aliases if record.get(alias) not in (None, "")), None)
+        for name, aliases in FIELD_ALIASES.items()
+    }
+    if fields["instruction"] is not None and fields["output"] is not None:
+        return {name: clean_text(value) for name, value in fields.items()}
+
+    if record.get("quote") and record.get("context"):
+        return {
+            "instruction": f"Provide a quote from Octavia Opulence about: {clean_text(record['context'])}",
+            "input": "",
+            "output": clean_text(record["quote"]),
+        }
+
+    text = clean_text(record.get("text"))
+    for pattern, instruction in TEXT_PATTERNS:
+        match = pattern.fullmatch(text)
+        if match:
+            return {
+                "instruction": clean_text(instruction or match.group("instruction")),
+                "input": "",
+                "output": clean_text(match.group("output")),
+            }
+    return None
+
+def example_id(example):
+    """Stable id of an example's content, independent of where it came from"""
+    key = "\x1f".join(example[name] for name in ("instruction", "input", "output"))
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+def near_duplicate_key(example):
+    """Content with case, punctuation and spacing differences folded away"""
+    text = " \x1f ".join(example[name] for name in ("instruction", "input", "output"))
+    return " ".join(re.sub(r"[\W_]+", " ", text.casefold()).split())
+
+def build_corpus(sources):
+    """Normalize and deduplicate every source; returns (rows, per-source stats).
+
+    Exact duplicates share an id; near duplicates differ only in case,
+    punctuation or whitespace. The first occurrence, in source order, wins.
+    """
+    rows, seen_ids, seen_keys, stats = [], set(), set(), {}
+    for path in sources:
+        source = os.path.basename(path)
+        counts = stats.setdefault(source, {"read": 0, "kept": 0, "unparsed": 0, "exact_duplicates": 0, "near_duplicates": 0})
+        for index, record in enumerate(read_records(path)):
+            counts["read"] += 1
+            example = normalize_record(record)
+            if example is None or not example["instruction"] or not example["output"]:
+                counts["unparsed"] += 1
+                continue
+            example["id"] = example_id(example)
+            if example["id"] in seen_ids:
+                counts["exact_duplicates"] += 1
+                continue
+            key = near_duplicate_key(example)
+            if key in seen_keys:
+                counts["near_duplicates"] += 1
+                continue
+            seen_ids.add(example["id"])
+            seen_keys.add(key)
+            rows.append(dict(example, source=source, source_index=index))
+            counts["kept"] += 1
+    return rows, stats
+
+def write_corpus(rows, output_path):
+    """Write rows as Parquet (.parquet) or an uncompressed Arrow IPC stream (.arrow) for memory mapping.
+
+    The Arrow stream layout is the one datasets uses for its own cache files,
+    so load_dataset("arrow", ...) maps it without copying.
+    """
+    table = pa.Table.from_pylist(rows, schema=CORPUS_SCHEMA)
+    ext = os.path.splitext(output_path)[1].lower()
+    tmp_path = f"{output_path}.tmp"
+    if ext == ".parquet":
+        pq.write_table(table, tmp_path, compression="zstd")
+    elif ext == ".arrow":
+        with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_stream(sink, CORPUS_SCHEMA) as writer:
+            writer.write_table(table)
+    else:
+        raise ValueError(f"Unsupported corpus format: {ext}")
+    os.replace(tmp_path, output_path)
+    return table
+
+def load_corpus(path):
+    """Load a corpus written by write_corpus, memory-mapping the file"""
+    if path.endswith(".parquet"):
+        return pq.read_table(path, memory_map=True)
+    return pa.ipc.open_stream(pa.memory_map(path, "r")).read_all()
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a deduplicated instruction/input/output corpus from the Octavia voice sources")
+    parser.add_argument("--sources", type=str, nargs="*", default=None, help="CSV, JSON or JSONL sources in priority order")
+    parser.add_argument("--output_file", type=str, default="octavia_corpus.parquet", help="Output corpus (.parquet, or .arrow for memory mapping)")
+    args = parser.parse_args()
+
+    sources = args.sources or [path for path in DEFAULT_SOURCES if os.path.exists(path)]
+    rows, stats = build_corpus(sources)
+    write_corpus(rows, args.output_file)
+
+    for source, counts in stats.items():
+        print(f"{source}: {counts['read']} read, {counts['kept']} kept, {counts['exact_duplicates']} exact and "
+              f"{counts['near_duplicates']} near duplicates, {counts['unparsed']} unparsed")
+    print(f"Corpus saved to {args.output_file} ({len(rows)} examples)")
+
+if __name__ == "__main__":
+    main()
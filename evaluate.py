@@ -8,22 +8,124 @@ import torch
 import numpy as np
 from tqdm import tqdm
 from transformers import AutoModelForCausalLM, AutoTokenizer
-from peft import PeftModel
 from datasets import load_dataset
 from evaluate import load
 from rouge_score import rouge_scorer
+from adapter_pool import AdapterPool, BASE_ADAPTER, parse_adapter_specs
+from prompt_template import prompt_template
 
-def format_prompt(instruction, input_text=None):
-    """Format the instruction and input into a prompt."""
-    if input_text:
-        return f"### Instruction:\n{instruction}\n\n### Input:\n{input_text}\n\n### Response:\n"
-    else:
-        return f"### Instruction:\n{instruction}\n\n### Response:\n"
+def evaluate_adapter(pool, adapter, eval_dataset, max_new_tokens, bertscore, rouge_scorer_instance, batch_size=1):
+    """Generate responses for every example with one adapter, batch_size examples per forward pass, and score them."""
+    template = prompt_template(pool.tokenizer)
+    
+    # Prepare results storage
+    results = {
+        "adapter": adapter,
+        "samples": [],
+        "metrics": {
+            "bertscore": {"precision": [], "recall": [], "f1": []},
+            "rouge1": {"precision": [], "recall": [], "f1": []},
+            "rouge2": {"precision": [], "recall": [], "f1": []},
+            "rougeL": {"precision": [], "recall": [], "f1": []},
+        }
+    }
+    
+    batches = range(0, len(eval_dataset), batch_size)
+    for start in tqdm(batches, desc=adapter):
+        batch = eval_dataset[start:start + batch_size]
+        
+        # Assemble the prompts' token ids from the pre-tokenized template
+        inputs = template.prompt_inputs(batch["instruction"], batch["input"]).to(pool.device)
+        
+        # Generate responses
+        outputs = pool.generate(
+            inputs,
+            adapter,
+            max_new_tokens=max_new_tokens,
+            do_sample=False,  # Use greedy decoding for evaluation
+        )
+        
+        # Decode only the tokens generated after the prompts
+        generated_responses = template.responses(outputs, inputs["input_ids"].shape[1])
+        
+        # Calculate metrics
+        # BERTScore
+        bert_results = bertscore.compute(
+            predictions=generated_responses, 
+            references=batch["output"], 
+            lang="en"
+        )
+        
+        for offset, generated_response in enumerate(generated_responses):
+            example = {key: values[offset] for key, values in batch.items()}
+            
+            # ROUGE
+            rouge_results = rouge_scorer_instance.score(example["output"], generated_response)
+            
+            # Store results
+            sample_result = {
+                "id": start + offset,
+                "instruction": example["instruction"],
+                "input": example["input"],
+                "reference": example["output"],
+                "generated": generated_response,
+                "metrics": {
+                    "bertscore": {
+                        "precision": bert_results["precision"][offset],
+                        "recall": bert_results["recall"][offset],
+                        "f1": bert_results["f1"][offset]
+                    },
+                    "rouge1": {
+                        "precision": rouge_results["rouge1"].precision,
+                        "recall": rouge_results["rouge1"].recall,
+                        "f1": rouge_results["rouge1"].fmeasure
+                    },
+                    "rouge2": {
+                        "precision": rouge_results["rouge2"].precision,
+                        "recall": rouge_results["rouge2"].recall,
+                        "f1": rouge_results["rouge2"].fmeasure
+                    },
+                    "rougeL": {
+                        "precision": rouge_results["rougeL"].precision,
+                        "recall": rouge_results["rougeL"].recall,
+                        "f1": rouge_results["rougeL"].fmeasure
+                    }
+                }
+            }
+            
+            results["samples"].append(sample_result)
+            
+            # Accumulate metrics
+            results["metrics"]["bertscore"]["precision"].append(bert_results["precision"][offset])
+            results["metrics"]["bertscore"]["recall"].append(bert_results["recall"][offset])
+            results["metrics"]["bertscore"]["f1"].append(bert_results["f1"][offset])
+            
+            results["metrics"]["rouge1"]["precision"].append(rouge_results["rouge1"].precision)
+            results["metrics"]["rouge1"]["recall"].append(rouge_results["rouge1"].recall)
+            results["metrics"]["rouge1"]["f1"].append(rouge_results["rouge1"].fmeasure)
+            
+            results["metrics"]["rouge2"]["precision"].append(rouge_results["rouge2"].precision)
+            results["metrics"]["rouge2"]["recall"].append(rouge_results["rouge2"].recall)
+            results["metrics"]["rouge2"]["f1"].append(rouge_results["rouge2"].fmeasure)
+            
+            results["metrics"]["rougeL"]["precision"].append(rouge_results["rougeL"].precision)
+            results["metrics"]["rougeL"]["recall"].append(rouge_results["rougeL"].recall)
+            results["metrics"]["rougeL"]["f1"].append(rouge_results["rougeL"].fmeasure)
+    
+    # Calculate average metrics
+    for metric in results["metrics"]:
+        for key in results["metrics"][metric]:
+            results["metrics"][metric][f"avg_{key}"] = float(np.mean(results["metrics"][metric][key]))
+    
+    return results
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--base_model", type=str, required=True, help="Base model path")
     parser.add_argument("--adapter_model", type=str, default=None, help="LoRA adapter model path (if not merged)")
+    parser.add_argument("--adapters", type=str, nargs="*", default=None, help="Named adapters to evaluate as NAME=PATH, a JSON name->path file, or a directory of adapters")
+    parser.add_argument("--include_base", action="store_true", help="Also evaluate the base model without any adapter")
+    parser.add_argument("--max_resident_adapters", type=int, default=4, help="Maximum number of adapters kept loaded at once")
     parser.add_argument("--eval_data", type=str, required=True, help="Path to evaluation data")
     parser.add_argument("--output_dir", type=str, required=True, help="Output directory for evaluation results")
     parser.add_argument("--max_new_tokens", type=int, default=1024, help="Maximum number of new tokens")
@@ -36,6 +138,9 @@ def main():
     # Load tokenizer
     print(f"Loading tokenizer from {args.base_model}")
     tokenizer = AutoTokenizer.from_pretrained(args.base_model, trust_remote_code=True)
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
+    tokenizer.padding_side = "left"  # Batched prompts must end where generation starts
     
     # Load model
     print(f"Loading model from {args.base_model}")
@@ -45,11 +150,18 @@ def main():
         device_map="auto",
         trust_remote_code=True,
     )
+    model.eval()
     
-    # Load adapter if specified
+    # Register adapters on the shared base model; they are loaded lazily during evaluation
+    pool = AdapterPool(model, tokenizer, max_resident=args.max_resident_adapters)
     if args.adapter_model:
-        print(f"Loading adapter from {args.adapter_model}")
-        model = PeftModel.from_pretrained(model, args.adapter_model)
+        pool.register("default", args.adapter_model)
+    for name, path in parse_adapter_specs(args.adapters).items():
+        pool.register(name, path)
+    
+    adapters = pool.names()
+    if args.include_base or not adapters:
+        adapters.insert(0, BASE_ADAPTER)
     
     # Load evaluation data
     print(f"Loading evaluation data from {args.eval_data}")
@@ -59,120 +171,32 @@ def main():
     bertscore = load("bertscore")
     rouge_scorer_instance = rouge_scorer.RougeScorer(['rouge1', 'rouge2', 'rougeL'], use_stemmer=True)
     
-    # Prepare results storage
-    results = {
-        "samples": [],
-        "metrics": {
-            "bertscore": {"precision": [], "recall": [], "f1": []},
-            "rouge1": {"precision": [], "recall": [], "f1": []},
-            "rouge2": {"precision": [], "recall": [], "f1": []},
-            "rougeL": {"precision": [], "recall": [], "f1": []},
-        }
-    }
-    
     # Evaluate model
     print("Starting evaluation...")
-    model.eval()
-    
-    for i, example in enumerate(tqdm(eval_dataset)):
-        # Format prompt
-        prompt = format_prompt(example["instruction"], example["input"])
-        
-        # Tokenize prompt
-        inputs = tokenizer(prompt, return_tensors="pt").to(model.device)
-        
-        # Generate response
-        with torch.no_grad():
-            outputs = model.generate(
-                **inputs,
-                max_new_tokens=args.max_new_tokens,
-                do_sample=False,  # Use greedy decoding for evaluation
-            )
-        
-        # Decode and extract response
-        full_response = tokenizer.decode(outputs[0], skip_special_tokens=True)
-        generated_response = full_response[len(prompt):]
-        
-        # Calculate metrics
-        # BERTScore
-        bert_results = bertscore.compute(
-            predictions=[generated_response], 
-            references=[example["output"]], 
-            lang="en"
+    for adapter in adapters:
+        results = evaluate_adapter(
+            pool, adapter, eval_dataset, args.max_new_tokens, bertscore, rouge_scorer_instance, args.batch_size
         )
         
-        # ROUGE
-        rouge_results = rouge_scorer_instance.score(example["output"], generated_response)
-        
-        # Store results
-        sample_result = {
-            "id": i,
-            "instruction": example["instruction"],
-            "input": example["input"],
-            "reference": example["output"],
-            "generated": generated_response,
-            "metrics": {
-                "bertscore": {
-                    "precision": bert_results["precision"][0],
-                    "recall": bert_results["recall"][0],
-                    "f1": bert_results["f1"][0]
-                },
-                "rouge1": {
-                    "precision": rouge_results["rouge1"].precision,
-                    "recall": rouge_results["rouge1"].recall,
-                    "f1": rouge_results["rouge1"].fmeasure
-                },
-                "rouge2": {
-                    "precision": rouge_results["rouge2"].precision,
-                    "recall": rouge_results["rouge2"].recall,
-                    "f1": rouge_results["rouge2"].fmeasure
-                },
-                "rougeL": {
-                    "precision": rouge_results["rougeL"].precision,
-                    "recall": rouge_results["rougeL"].recall,
-                    "f1": rouge_results["rougeL"].fmeasure
-                }
-            }
-        }
-        
-        results["samples"].append(sample_result)
-        
-        # Accumulate metrics
-        results["metrics"]["bertscore"]["precision"].append(bert_results["precision"][0])
-        results["metrics"]["bertscore"]["recall"].append(bert_results["recall"][0])
-        results["metrics"]["bertscore"]["f1"].append(bert_results["f1"][0])
+        # Save results; keep the historical file name when a single model is evaluated
+        if len(adapters) == 1:
+            results_path = os.path.join(args.output_dir, "evaluation_results.json")
+        else:
+            results_path = os.path.join(args.output_dir, f"evaluation_results_{adapter}.json")
+        with open(results_path, 'w') as f:
+            json.dump(results, f, indent=2)
         
-        results["metrics"]["rouge1"]["precision"].append(rouge_results["rouge1"].precision)
-        results["metrics"]["rouge1"]["recall"].append(rouge_results["rouge1"].recall)
-        results["metrics"]["rouge1"]["f1"].append(rouge_results["rouge1"].fmeasure)
-        
-        results["metrics"]["rouge2"]["precision"].append(rouge_results["rouge2"].precision)
-        results["metrics"]["rouge2"]["recall"].append(rouge_results["rouge2"].recall)
-        results["metrics"]["rouge2"]["f1"].append(rouge_results["rouge2"].fmeasure)
-        
-        results["metrics"]["rougeL"]["precision"].append(rouge_results["rougeL"].precision)
-        results["metrics"]["rougeL"]["recall"].append(rouge_results["rougeL"].recall)
-        results["metrics"]["rougeL"]["f1"].append(rouge_results["rougeL"].fmeasure)
-    
-    # Calculate average metrics
-    for metric in results["metrics"]:
-        for key in results["metrics"][metric]:
-            results["metrics"][metric][f"avg_{key}"] = float(np.mean(results["metrics"][metric][key]))
-    
-    # Save results
-    results_path = os.path.join(args.output_dir, "evaluation_results.json")
-    with open(results_path, 'w') as f:
-        json.dump(results, f, indent=2)
+        # Print summary
+        print(f"\n===== EVALUATION SUMMARY ({adapter}) =====")
+        print(f"Total samples evaluated: {len(eval_dataset)}")
+        print("\nAverage metrics:")
+        print(f"BERTScore F1: {results['metrics']['bertscore']['avg_f1']:.4f}")
+        print(f"ROUGE-1 F1: {results['metrics']['rouge1']['avg_f1']:.4f}")
+        print(f"ROUGE-2 F1: {results['metrics']['rouge2']['avg_f1']:.4f}")
+        print(f"ROUGE-L F1: {results['metrics']['rougeL']['avg_f1']:.4f}")
+        print(f"\nDetailed results saved to {results_path}")
     
-    # Print summary
-    print("\n===== EVALUATION SUMMARY =====")
-    print(f"Total samples evaluated: {len(eval_dataset)}")
-    print("\nAverage metrics:")
-    print(f"BERTScore F1: {results['metrics']['bertscore']['avg_f1']:.4f}")
-    print(f"ROUGE-1 F1: {results['metrics']['rouge1']['avg_f1']:.4f}")
-    print(f"ROUGE-2 F1: {results['metrics']['rouge2']['avg_f1']:.4f}")
-    print(f"ROUGE-L F1: {results['metrics']['rougeL']['avg_f1']:.4f}")
-    print(f"\nDetailed results saved to {results_path}")
+    print(f"\nAdapter pool stats: {pool.stats}")
 
 if __name__ == "__main__":
     main()
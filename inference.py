@@ -6,21 +6,98 @@ import json
 import argparse
 import torch
 from transformers import AutoModelForCausalLM, AutoTokenizer, GenerationConfig
-from peft import PeftModel
+from adapter_pool import AdapterPool, BASE_ADAPTER, parse_adapter_specs
+from quantize_cpu import is_quantized_model_dir, load_quantized_model, set_cpu_threads
+from speculative import load_draft_model, measure_speedup
+from prompt_template import format_prompt, prompt_template, decode_new_tokens
 
-def format_prompt(instruction, input_text=None):
-    """Format the instruction and input into a prompt."""
-    if input_text:
-        return f"### Instruction:\n{instruction}\n\n### Input:\n{input_text}\n\n### Response:\n"
+def load_model(model_path, device="auto"):
+    """Load a model for generation, using fp32 or a quantized checkpoint on CPU."""
+    if is_quantized_model_dir(model_path):
+        return load_quantized_model(model_path)
+    if device == "cpu" or not torch.cuda.is_available():
+        # float16 matmuls are slow or unsupported on most CPUs
+        return AutoModelForCausalLM.from_pretrained(
+            model_path,
+            torch_dtype=torch.float32,
+            trust_remote_code=True,
+        )
+    return AutoModelForCausalLM.from_pretrained(
+        model_path,
+        torch_dtype=torch.float16,
+        device_map="auto",
+        trust_remote_code=True,
+    )
+
+def load_requests(path):
+    """Load generation requests from a JSONL file of {adapter, instruction, input} records."""
+    requests = []
+    with open(path, 'r') as f:
+        for line in f:
+            if line.strip():
+                requests.append(json.loads(line))
+    return requests
+
+def generate_response(pool, generation_config, instruction, input_text=None, adapter=BASE_ADAPTER,
+                      draft_model=None, num_draft_tokens=4):
+    """Generate a single response with the named adapter.
+    
+    With a draft model the response is decoded speculatively and the
+    returned stats hold the acceptance rate; otherwise stats is None.
+    """
+    prompt = format_prompt(instruction, input_text)
+    template = prompt_template(pool.tokenizer)
+    inputs = template.prompt_inputs([instruction], [input_text]).to(pool.device)
+    stats = None
+    if draft_model is not None:
+        outputs, stats = pool.generate_speculative(
+            inputs,
+            adapter,
+            draft_model,
+            max_new_tokens=generation_config.max_new_tokens,
+            num_draft_tokens=num_draft_tokens,
+            do_sample=generation_config.do_sample,
+            temperature=generation_config.temperature or 1.0,
+            top_k=generation_config.top_k or 0,
+            top_p=generation_config.top_p or 1.0,
+            eos_token_id=generation_config.eos_token_id or pool.tokenizer.eos_token_id,
+            repetition_penalty=generation_config.repetition_penalty or 1.0,
+        )
     else:
-        return f"### Instruction:\n{instruction}\n\n### Response:\n"
+        outputs = pool.generate(inputs, adapter, generation_config=generation_config)
+    
+    # The response starts right after the prompt's tokens
+    return prompt, template.responses(outputs, inputs["input_ids"].shape[1])[0], stats
+
+def generate_batch_responses(pool, generation_config, requests, default_adapter=BASE_ADAPTER):
+    """Generate responses for requests that may each name a different adapter in one batch."""
+    template = prompt_template(pool.tokenizer)
+    adapters = [r.get("adapter", default_adapter) for r in requests]
+    
+    inputs = template.prompt_inputs(
+        [r["instruction"] for r in requests], [r.get("input") for r in requests]
+    ).to(pool.device)
+    outputs = pool.generate_batch(inputs, adapters, generation_config=generation_config)
+    
+    # With left padding every row's prompt ends at the same position
+    return decode_new_tokens(pool.tokenizer, outputs, inputs["input_ids"].shape[1])
 
 def main():
     parser = argparse.ArgumentParser()
-    parser.add_argument("--base_model", type=str, required=True, help="Base model path")
+    parser.add_argument("--base_model", type=str, required=True, help="Base model path (or a quantized model from quantize_cpu.py)")
+    parser.add_argument("--device", type=str, default="auto", choices=["auto", "cpu"], help="Device to run on")
+    parser.add_argument("--num_threads", type=int, default=None, help="Number of CPU threads for inference")
     parser.add_argument("--adapter_model", type=str, default=None, help="LoRA adapter model path (if not merged)")
-    parser.add_argument("--prompt", type=str, required=True, help="Instruction prompt")
+    parser.add_argument("--adapters", type=str, nargs="*", default=None, help="Named adapters as NAME=PATH, a JSON name->path file, or a directory of adapters")
+    parser.add_argument("--adapter", type=str, default=None, help="Name of the adapter to use for --prompt")
+    parser.add_argument("--max_resident_adapters", type=int, default=4, help="Maximum number of adapters kept loaded at once")
+    parser.add_argument("--prompt", type=str, default=None, help="Instruction prompt")
+    parser.add_argument("--prompts_file", type=str, default=None, help="JSONL file of {adapter, instruction, input} requests")
+    parser.add_argument("--batch_size", type=int, default=1, help="Requests per forward pass when using --prompts_file; rows may use different adapters")
     parser.add_argument("--input", type=str, default=None, help="Optional input text")
+    parser.add_argument("--draft_model", type=str, default=None, help="Small draft model for speculative decoding (must share the tokenizer)")
+    parser.add_argument("--num_draft_tokens", type=int, default=4, help="Tokens proposed by the draft model per verification step")
+    parser.add_argument("--compare_baseline", action="store_true", help="Also time plain greedy decoding and report the speculative speedup")
     parser.add_argument("--config_path", type=str, default=None, help="Path to generation config")
     parser.add_argument("--max_new_tokens", type=int, default=1024, help="Maximum number of new tokens")
     parser.add_argument("--temperature", type=float, default=0.7, help="Temperature for sampling")
@@ -29,29 +106,44 @@ def main():
     parser.add_argument("--repetition_penalty", type=float, default=1.1, help="Repetition penalty")
     args = parser.parse_args()
     
+    if not args.prompt and not args.prompts_file:
+        parser.error("one of --prompt or --prompts_file is required")
+    
     # Load tokenizer
     print(f"Loading tokenizer from {args.base_model}")
     tokenizer = AutoTokenizer.from_pretrained(args.base_model, trust_remote_code=True)
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
+    tokenizer.padding_side = "left"  # Decoder-only batches must be left padded for generation
     
     # Load model
     print(f"Loading model from {args.base_model}")
-    model = AutoModelForCausalLM.from_pretrained(
-        args.base_model,
-        torch_dtype=torch.float16,
-        device_map="auto",
-        trust_remote_code=True,
-    )
+    if args.device == "cpu" or not torch.cuda.is_available():
+        set_cpu_threads(args.num_threads)
+    model = load_model(args.base_model, args.device)
     
-    # Load adapter if specified
+    # Register adapters; each one is loaded onto the shared base model on first use
+    pool = AdapterPool(model, tokenizer, max_resident=args.max_resident_adapters)
     if args.adapter_model:
-        print(f"Loading adapter from {args.adapter_model}")
-        model = PeftModel.from_pretrained(model, args.adapter_model)
+        pool.register("default", args.adapter_model)
+    for name, path in parse_adapter_specs(args.adapters).items():
+        pool.register(name, path)
+    default_adapter = args.adapter or ("default" if args.adapter_model else BASE_ADAPTER)
+    
+    # Load draft model for speculative decoding if specified
+    draft_model = None
+    if args.draft_model:
+        print(f"Loading draft model from {args.draft_model}")
+        draft_model = load_draft_model(args.draft_model, device=model.device, torch_dtype=model.dtype)
     
     # Load generation config if specified
     if args.config_path:
         print(f"Loading generation config from {args.config_path}")
         with open(args.config_path, 'r') as f:
             gen_config_dict = json.load(f)
+        # Speculative decoding needs an explicit budget; configs may leave it out
+        if gen_config_dict.get("max_new_tokens") is None:
+            gen_config_dict["max_new_tokens"] = args.max_new_tokens
         generation_config = GenerationConfig(**gen_config_dict)
     else:
         # Use command line arguments for generation config
@@ -65,32 +157,67 @@ def main():
             pad_token_id=tokenizer.pad_token_id if tokenizer.pad_token_id else tokenizer.eos_token_id,
         )
     
+    if args.prompts_file:
+        # Serve every request from the same base model; rows in a batch may use different adapters
+        requests = load_requests(args.prompts_file)
+        adapters = [r.get("adapter", default_adapter) for r in requests]
+        # Speculative decoding verifies one sequence at a time
+        batch_size = 1 if draft_model is not None else args.batch_size
+        for batch in pool.plan_batches(adapters, batch_size):
+            batch_requests = [requests[i] for i in batch]
+            if draft_model is not None:
+                request = batch_requests[0]
+                _, response, stats = generate_response(
+                    pool, generation_config, request["instruction"], request.get("input"),
+                    adapters[batch[0]], draft_model, args.num_draft_tokens
+                )
+                print(f"Draft acceptance rate: {stats.acceptance_rate:.2%}")
+                responses = [response]
+            else:
+                responses = generate_batch_responses(pool, generation_config, batch_requests, default_adapter)
+            for i, response in zip(batch, responses):
+                print(f"\n===== RESPONSE {i} ({adapters[i]}) =====")
+                print(response)
+                print("====================\n")
+        print(f"Adapter pool stats: {pool.stats}")
+        return
+    
     # Format prompt
     prompt = format_prompt(args.prompt, args.input)
     print("\n===== PROMPT =====")
     print(prompt)
     print("==================\n")
     
-    # Tokenize prompt
-    inputs = tokenizer(prompt, return_tensors="pt").to(model.device)
-    
     # Generate response
     print("Generating response...")
-    with torch.no_grad():
-        outputs = model.generate(
-            **inputs,
-            generation_config=generation_config,
-        )
-    
-    # Decode and print response
-    response = tokenizer.decode(outputs[0], skip_special_tokens=True)
-    
-    # Extract just the response part (after the prompt)
-    response = response[len(prompt):]
+    _, response, stats = generate_response(
+        pool, generation_config, args.prompt, args.input, default_adapter, draft_model, args.num_draft_tokens
+    )
     
     print("\n===== RESPONSE =====")
     print(response)
     print("====================\n")
+    
+    if stats is not None:
+        print(f"Draft acceptance rate: {stats.acceptance_rate:.2%} "
+              f"({stats.accepted_tokens}/{stats.proposed_tokens} proposed tokens)")
+        print(f"Tokens per main-model pass: {stats.tokens_per_target_pass:.2f}, "
+              f"{stats.tokens_per_second:.1f} tokens/s")
+    
+    if draft_model is not None and args.compare_baseline:
+        print("Timing greedy decoding with and without the draft model...")
+        inputs = prompt_template(tokenizer).prompt_inputs([args.prompt], [args.input]).to(pool.device)
+        report = measure_speedup(
+            pool.activate(default_adapter),
+            draft_model,
+            inputs["input_ids"],
+            max_new_tokens=generation_config.max_new_tokens,
+            num_draft_tokens=args.num_draft_tokens,
+            eos_token_id=tokenizer.eos_token_id,
+            pad_token_id=generation_config.pad_token_id,
+        )
+        print(json.dumps(report, indent=2))
+        print(f"Speculative speedup: {report['speedup']:.2f}x")
 
 if __name__ == "__main__":
     main()
@@ -2,11 +2,193 @@
 # coding=utf-8
 
 import os
+import re
 import json
+import math
+import shutil
 import argparse
 import torch
+from safetensors import safe_open
+from safetensors.torch import load_file, save_file
 from transformers import AutoModelForCausalLM, AutoTokenizer
 from peft import PeftModel
+from quantize_cpu import QUANTIZATION_SCHEMES, quantize_model, save_quantized_model
+
+SAFE_WEIGHTS_NAME = "model.safetensors"
+SAFE_WEIGHTS_INDEX_NAME = "model.safetensors.index.json"
+ADAPTER_PREFIX = "base_model.model."
+SIZE_UNITS = {"KB": 10**3, "MB": 10**6, "GB": 10**9, "KIB": 2**10, "MIB": 2**20, "GIB": 2**30}
+
+def parse_size(size):
+    """Convert a size such as '2GB' or '500MB' to bytes."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]i?B)\s*", str(size), re.IGNORECASE)
+    if not match:
+        return int(size)
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2).upper()])
+
+def resolve_model_dir(model_name_or_path):
+    """Return a local directory for the model, downloading only config, tokenizer and safetensors files."""
+    if os.path.isdir(model_name_or_path):
+        return model_name_or_path
+    from huggingface_hub import snapshot_download
+    return snapshot_download(model_name_or_path, allow_patterns=["*.json", "*.safetensors", "*.model", "*.txt"])
+
+def list_weight_shards(model_dir):
+    """Return the safetensors shard files of a model in order."""
+    index_path = os.path.join(model_dir, SAFE_WEIGHTS_INDEX_NAME)
+    if os.path.isfile(index_path):
+        with open(index_path, 'r') as f:
+            weight_map = json.load(f)["weight_map"]
+        return [os.path.join(model_dir, name) for name in sorted(set(weight_map.values()))]
+    single_path = os.path.join(model_dir, SAFE_WEIGHTS_NAME)
+    if os.path.isfile(single_path):
+        return [single_path]
+    raise ValueError(f"Streaming merge needs safetensors weights, none found in {model_dir}")
+
+def load_lora_deltas(adapter_dir):
+    """Load a LoRA adapter as {base weight key: (kind, A, B, scaling)} plus full replacement weights."""
+    with open(os.path.join(adapter_dir, "adapter_config.json"), 'r') as f:
+        adapter_config = json.load(f)
+    if adapter_config.get("use_dora"):
+        raise ValueError("Streaming merge does not support DoRA adapters")
+
+    safetensors_path = os.path.join(adapter_dir, "adapter_model.safetensors")
+    if os.path.isfile(safetensors_path):
+        adapter_weights = load_file(safetensors_path)
+    else:
+        adapter_weights = torch.load(os.path.join(adapter_dir, "adapter_model.bin"), map_location="cpu")
+
+    r = adapter_config["r"]
+    lora_alpha = adapter_config["lora_alpha"]
+    rank_pattern = adapter_config.get("rank_pattern") or {}
+    alpha_pattern = adapter_config.get("alpha_pattern") or {}
+
+    def module_scaling(module_name):
+        """Per-module scaling, honouring PEFT's rank/alpha pattern overrides."""
+        rank = next((v for k, v in rank_pattern.items() if re.match(rf"(.*\.)?{k}$", module_name)), r)
+        alpha = next((v for k, v in alpha_pattern.items() if re.match(rf"(.*\.)?{k}$", module_name)), lora_alpha)
+        return alpha / math.sqrt(rank) if adapter_config.get("use_rslora") else alpha / rank
+
+    pairs, replacements = {}, {}
+    for key, tensor in adapter_weights.items():
+        key = key[len(ADAPTER_PREFIX):] if key.startswith(ADAPTER_PREFIX) else key
+        match = re.match(r"(.+)\.(lora_A|lora_B)\.weight$", key) or re.match(r"(.+)\.(lora_embedding_A|lora_embedding_B)$", key)
+        if match:
+            module_name, part = match.groups()
+            pairs.setdefault(module_name, {})[part] = tensor
+        else:
+            # modules_to_save entries are stored as full weights that replace the base ones
+            replacements[key] = tensor
+
+    deltas = {}
+    for module_name, parts in pairs.items():
+        if "lora_A" in parts:
+            deltas[f"{module_name}.weight"] = ("linear", parts["lora_A"], parts["lora_B"], module_scaling(module_name))
+        else:
+            deltas[f"{module_name}.weight"] = ("embedding", parts["lora_embedding_A"], parts["lora_embedding_B"], module_scaling(module_name))
+    return deltas, replacements, adapter_config.get("fan_in_fan_out", False)
+
+def apply_lora_delta(weight, delta, fan_in_fan_out=False):
+    """Return weight + scaling * B @ A, computed in fp32."""
+    kind, lora_a, lora_b, scaling = delta
+    update = (lora_b.float() @ lora_a.float()) * scaling
+    if kind == "embedding" or fan_in_fan_out:
+        update = update.T
+    return (weight.float() + update).to(weight.dtype)
+
+class ShardedSafetensorsWriter:
+    """Write tensors to size-capped safetensors shards, flushing each shard as it fills up."""
+
+    def __init__(self, output_dir, max_shard_size):
+        self.output_dir = output_dir
+        self.max_shard_size = max_shard_size
+        self.buffer = {}
+        self.buffer_size = 0
+        self.shard_files = []
+        self.weight_map = {}
+        self.total_size = 0
+
+    def add(self, name, tensor):
+        size = tensor.numel() * tensor.element_size()
+        if self.buffer and self.buffer_size + size > self.max_shard_size:
+            self.flush()
+        self.buffer[name] = tensor.contiguous()
+        self.buffer_size += size
+        self.total_size += size
+
+    def flush(self):
+        if not self.buffer:
+            return
+        shard_file = f"model-part-{len(self.shard_files) + 1:05d}.safetensors"
+        save_file(self.buffer, os.path.join(self.output_dir, shard_file), metadata={"format": "pt"})
+        for name in self.buffer:
+            self.weight_map[name] = shard_file
+        self.shard_files.append(shard_file)
+        self.buffer = {}
+        self.buffer_size = 0
+
+    def close(self):
+        """Flush the last shard and give shards their final names and index."""
+        self.flush()
+        if len(self.shard_files) == 1:
+            os.replace(os.path.join(self.output_dir, self.shard_files[0]), os.path.join(self.output_dir, SAFE_WEIGHTS_NAME))
+            return
+
+        total = len(self.shard_files)
+        renames = {
+            shard_file: f"model-{i:05d}-of-{total:05d}.safetensors"
+            for i, shard_file in enumerate(self.shard_files, start=1)
+        }
+        for old_name, new_name in renames.items():
+            os.replace(os.path.join(self.output_dir, old_name), os.path.join(self.output_dir, new_name))
+        index = {
+            "metadata": {"total_size": self.total_size},
+            "weight_map": {name: renames[shard_file] for name, shard_file in sorted(self.weight_map.items())},
+        }
+        with open(os.path.join(self.output_dir, SAFE_WEIGHTS_INDEX_NAME), 'w') as f:
+            json.dump(index, f, indent=2)
+
+def stream_merge(base_model, adapter_model, output_dir, dtype=torch.float32, max_shard_size="2GB"):
+    """Merge a LoRA adapter into the base weights one tensor at a time.
+
+    Base shards are memory-mapped and read tensor by tensor, so peak memory
+    stays around one output shard instead of the whole model.
+    """
+    base_dir = resolve_model_dir(base_model)
+    deltas, replacements, fan_in_fan_out = load_lora_deltas(adapter_model)
+    writer = ShardedSafetensorsWriter(output_dir, parse_size(max_shard_size))
+    merged = set()
+
+    for shard_path in list_weight_shards(base_dir):
+        print(f"Merging shard {os.path.basename(shard_path)}")
+        with safe_open(shard_path, framework="pt", device="cpu") as f:
+            for name in f.keys():
+                if name in replacements:
+                    tensor = replacements[name]
+                else:
+                    tensor = f.get_tensor(name)
+                    if name in deltas:
+                        tensor = apply_lora_delta(tensor, deltas[name], fan_in_fan_out)
+                        merged.add(name)
+                if tensor.is_floating_point():
+                    tensor = tensor.to(dtype)
+                writer.add(name, tensor)
+    writer.close()
+
+    missing = set(deltas) - merged
+    if missing:
+        raise ValueError(f"LoRA weights without a matching base weight: {', '.join(sorted(missing)[:5])}")
+    print(f"Merged LoRA deltas into {len(merged)} weights")
+
+    # Copy the model config, recording the dtype the weights were written in
+    with open(os.path.join(base_dir, "config.json"), 'r') as f:
+        config = json.load(f)
+    config["torch_dtype"] = str(dtype).replace("torch.", "")
+    with open(os.path.join(output_dir, "config.json"), 'w') as f:
+        json.dump(config, f, indent=2)
+    generation_config_path = os.path.join(base_dir, "generation_config.json")
+    if os.path.isfile(generation_config_path):
+        shutil.copy(generation_config_path, output_dir)
 
 def main():
     parser = argparse.ArgumentParser()
@@ -14,13 +196,41 @@ def main():
     parser.add_argument("--adapter_model", type=str, required=True, help="LoRA adapter model to merge")
     parser.add_argument("--output_dir", type=str, required=True, help="Output directory for merged model")
     parser.add_argument("--half", action="store_true", help="Save model in half precision")
+    parser.add_argument("--quantize", type=str, default=None, choices=sorted(QUANTIZATION_SCHEMES), help="Save a weight-quantized model for CPU inference")
+    parser.add_argument("--streaming", action="store_true", help="Merge shard by shard from memory-mapped safetensors instead of loading the full model")
+    parser.add_argument("--max_shard_size", type=str, default="2GB", help="Maximum size of each saved safetensors shard")
     args = parser.parse_args()
     
+    if args.half and args.quantize:
+        parser.error("--half and --quantize are mutually exclusive")
+    if args.streaming and args.quantize:
+        parser.error("--streaming and --quantize are mutually exclusive")
+    
+    # Create output directory if it doesn't exist
+    os.makedirs(args.output_dir, exist_ok=True)
+    
+    # Load tokenizer to save alongside the model
+    tokenizer = AutoTokenizer.from_pretrained(args.base_model, trust_remote_code=True)
+    
+    if args.streaming:
+        print(f"Streaming merge of {args.adapter_model} into {args.base_model}")
+        stream_merge(
+            args.base_model,
+            args.adapter_model,
+            args.output_dir,
+            dtype=torch.float16 if args.half else torch.float32,
+            max_shard_size=args.max_shard_size,
+        )
+        tokenizer.save_pretrained(args.output_dir)
+        print("Model merging complete!")
+        return
+    
     print(f"Loading base model: {args.base_model}")
     base_model = AutoModelForCausalLM.from_pretrained(
         args.base_model,
         torch_dtype=torch.float16 if args.half else torch.float32,
-        device_map="auto",
+        # Quantization runs on CPU, so keep the whole model there
+        device_map=None if args.quantize else "auto",
         trust_remote_code=True,
     )
     
@@ -30,15 +240,15 @@ def main():
     print("Merging adapter weights into base model...")
     model = model.merge_and_unload()
     
-    # Create output directory if it doesn't exist
-    os.makedirs(args.output_dir, exist_ok=True)
-    
-    print(f"Saving merged model to {args.output_dir}")
-    model.save_pretrained(args.output_dir)
-    
-    # Save tokenizer
-    tokenizer = AutoTokenizer.from_pretrained(args.base_model, trust_remote_code=True)
-    tokenizer.save_pretrained(args.output_dir)
+    if args.quantize:
+        print(f"Quantizing merged model to {args.quantize}...")
+        model = quantize_model(model, args.quantize)
+        print(f"Saving quantized model to {args.output_dir}")
+        save_quantized_model(model, args.output_dir, args.quantize, tokenizer)
+    else:
+        print(f"Saving merged model to {args.output_dir}")
+        model.save_pretrained(args.output_dir, safe_serialization=True, max_shard_size=args.max_shard_size)
+        tokenizer.save_pretrained(args.output_dir)
     
     print("Model merging complete!")
 
@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+import os
+import re
+import json
+import zlib
+import argparse
+import numpy as np
+from build_corpus import read_records, normalize_record, example_id, load_corpus, write_corpus
+
+# Prime just above 2**32; with a, b and shingle hashes below 2**32, a * x + b fits in uint64
+MINHASH_PRIME = np.uint64(4294967311)
+
+def shingle_hashes(example, size=5):
+    """32-bit hashes of the character `size`-grams of an example's casefolded, space-collapsed text.
+
+    The fixed "### Instruction/Input/Response" headers are left out: every
+    formatted example shares them, which would inflate the similarity of
+    short examples.
+    """
+    text = " ".join(re.sub(r"[\W_]+", " ", " ".join(
+        example.get(name) or "" for name in ("instruction", "input", "output")
+    ).casefold()).split())
+    grams = {text[i:i + size] for i in range(max(1, len(text) - size + 1))}
+    return np.fromiter((zlib.crc32(gram.encode("utf-8")) for gram in grams), dtype=np.uint64, count=len(grams))
+
+class MinHasher:
+    """MinHash signatures from `num_perm` universal hash functions (a * x + b) mod p"""
+
+    def __init__(self, num_perm=128, seed=1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = rng.integers(1, 2**32 - 1, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, 2**32 - 1, size=num_perm, dtype=np.uint64)
+
+    def signature(self, hashes):
+        return ((np.outer(self.a, hashes) + self.b[:, None]) % MINHASH_PRIME).min(axis=1)
+
+    def signatures(self, hash_sets):
+        return np.vstack([self.signature(hashes) for hashes in hash_sets]) if hash_sets else \
+            np.empty((0, self.num_perm), dtype=np.uint64)
+
+def lsh_bands(num_perm, threshold):
+    """Pick (bands, rows) with bands * rows == num_perm whose S-curve midpoint is closest to threshold, erring low"""
+    options = [(bands, num_perm // bands) for bands in range(1, num_perm + 1) if num_perm % bands == 0]
+    midpoint = lambda option: (1 / option[0]) ** (1 / option[1])
+    below = [option for option in options if midpoint(option) <= threshold]
+    return min(below or options, key=lambda option: abs(midpoint(option) - threshold))
+
+def candidate_groups(signatures, bands, rows):
+    """Yield groups of row indices that share at least one LSH band bucket"""
+    for band in range(bands):
+        buckets = {}
+        block = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows])
+        for index, key in enumerate(block):
+            buckets.setdefault(key.tobytes(), []).append(index)
+        for members in buckets.values():
+            if len(members) > 1:
+                yield members
+
+class _DisjointSet:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, i):
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i, j):
+        root_i, root_j = self.find(i), self.find(j)
+        if root_i != root_j:
+            self.parent[max(root_i, root_j)] = min(root_i, root_j)
+
+def find_near_duplicates(examples, threshold=0.8, num_perm=128, shingle_size=5, seed=1):
+    """Cluster examples whose estimated Jaccard similarity is at least threshold.
+
+    Candidate pairs come from LSH buckets, so the work grows with the number
+    of examples and candidates rather than with all pairs. Each candidate is
+    checked against the first member of its bucket using the fraction of
+    agreeing MinHash values. Returns (clusters, signatures), where clusters
+    are lists of example indices with more than one member, in input order.
+    """
+    hasher = MinHasher(num_perm, seed)
+    signatures = hasher.signatures([shingle_hashes(example, shingle_size) for example in examples])
+    bands, rows = lsh_bands(num_perm, threshold)
+    clusters = _DisjointSet(len(examples))
+    for members in candidate_groups(signatures, bands, rows):
+        anchor = members[0]
+        agreement = (signatures[members[1:]] == signatures[anchor]).mean(axis=1)
+        for member, similarity in zip(members[1:], agreement):
+            if similarity >= threshold:
+                clusters.union(anchor, member)
+
+    groups = {}
+    for index in range(len(examples)):
+        groups.setdefault(clusters.find(index), []).append(index)
+    return [members for members in groups.values() if len(members) > 1], signatures
+
+def load_examples(paths):
+    """Normalized examples with ids and sources from corpus files or raw CSV/JSON/JSONL sources"""
+    examples = []
+    for path in paths:
+        if path.endswith((".parquet", ".arrow")):
+            examples.extend(load_corpus(path).to_pylist())
+            continue
+        source = os.path.basename(path)
+        for index, record in enumerate(read_records(path)):
+            example = normalize_record(record)
+            if example and example["instruction"] and example["output"]:
+                examples.append(dict(example, id=example_id(example), source=source, source_index=index))
+    return examples
+
+def near_duplicate_report(train, validation, clusters, signatures):
+    """Summarize clusters and train/validation leakage; returns (report, train indices a dedupe pass drops)"""
+    split = lambda index: "train" if index < len(train) else "validation"
+    example = lambda index: train[index] if index < len(train) else validation[index - len(train)]
+
+    report_clusters, leakage, drop = [], [], set()
+    for members in sorted(clusters, key=len, reverse=True):
+        train_members = [index for index in members if split(index) == "train"]
+        validation_members = [index for index in members if split(index) == "validation"]
+        report_clusters.append({
+            "size": len(members),
+            "members": [
+                {"split": split(index), "id": example(index)["id"], "source": example(index)["source"],
+                 "instruction": example(index)["instruction"][:120]}
+                for index in members
+            ],
+        })
+        if validation_members:
+            # Any train copy of a validation example leaks it
+            drop.update(train_members)
+            for index in validation_members:
+                similarity = (signatures[train_members] == signatures[index]).mean(axis=1) if train_members else []
+                if len(similarity):
+                    best = int(np.argmax(similarity))
+                    leakage.append({
+                        "validation_id": example(index)["id"],
+                        "train_id": example(train_members[best])["id"],
+                        "similarity": float(similarity[best]),
+                        "instruction": example(index)["instruction"][:120],
+                    })
+        else:
+            drop.update(train_members[1:])
+
+    report = {
+        "train_examples": len(train),
+        "validation_examples": len(validation),
+        "clusters": len(report_clusters),
+        "clustered_examples": sum(cluster["size"] for cluster in report_clusters),
+        "leaked_validation_examples": len(leakage),
+        "train_examples_to_drop": len(drop),
+        "leakage": leakage,
+        "near_duplicate_clusters": report_clusters,
+    }
+    return report, drop
+
+def main():
+    parser = argparse.ArgumentParser(description="Find near-duplicate examples and train/validation leakage with MinHash LSH")
+    parser.add_argument("--train", type=str, nargs="+", required=True, help="Training corpus (.parquet/.arrow) or raw sources")
+    parser.add_argument("--validation", type=str, nargs="*", default=[], help="Validation sources to check for leakage")
+    parser.add_argument("--threshold", type=float, default=0.8, help="Estimated Jaccard similarity that counts as a near duplicate")
+    parser.add_argument("--num_perm", type=int, default=128, help="MinHash permutations")
+    parser.add_argument("--shingle_size", type=int, default=5, help="Characters per shingle")
+    parser.add_argument("--report", type=str, default="near_duplicates_report.json", help="Where to write the JSON report")
+    parser.add_argument("--dedupe_output", type=str, default=None, help="Write the training examples minus near duplicates and leaked examples here (.parquet, .arrow or .jsonl)")
+    args = parser.parse_args()
+
+    train = load_examples(args.train)
+    validation = load_examples(args.validation)
+    clusters, signatures = find_near_duplicates(
+        train + validation, args.threshold, args.num_perm, args.shingle_size
+    )
+    report, drop = near_duplicate_report(train, validation, clusters, signatures)
+    with open(args.report, 'w') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(f"{report['clusters']} near-duplicate clusters covering {report['clustered_examples']} examples")
+    print(f"{report['leaked_validation_examples']} of {len(validation)} validation examples have a near duplicate in training")
+    print(f"Report saved to {args.report}")
+
+    if args.dedupe_output:
+        kept = [example for index, example in enumerate(train) if index not in drop]
+        if args.dedupe_output.endswith((".parquet", ".arrow")):
+            write_corpus(kept, args.dedupe_output)
+        else:
+            with open(args.dedupe_output, 'w') as f:
+                for example in kept:
+                    f.write(json.dumps(example, ensure_ascii=False) + '\n')
+        print(f"Deduplicated training data saved to {args.dedupe_output} ({len(kept)} examples, {len(drop)} dropped)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+Near-Duplicate Detection Test for Octavia's training data
+Plants a train/validation near duplicate and checks it is reported as leakage
+"""
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("pyarrow")
+
+from build_corpus import example_id
+from near_duplicates import find_near_duplicates, near_duplicate_report
+
+def _example(instruction, output, source="test.jsonl"):
+    example = {"instruction": instruction, "input": "", "output": output}
+    return dict(example, id=example_id(example), source=source)
+
+TRAIN = [
+    _example("Describe your morning ritual.",
+             "Darling, my mornings begin with espresso, silk and a shade of blue lipstick that could stop traffic on Fifth Avenue."),
+    _example("What does luxury mean to you?",
+             "Luxury isn't what you have, sweetie. It's how completely you own who you are, from your cufflinks to your convictions."),
+    _example("Give advice to a nervous debutante.",
+             "Walk in like the chandelier was hung in your honor, and let the room adjust its lighting accordingly, honey."),
+    _example("Give advice to a nervous debutante!",
+             "Walk in like the chandelier was hung in your honour, and let the room adjust its lighting accordingly, honey."),
+]
+
+VALIDATION = [
+    # A lightly edited copy of TRAIN[1]: casing, punctuation and one word differ
+    _example("What does LUXURY mean to you??",
+             "Luxury isn't what you have, sweetie; it's how completely you own who you are, from your cufflinks to your principles."),
+    _example("Review a gallery opening.",
+             "The canvases were brave, the wine was not, and the curator's blazer deserved its own retrospective."),
+]
+
+def test_planted_validation_leak():
+    """Test that a near copy of a training example in validation is reported and its training copy dropped"""
+    print("\n===== Testing Near-Duplicate Leakage Detection =====")
+
+    clusters, signatures = find_near_duplicates(TRAIN + VALIDATION, threshold=0.7)
+    report, drop = near_duplicate_report(TRAIN, VALIDATION, clusters, signatures)
+
+    assert report["leaked_validation_examples"] == 1
+    leak = report["leakage"][0]
+    assert (leak["validation_id"], leak["train_id"]) == (VALIDATION[0]["id"], TRAIN[1]["id"])
+    assert leak["similarity"] >= 0.7
+    print(f"✓ Planted validation example leaks from training (similarity {leak['similarity']:.2f})")
+
+    # The leaked training copy goes; of the in-training pair only the first is kept
+    assert drop == {1, 3}
+    assert report["clusters"] == 2 and report["clustered_examples"] == 4
+    print("✓ Dedupe drops the leaked copy and the second of the in-training pair")
+
+if __name__ == "__main__":
+    test_planted_validation_leak()
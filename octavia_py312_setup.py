@@ -375,11 +375,9 @@ class OctaviaDigitalHuman:
                 do_sample=True
             )
             
-            # Decode and extract the response
-            full_response = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-            
-            # Extract just Octavia's response part
-            response = full_response.split("responds:", 1)[1].strip() if "responds:" in full_response else full_response
+            # Decode only the tokens generated after the styled prompt
+            new_tokens = outputs[:, inputs.input_ids.shape[1]:]
+            response = self.tokenizer.batch_decode(new_tokens, skip_special_tokens=True)[0].strip()
             
             print(f"Generated response: {response}")
             return response
@@ -3,6 +3,8 @@ import json
 
 # Create a comprehensive dataset for Octavia's voice based on the provided scenarios
 # This will be formatted for AutoTrain to use for language model fine-tuning
+# For training, build_corpus.py ingests this script's CSV export along with the other
+# voice sources into one deduplicated Parquet/Arrow corpus
 
 # Parse the scenarios from the provided content
 scenarios = [
@@ -4,15 +4,301 @@
 import os
 import json
 import argparse
+import numpy as np
 import pandas as pd
-from datasets import Dataset
+import pyarrow as pa
+import pyarrow.parquet as pq
+from transformers import AutoTokenizer
+from prompt_template import format_instruction, prompt_template
 
-def format_instruction(example):
-    """Format the instruction, input, and output into a prompt."""
-    if example.get("input"):
-        return f"### Instruction:\n{example['instruction']}\n\n### Input:\n{example['input']}\n\n### Response:\n{example['output']}"
+OUTPUT_COLUMNS = ["instruction", "input", "output"]
+
+# Bytes read per step when streaming a JSON array
+JSON_READ_SIZE = 1 << 20
+
+# Per-row validation error codes; a row's code is the OR of every problem found
+ERROR_CODES = {
+    "missing_instruction": 1,
+    "empty_instruction": 2,
+    "missing_output": 4,
+    "empty_output": 8,
+    "nan_literal": 16,
+    "non_string": 32,
+    "too_long": 64,
+    "too_many_tokens": 128,
+}
+
+# Upper edges of the token-length histogram bins
+TOKEN_HISTOGRAM_EDGES = [64, 128, 256, 512, 1024, 2048, 4096, 8192]
+
+# Strings left behind when missing values were stringified upstream
+NAN_LITERALS = ["nan", "none", "null"]
+
+def iter_json_array(path, chunk_size, read_size=JSON_READ_SIZE):
+    """Yield lists of up to chunk_size records from a file holding one JSON array, reading it incrementally."""
+    decoder = json.JSONDecoder()
+    chunk, buffer, started = [], "", False
+    with open(path, 'r', encoding='utf-8') as f:
+        eof = False
+        while not eof:
+            block = f.read(read_size)
+            eof = not block
+            buffer += block
+            index = 0
+            while True:
+                while index < len(buffer) and buffer[index] in " \t\r\n,":
+                    index += 1
+                if not started and index < len(buffer):
+                    if buffer[index] != "[":
+                        raise ValueError(f"{path} does not hold a JSON array")
+                    started, index = True, index + 1
+                    continue
+                if index >= len(buffer) or buffer[index] == "]":
+                    break
+                try:
+                    record, index = decoder.raw_decode(buffer, index)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    break  # Record continues in the next block
+                chunk.append(record)
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+            buffer = buffer[index:]
+    if chunk:
+        yield chunk
+
+def iter_input_chunks(input_file, chunk_size):
+    """Yield DataFrames of up to chunk_size rows from a CSV, JSON or JSONL file without loading it whole."""
+    file_ext = os.path.splitext(input_file)[1].lower()
+    if file_ext == '.csv':
+        yield from pd.read_csv(input_file, chunksize=chunk_size, dtype=str, keep_default_na=False)
+    elif file_ext == '.jsonl':
+        yield from pd.read_json(input_file, lines=True, chunksize=chunk_size, dtype=False)
+    elif file_ext == '.json':
+        for records in iter_json_array(input_file, chunk_size):
+            yield pd.DataFrame(records)
     else:
-        return f"### Instruction:\n{example['instruction']}\n\n### Response:\n{example['output']}"
+        raise ValueError(f"Unsupported file format: {file_ext}")
+
+def map_columns(df, instruction_column, input_column, output_column):
+    """Validate the required columns and map a chunk onto instruction/input/output strings."""
+    for col in (instruction_column, output_column):
+        if col not in df.columns:
+            raise ValueError(f"Required column '{col}' not found in input file")
+    mapped = pd.DataFrame({
+        "instruction": df[instruction_column],
+        "input": df[input_column] if input_column in df.columns else "",
+        "output": df[output_column],
+    })
+    return mapped.fillna("").astype(str)
+
+class DatasetValidator:
+    def __init__(self, tokenizer=None, max_tokens=2048, max_chars=32768, batch_size=1024):
+        """Vectorized per-row checks with error codes, plus token lengths of the training examples.
+        
+        Rows are checked column-wise with pandas string operations. When a
+        tokenizer is given, rows that pass are tokenized in batches of
+        batch_size, the way train.py tokenizes them, and checked against
+        max_tokens.
+        """
+        self.tokenizer = tokenizer
+        self.max_tokens = max_tokens
+        self.max_chars = max_chars
+        self.batch_size = batch_size
+        self.rows = 0
+        self.error_counts = {name: 0 for name in ERROR_CODES}
+        self.quarantined = 0
+        self.token_lengths = []
+    
+    def check_column(self, raw, missing_code, empty_code):
+        """Return (cleaned strings, error codes) for one raw column."""
+        missing = raw.isna().to_numpy()
+        non_string = ~missing & ~raw.map(lambda value: isinstance(value, str)).to_numpy(dtype=bool)
+        text = raw.where(~missing, "").astype(str)
+        stripped = text.str.strip()
+        codes = np.zeros(len(raw), dtype=np.uint16)
+        if missing_code:
+            codes[missing] |= missing_code
+        if empty_code:
+            codes[~missing & (stripped == "").to_numpy()] |= empty_code
+        codes[stripped.str.lower().isin(NAN_LITERALS).to_numpy()] |= ERROR_CODES["nan_literal"]
+        codes[non_string] |= ERROR_CODES["non_string"]
+        return text, codes
+    
+    def count_tokens(self, df):
+        """Token counts of the training examples for an instruction/input/output frame, in batches."""
+        template = prompt_template(self.tokenizer)
+        lengths = []
+        for start in range(0, len(df), self.batch_size):
+            batch = df.iloc[start:start + self.batch_size]
+            examples, _ = template.encode_examples(batch["instruction"].tolist(), batch["input"].tolist(),
+                                                   batch["output"].tolist())
+            lengths.extend(len(ids) for ids in examples)
+        return np.array(lengths, dtype=np.int32)
+    
+    def validate(self, df, instruction_column, input_column, output_column, row_offset=0):
+        """Split a raw chunk into (valid rows, quarantined rows); quarantined rows carry their error codes."""
+        for col in (instruction_column, output_column):
+            if col not in df.columns:
+                raise ValueError(f"Required column '{col}' not found in input file")
+        instruction, codes = self.check_column(df[instruction_column], ERROR_CODES["missing_instruction"], ERROR_CODES["empty_instruction"])
+        output, output_codes = self.check_column(df[output_column], ERROR_CODES["missing_output"], ERROR_CODES["empty_output"])
+        codes |= output_codes
+        if input_column in df.columns:
+            # A missing input just means there is none
+            input_text, input_codes = self.check_column(df[input_column], 0, 0)
+            codes |= input_codes
+        else:
+            input_text = pd.Series("", index=df.index)
+        mapped = pd.DataFrame({"instruction": instruction, "input": input_text, "output": output})
+        
+        total_chars = (mapped["instruction"].str.len() + mapped["input"].str.len() + mapped["output"].str.len()).to_numpy()
+        codes[total_chars > self.max_chars] |= ERROR_CODES["too_long"]
+        
+        if self.tokenizer is not None:
+            checked = np.flatnonzero(codes == 0)
+            lengths = self.count_tokens(mapped.iloc[checked])
+            codes[checked[lengths > self.max_tokens]] |= ERROR_CODES["too_many_tokens"]
+            self.token_lengths.append(lengths)
+        
+        self.rows += len(df)
+        for name, bit in ERROR_CODES.items():
+            self.error_counts[name] += int(np.count_nonzero(codes & bit))
+        bad = codes != 0
+        self.quarantined += int(bad.sum())
+        
+        quarantine = df[bad].copy()
+        quarantine.insert(0, "error_codes", [
+            [name for name, bit in ERROR_CODES.items() if code & bit] for code in codes[bad]
+        ])
+        quarantine.insert(0, "row", np.flatnonzero(bad) + row_offset)
+        return mapped[~bad], quarantine
+    
+    def report(self):
+        """Row counts, error counts and token-length statistics as a dict."""
+        report = {
+            "rows": self.rows,
+            "valid": self.rows - self.quarantined,
+            "quarantined": self.quarantined,
+            "errors": self.error_counts,
+        }
+        if self.token_lengths:
+            lengths = np.concatenate(self.token_lengths)
+            edges = [0] + TOKEN_HISTOGRAM_EDGES + [max(TOKEN_HISTOGRAM_EDGES[-1], int(lengths.max(initial=0))) + 1]
+            counts, _ = np.histogram(lengths, bins=edges)
+            report["tokens"] = {
+                "max_tokens": self.max_tokens,
+                "mean": float(lengths.mean()) if len(lengths) else 0.0,
+                "percentiles": {f"p{q}": float(np.percentile(lengths, q)) if len(lengths) else 0.0 for q in (50, 90, 99)},
+                "max": int(lengths.max(initial=0)),
+                "histogram": [
+                    {"min": int(low), "max": int(high) - 1, "count": int(count)}
+                    for low, high, count in zip(edges[:-1], edges[1:], counts)
+                ],
+            }
+        return report
+
+def validation_mask(df, split_ratio):
+    """Deterministically assign rows to validation by hashing their content.
+
+    A row lands in the same split whatever chunk it is read in and however
+    large the file is, so reruns and resumed runs agree.
+    """
+    hashes = pd.util.hash_pandas_object(df[OUTPUT_COLUMNS], index=False).to_numpy()
+    return hashes < min(int(split_ratio * 2**64), 2**64 - 1)
+
+class ChunkWriter:
+    """Appends DataFrame chunks to a JSONL or Parquet file, chosen by extension."""
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+        self.parquet = path.endswith(".parquet")
+        self._writer = None
+        self._file = None if self.parquet else open(path, 'w', encoding='utf-8')
+
+    def write(self, df):
+        if df.empty:
+            return
+        if self.parquet:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            lines = df.to_json(orient="records", lines=True, force_ascii=False)
+            self._file.write(lines if lines.endswith("\n") else lines + "\n")
+        self.rows += len(df)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        elif self.parquet:
+            # No rows: still leave a readable, empty file
+            pq.write_table(pa.table({col: pa.array([], pa.string()) for col in OUTPUT_COLUMNS}), self.path)
+        if self._file is not None:
+            self._file.close()
+
+def quarantine_path(args):
+    return args.quarantine_file or os.path.splitext(args.output_file)[0] + "_quarantine.jsonl"
+
+def write_quality_report(args, validator):
+    """Print the validation summary and save the full report as JSON."""
+    report = validator.report()
+    report_file = args.report_file or os.path.splitext(args.output_file)[0] + "_quality_report.json"
+    with open(report_file, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Validated {report['rows']} rows: {report['valid']} valid, {report['quarantined']} quarantined to {quarantine_path(args)}")
+    for name, count in report["errors"].items():
+        if count:
+            print(f"  {name}: {count}")
+    if "tokens" in report:
+        tokens = report["tokens"]
+        print(f"Token lengths: p50 {tokens['percentiles']['p50']:.0f}, p99 {tokens['percentiles']['p99']:.0f}, max {tokens['max']}")
+    print(f"Quality report saved to {report_file}")
+    return report
+
+def prepare_streaming(args, validator=None):
+    """Prepare the dataset chunk by chunk in constant memory."""
+    train_writer = ChunkWriter(args.output_file)
+    quarantine_writer = ChunkWriter(quarantine_path(args)) if validator is not None else None
+    val_writer = None
+    if args.create_validation:
+        base, ext = os.path.splitext(args.output_file)
+        val_writer = ChunkWriter(f"{base}_validation{ext if ext == '.parquet' else '.jsonl'}")
+    
+    sample = None
+    row_offset = 0
+    try:
+        for chunk in iter_input_chunks(args.input_file, args.chunk_size):
+            if validator is not None:
+                df, quarantine = validator.validate(
+                    chunk, args.instruction_column, args.input_column, args.output_column, row_offset
+                )
+                quarantine_writer.write(quarantine)
+            else:
+                df = map_columns(chunk, args.instruction_column, args.input_column, args.output_column)
+            row_offset += len(chunk)
+            if sample is None and not df.empty:
+                sample = df.iloc[0].to_dict()
+            if val_writer is not None:
+                mask = validation_mask(df, args.split_ratio)
+                train_writer.write(df[~mask])
+                val_writer.write(df[mask])
+            else:
+                train_writer.write(df)
+    finally:
+        train_writer.close()
+        for writer in (val_writer, quarantine_writer):
+            if writer is not None:
+                writer.close()
+    
+    print(f"Training data saved to {train_writer.path} ({train_writer.rows} examples)")
+    if val_writer is not None:
+        print(f"Validation data saved to {val_writer.path} ({val_writer.rows} examples)")
+    return sample
 
 def main():
     parser = argparse.ArgumentParser()
@@ -23,10 +309,32 @@ def main():
     parser.add_argument("--output_column", type=str, default="output", help="Column name for output")
     parser.add_argument("--split_ratio", type=float, default=0.1, help="Ratio of data to use for validation")
     parser.add_argument("--create_validation", action="store_true", help="Whether to create a validation set")
+    parser.add_argument("--streaming", action="store_true", help="Read, split and write in chunks so memory stays flat (split by content hash)")
+    parser.add_argument("--chunk_size", type=int, default=50000, help="Rows per chunk in streaming mode")
+    parser.add_argument("--validate", action="store_true", help="Check every row and move bad rows to a quarantine file")
+    parser.add_argument("--tokenizer", type=str, default=None, help="Tokenizer for token-length checks and histograms (with --validate)")
+    parser.add_argument("--max_tokens", type=int, default=2048, help="Longest formatted example, in tokens, that passes validation")
+    parser.add_argument("--max_chars", type=int, default=32768, help="Longest example, in characters, that passes validation")
+    parser.add_argument("--quarantine_file", type=str, default=None, help="JSONL file for rows failing validation (default: OUTPUT_quarantine.jsonl)")
+    parser.add_argument("--report_file", type=str, default=None, help="JSON quality report (default: OUTPUT_quality_report.json)")
     args = parser.parse_args()
     
     print(f"Processing input file: {args.input_file}")
     
+    validator = None
+    if args.validate:
+        tokenizer = AutoTokenizer.from_pretrained(args.tokenizer, trust_remote_code=True) if args.tokenizer else None
+        validator = DatasetValidator(tokenizer, args.max_tokens, args.max_chars)
+    
+    if args.streaming:
+        sample = prepare_streaming(args, validator)
+        if validator is not None:
+            write_quality_report(args, validator)
+        if sample is not None:
+            print("\nSample formatted example:")
+            print(format_instruction(sample))
+        return
+    
     # Determine file type and load data
     file_ext = os.path.splitext(args.input_file)[1].lower()
     
@@ -48,23 +356,25 @@ def main():
     else:
         raise ValueError(f"Unsupported file format: {file_ext}")
     
-    # Validate columns
-    required_columns = [args.instruction_column, args.output_column]
-    for col in required_columns:
-        if col not in df.columns:
-            raise ValueError(f"Required column '{col}' not found in input file")
+    # Validate columns and map them onto instruction/input/output; missing values become ""
+    if validator is not None:
+        df, quarantine = validator.validate(df, args.instruction_column, args.input_column, args.output_column)
+        quarantine_writer = ChunkWriter(quarantine_path(args))
+        quarantine_writer.write(quarantine)
+        quarantine_writer.close()
+        write_quality_report(args, validator)
+    else:
+        df = map_columns(df, args.instruction_column, args.input_column, args.output_column)
     
-    # Prepare data
-    data = {
-        "instruction": df[args.instruction_column].tolist(),
-        "output": df[args.output_column].tolist(),
-    }
+    if df.empty:
+        print(f"No valid rows in {args.input_file}; nothing to split or save")
+        return
     
-    # Handle input column if it exists
-    if args.input_column in df.columns:
-        data["input"] = df[args.input_column].tolist()
-    else:
-        data["input"] = [""] * len(df)
+    # Only the in-memory path builds a datasets.Dataset
+    from datasets import Dataset
+    
+    # Prepare data
+    data = {column: df[column].tolist() for column in OUTPUT_COLUMNS}
     
     # Create dataset
     dataset = Dataset.from_dict(data)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+Dataset Preparation Test for Octavia's training data
+Checks row validation, the JSON array reader and the content-hash split offline
+"""
+
+import sys
+import json
+import argparse
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+pytest.importorskip("transformers")
+
+import pandas as pd
+
+import prepare_dataset
+from prepare_dataset import ERROR_CODES, DatasetValidator, iter_json_array, prepare_streaming, validation_mask
+
+RAW_ROWS = [
+    {"instruction": "Describe your morning ritual.", "input": "", "output": "Espresso, silk and blue lipstick, darling."},
+    {"instruction": None, "input": "", "output": "An answer to nothing."},
+    {"instruction": "What does luxury mean to you?", "input": None, "output": "   "},
+    {"instruction": "null", "input": "", "output": "NaN"},
+    {"instruction": 42, "input": "", "output": "The answer, sweetie."},
+    {"instruction": "Review a gallery opening.", "input": "Chelsea, Thursday", "output": "x" * 200},
+]
+
+def _examples(count):
+    return [
+        {"instruction": f"Give advice number {i}.", "input": f"Context {i}" if i % 3 else "", "output": f"Own it, honey. {i}"}
+        for i in range(count)
+    ]
+
+def test_validate_error_codes_and_quarantine_rows():
+    """Test that every problem sets its error bit and quarantined rows keep their file row numbers"""
+    print("\n===== Testing Row Validation =====")
+
+    validator = DatasetValidator(max_chars=150)
+    valid, quarantine = validator.validate(pd.DataFrame(RAW_ROWS), "instruction", "input", "output", row_offset=100)
+
+    assert valid.to_dict("records") == [RAW_ROWS[0]]
+    assert quarantine["row"].tolist() == [101, 102, 103, 104, 105]
+    assert quarantine["error_codes"].tolist() == [
+        ["missing_instruction"],
+        ["empty_output"],
+        ["nan_literal"],
+        ["non_string"],
+        ["too_long"],
+    ]
+    print("✓ Each bad row carries its error codes and row number")
+
+    report = validator.report()
+    assert (report["rows"], report["valid"], report["quarantined"]) == (6, 1, 5)
+    assert report["errors"]["nan_literal"] == 1 and report["errors"]["too_many_tokens"] == 0
+    print("✓ Report counts rows and errors")
+
+    text, codes = validator.check_column(pd.Series(["ok", None, " ", "None", 3.5]), 1, 2)
+    assert codes.tolist() == [0, 1, 2, ERROR_CODES["nan_literal"], ERROR_CODES["non_string"]]
+    assert text.tolist()[:3] == ["ok", "", " "]
+    print("✓ check_column maps missing, empty, literal and non-string values to bits")
+
+def test_iter_json_array_across_read_blocks(tmp_path):
+    """Test that records split across read blocks are reassembled and chunked"""
+    print("\n===== Testing Incremental JSON Array Reader =====")
+
+    examples = _examples(7)
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps(examples, indent=2))
+
+    for read_size in (5, 64, 1 << 20):
+        chunks = list(iter_json_array(str(path), chunk_size=3, read_size=read_size))
+        assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+        assert [record for chunk in chunks for record in chunk] == examples
+    print("✓ Same records and chunks for every read size")
+
+    path.write_text(json.dumps(examples[0]))
+    with pytest.raises(ValueError):
+        list(iter_json_array(str(path), chunk_size=3))
+    print("✓ A file without a JSON array is rejected")
+
+def _streaming_args(tmp_path, input_file, chunk_size):
+    output_dir = tmp_path / f"chunks-{chunk_size}"
+    output_dir.mkdir()
+    return argparse.Namespace(
+        input_file=str(input_file), output_file=str(output_dir / "train.jsonl"),
+        instruction_column="instruction", input_column="input", output_column="output",
+        split_ratio=0.25, create_validation=True, chunk_size=chunk_size, quarantine_file=None,
+    )
+
+def test_split_is_independent_of_chunk_size(tmp_path):
+    """Test that the content-hash split puts every row in the same split whatever the chunk size"""
+    print("\n===== Testing Content-Hash Split =====")
+
+    examples = _examples(40)
+    mask = validation_mask(pd.DataFrame(examples), 0.25)
+    assert 0 < mask.sum() < len(examples)
+    input_file = tmp_path / "data.jsonl"
+    input_file.write_text("".join(json.dumps(example) + "\n" for example in examples))
+
+    splits = []
+    for chunk_size in (1, 7, 100):
+        args = _streaming_args(tmp_path, input_file, chunk_size)
+        prepare_streaming(args)
+        with open(args.output_file) as f:
+            train = [json.loads(line) for line in f]
+        with open(args.output_file.replace(".jsonl", "_validation.jsonl")) as f:
+            validation = [json.loads(line) for line in f]
+        splits.append((train, validation))
+
+    assert all(split == splits[0] for split in splits)
+    assert splits[0][1] == [example for example, held_out in zip(examples, mask) if held_out]
+    print(f"✓ {len(splits[0][1])} of {len(examples)} rows held out identically for every chunk size")
+
+def test_all_rows_quarantined_in_memory(tmp_path, monkeypatch, capsys):
+    """Test that the in-memory path stops cleanly when validation leaves no rows"""
+    print("\n===== Testing In-Memory Path With No Valid Rows =====")
+
+    input_file = tmp_path / "bad.jsonl"
+    input_file.write_text("".join(json.dumps(row) + "\n" for row in RAW_ROWS[1:3]))
+    output_file = tmp_path / "train.jsonl"
+    monkeypatch.setattr(sys, "argv", [
+        "prepare_dataset.py", "--input_file", str(input_file), "--output_file", str(output_file),
+        "--validate", "--create_validation",
+    ])
+    prepare_dataset.main()
+
+    assert "No valid rows" in capsys.readouterr().out
+    assert not output_file.exists()
+    with open(tmp_path / "train_quarantine.jsonl") as f:
+        assert [json.loads(line)["row"] for line in f] == [0, 1]
+    print("✓ No split or sample attempted; both rows quarantined")
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+from functools import lru_cache
+
+# The constant segments of the Alpaca-style prompt every script uses
+INSTRUCTION_HEADER = "### Instruction:\n"
+INPUT_HEADER = "\n\n### Input:\n"
+RESPONSE_HEADER = "\n\n### Response:\n"
+
+# What precedes each segment in a prompt: every field follows a header ending
+# in a newline, and the input and response headers follow a field's last word
+FIELD_CONTEXT = "\n"
+HEADER_CONTEXT = "a"
+
+def has_input(input_text):
+    """True for a real input; None, NaN and empty or blank strings mean there is none."""
+    if input_text is None or (isinstance(input_text, float) and input_text != input_text):
+        return False
+    return bool(str(input_text).strip())
+
+def format_prompt(instruction, input_text=None):
+    """Format the instruction and input into a prompt."""
+    if has_input(input_text):
+        return f"{INSTRUCTION_HEADER}{instruction}{INPUT_HEADER}{input_text}{RESPONSE_HEADER}"
+    return f"{INSTRUCTION_HEADER}{instruction}{RESPONSE_HEADER}"
+
+def format_instruction(example):
+    """Format the instruction, input, and output into a training example."""
+    return format_prompt(example.get("instruction", ""), example.get("input")) + str(example.get("output", ""))
+
+class PromptTemplate:
+    """Builds prompt token ids from pre-tokenized template segments.
+
+    The headers are tokenized once; each prompt is the concatenation of the
+    header ids and the ids of its instruction, input and output, each
+    tokenized on its own. Training and generation both assemble prompts this
+    way, so the model sees the same ids in both, and the prompt's length in
+    tokens is known exactly: the response starts at that offset.
+
+    A segment is tokenized behind a context string standing in for the text
+    that precedes it in the prompt, and the context's ids are dropped. On its
+    own a SentencePiece tokenizer (Llama, Mistral) would add its "▁" dummy
+    prefix to every segment, and the ids would differ from tokenizing the
+    formatted prompt; with the context they are the same, as long as the
+    fields don't end in whitespace.
+    """
+
+    def __init__(self, tokenizer):
+        self.tokenizer = tokenizer
+        self._context_ids = {}
+        self.instruction_ids = self._encode(INSTRUCTION_HEADER)
+        self.input_ids = self._encode(INPUT_HEADER, HEADER_CONTEXT)
+        self.response_ids = self._encode(RESPONSE_HEADER, HEADER_CONTEXT)
+        # Keep the BOS token the tokenizer would add to a whole string
+        bos = tokenizer.bos_token_id
+        self.prefix_ids = [bos] if bos is not None and tokenizer("")["input_ids"][:1] == [bos] else []
+
+    def _encode(self, text, context=""):
+        return self._encode_batch([text], context)[0]
+
+    def _encode_batch(self, texts, context=""):
+        """Ids of each text as it tokenizes after context."""
+        if not texts:
+            return []
+        if not context:
+            return self.tokenizer(list(texts), add_special_tokens=False)["input_ids"]
+        if context not in self._context_ids:
+            self._context_ids[context] = self.tokenizer(context, add_special_tokens=False)["input_ids"]
+        context_ids = self._context_ids[context]
+        encoded = self.tokenizer([context + text for text in texts], add_special_tokens=False)["input_ids"]
+        ids = []
+        for text, text_ids in zip(texts, encoded):
+            if text_ids[:len(context_ids)] == context_ids:
+                ids.append(text_ids[len(context_ids):])
+            else:
+                # The context merged into the text's first token; fall back to the text alone
+                ids.append(self.tokenizer(text, add_special_tokens=False)["input_ids"])
+        return ids
+
+    def encode_prompts(self, instructions, inputs=None):
+        """Token ids of the prompts for parallel lists of instructions and inputs."""
+        inputs = inputs if inputs is not None else [None] * len(instructions)
+        instruction_ids = self._encode_batch([str(instruction) for instruction in instructions], FIELD_CONTEXT)
+        present = [i for i, input_text in enumerate(inputs) if has_input(input_text)]
+        input_ids = dict(zip(present, self._encode_batch([str(inputs[i]) for i in present], FIELD_CONTEXT)))
+
+        prompts = []
+        for i, ids in enumerate(instruction_ids):
+            prompt = self.prefix_ids + self.instruction_ids + ids
+            if i in input_ids:
+                prompt = prompt + self.input_ids + input_ids[i]
+            prompts.append(prompt + self.response_ids)
+        return prompts
+
+    def encode_prompt(self, instruction, input_text=None):
+        """Token ids of a single prompt."""
+        return self.encode_prompts([instruction], [input_text])[0]
+
+    def prompt_inputs(self, instructions, inputs=None, return_tensors="pt"):
+        """Padded model inputs for a batch of prompts, padded on the tokenizer's padding side.
+
+        With left padding every prompt ends at input_ids.shape[1], where the
+        generated tokens begin. A single prompt is not padded, so it needs no
+        pad token.
+        """
+        prompts = self.encode_prompts(instructions, inputs)
+        return self.tokenizer.pad({"input_ids": prompts}, padding=len(prompts) > 1, return_tensors=return_tensors)
+
+    def encode_examples(self, instructions, inputs, outputs, add_eos=False):
+        """Token ids of full training examples, and the length of each one's prompt."""
+        prompts = self.encode_prompts(instructions, inputs)
+        output_ids = self._encode_batch([str(output) for output in outputs], FIELD_CONTEXT)
+        eos = [self.tokenizer.eos_token_id] if add_eos and self.tokenizer.eos_token_id is not None else []
+        examples = [prompt + ids + eos for prompt, ids in zip(prompts, output_ids)]
+        return examples, [len(prompt) for prompt in prompts]
+
+    def responses(self, outputs, input_length, skip_special_tokens=True):
+        """Decode only what follows the prompts in a batch of generated sequences."""
+        return decode_new_tokens(self.tokenizer, outputs, input_length, skip_special_tokens)
+
+def new_token_ids(outputs, input_length):
+    """The ids generated after the input in every row of a [batch, length] output.
+
+    generate() returns each row as its (left-padded) input followed by the
+    new tokens, so the new tokens of the whole batch start at the input's
+    padded length.
+    """
+    return outputs[:, input_length:]
+
+def decode_new_tokens(tokenizer, outputs, input_length, skip_special_tokens=True):
+    """Decode only the generated tokens of every row in one batch_decode call.
+
+    The prompt is never decoded, so the cost no longer grows with its
+    length, and the response doesn't depend on the decoded prompt
+    round-tripping to the original text.
+    """
+    return tokenizer.batch_decode(new_token_ids(outputs, input_length), skip_special_tokens=skip_special_tokens)
+
+@lru_cache(maxsize=8)
+def prompt_template(tokenizer):
+    """Shared PromptTemplate per tokenizer, so the segments are tokenized once."""
+    return PromptTemplate(tokenizer)
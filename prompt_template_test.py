@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+Prompt Template Test for Octavia's training and generation scripts
+Checks the pre-tokenized prompts match tokenizing the formatted prompt, offline
+"""
+
+import pytest
+
+pytest.importorskip("tokenizers")
+pytest.importorskip("transformers")
+
+from tokenizers import Tokenizer, decoders, models, normalizers, pre_tokenizers, processors, trainers
+from transformers import PreTrainedTokenizerFast
+
+from prompt_template import PromptTemplate, format_instruction, format_prompt
+
+EXAMPLES = [
+    {"instruction": "Describe your morning ritual.", "input": "A rainy Tuesday in Paris",
+     "output": "Darling, my mornings begin with espresso, silk and blue lipstick."},
+    {"instruction": "What does luxury mean to you?", "input": "",
+     "output": "Luxury isn't what you have, sweetie. It's how completely you own who you are."},
+    {"instruction": "Review a gallery opening\nin two lines.", "input": float("nan"),
+     "output": "The canvases were brave,\nthe wine was not."},
+]
+
+CORPUS = [format_instruction(example) for example in EXAMPLES] * 20
+
+def gpt2_style_tokenizer():
+    """A byte-level BPE tokenizer like GPT-2's, trained on the examples."""
+    tokenizer = Tokenizer(models.BPE())
+    tokenizer.pre_tokenizer = pre_tokenizers.ByteLevel(add_prefix_space=False)
+    tokenizer.decoder = decoders.ByteLevel()
+    tokenizer.train_from_iterator(CORPUS, trainers.BpeTrainer(
+        vocab_size=400, special_tokens=["<|endoftext|>"], initial_alphabet=pre_tokenizers.ByteLevel.alphabet()))
+    return PreTrainedTokenizerFast(tokenizer_object=tokenizer, bos_token="<|endoftext|>", eos_token="<|endoftext|>")
+
+def llama_style_tokenizer():
+    """A SentencePiece-style BPE tokenizer like Llama's and Mistral's: "▁" dummy prefix, byte fallback, BOS."""
+    byte_tokens = [f"<0x{i:02X}>" for i in range(256)]
+    tokenizer = Tokenizer(models.BPE(unk_token="<unk>", byte_fallback=True, fuse_unk=True))
+    tokenizer.normalizer = normalizers.Sequence([normalizers.Prepend("▁"), normalizers.Replace(" ", "▁")])
+    tokenizer.decoder = decoders.Sequence([
+        decoders.Replace("▁", " "), decoders.ByteFallback(), decoders.Fuse(), decoders.Strip(" ", 1, 0)])
+    tokenizer.train_from_iterator([text.replace("\n", " ") for text in CORPUS], trainers.BpeTrainer(
+        vocab_size=500, special_tokens=["<unk>", "<s>", "</s>"] + byte_tokens))
+    tokenizer.post_processor = processors.TemplateProcessing(single="<s> $A", special_tokens=[("<s>", 1)])
+    return PreTrainedTokenizerFast(tokenizer_object=tokenizer, bos_token="<s>", eos_token="</s>", unk_token="<unk>")
+
+@pytest.mark.parametrize("make_tokenizer", [gpt2_style_tokenizer, llama_style_tokenizer])
+def test_prompts_match_formatted_prompt(make_tokenizer):
+    """Test that encode_prompt and encode_examples give the ids of the formatted strings"""
+    print(f"\n===== Testing Prompt Ids ({make_tokenizer.__name__}) =====")
+
+    tokenizer = make_tokenizer()
+    template = PromptTemplate(tokenizer)
+    for example in EXAMPLES:
+        expected = tokenizer(format_prompt(example["instruction"], example["input"]))["input_ids"]
+        assert template.encode_prompt(example["instruction"], example["input"]) == expected
+    print("✓ Prompts match with and without input")
+
+    instructions, inputs, outputs = zip(*[(e["instruction"], e["input"], e["output"]) for e in EXAMPLES])
+    examples, prompt_lengths = template.encode_examples(instructions, inputs, outputs)
+    for example, ids, prompt_length in zip(EXAMPLES, examples, prompt_lengths):
+        assert ids == tokenizer(format_instruction(example))["input_ids"]
+        assert tokenizer.decode(ids[prompt_length:]) == example["output"]
+    print("✓ Training examples match and split at the response")
+
+@pytest.mark.parametrize("make_tokenizer", [gpt2_style_tokenizer, llama_style_tokenizer])
+def test_prompt_inputs_without_pad_token(make_tokenizer):
+    """Test that a single prompt needs no pad token and a batch is left padded once one is set"""
+    print(f"\n===== Testing Prompt Inputs Without a Pad Token ({make_tokenizer.__name__}) =====")
+
+    tokenizer = make_tokenizer()
+    assert tokenizer.pad_token is None
+    template = PromptTemplate(tokenizer)
+    example = EXAMPLES[0]
+    inputs = template.prompt_inputs([example["instruction"]], [example["input"]], return_tensors="np")
+    assert inputs["input_ids"].tolist() == [template.encode_prompt(example["instruction"], example["input"])]
+    assert inputs["attention_mask"].all()
+    print("✓ A single prompt is not padded")
+
+    tokenizer.pad_token = tokenizer.eos_token
+    tokenizer.padding_side = "left"
+    instructions, inputs = zip(*[(e["instruction"], e["input"]) for e in EXAMPLES])
+    batch = template.prompt_inputs(instructions, inputs, return_tensors="np")
+    for row, mask, instruction, input_text in zip(batch["input_ids"], batch["attention_mask"], instructions, inputs):
+        assert row[mask == 1].tolist() == template.encode_prompt(instruction, input_text)
+        assert mask[-1] == 1
+    print("✓ A batch is left padded to a common length")
+
+if __name__ == "__main__":
+    for make_tokenizer in (gpt2_style_tokenizer, llama_style_tokenizer):
+        test_prompts_match_formatted_prompt(make_tokenizer)
+        test_prompt_inputs_without_pad_token(make_tokenizer)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+import os
+import json
+import argparse
+import torch
+from transformers import AutoConfig, AutoModelForCausalLM, AutoTokenizer
+
+QUANTIZED_WEIGHTS_NAME = "quantized_model.pt"
+QUANTIZATION_CONFIG_NAME = "quantization_config.json"
+
+# Supported weight quantization schemes and the torch dtype used for Linear weights
+QUANTIZATION_SCHEMES = {
+    "int8": torch.qint8,
+}
+
+def set_cpu_threads(num_threads=None):
+    """Use every physical core for intra-op parallelism unless told otherwise."""
+    if num_threads:
+        torch.set_num_threads(num_threads)
+    print(f"Using {torch.get_num_threads()} CPU threads")
+
+def quantize_model(model, scheme="int8"):
+    """Quantize the Linear layers of an fp32 model for CPU inference.
+
+    Weights are stored as int8 with per-tensor scales and activations are
+    quantized on the fly, so matmuls run on the fbgemm/onednn int8 kernels.
+    """
+    if scheme not in QUANTIZATION_SCHEMES:
+        raise ValueError(f"Unsupported quantization scheme: {scheme}")
+    model = model.float().cpu().eval()
+    return torch.ao.quantization.quantize_dynamic(
+        model, {torch.nn.Linear}, dtype=QUANTIZATION_SCHEMES[scheme]
+    )
+
+def save_quantized_model(model, output_dir, scheme="int8", tokenizer=None):
+    """Save a quantized model as config + quantized state dict."""
+    os.makedirs(output_dir, exist_ok=True)
+    model.config.save_pretrained(output_dir)
+    torch.save(model.state_dict(), os.path.join(output_dir, QUANTIZED_WEIGHTS_NAME))
+
+    quantization_config = {
+        "scheme": scheme,
+        "method": "dynamic",
+        "modules": ["Linear"],
+        "torch_version": torch.__version__,
+    }
+    with open(os.path.join(output_dir, QUANTIZATION_CONFIG_NAME), 'w') as f:
+        json.dump(quantization_config, f, indent=2)
+
+    if tokenizer is not None:
+        tokenizer.save_pretrained(output_dir)
+
+def is_quantized_model_dir(model_dir):
+    """Return True if model_dir was written by save_quantized_model."""
+    return os.path.isfile(os.path.join(model_dir, QUANTIZATION_CONFIG_NAME))
+
+def load_quantized_model(model_dir, trust_remote_code=True):
+    """Load a model saved by save_quantized_model for CPU inference."""
+    with open(os.path.join(model_dir, QUANTIZATION_CONFIG_NAME), 'r') as f:
+        quantization_config = json.load(f)
+
+    # Rebuild the module structure, swap in quantized Linear layers, then load the packed weights
+    config = AutoConfig.from_pretrained(model_dir, trust_remote_code=trust_remote_code)
+    model = AutoModelForCausalLM.from_config(config, torch_dtype=torch.float32, trust_remote_code=trust_remote_code)
+    model = quantize_model(model, quantization_config["scheme"])
+    # The packed params of dynamically quantized layers are not plain tensors, so the
+    # weights_only loader (torch.load's default since 2.6) rejects them. The file is
+    # one save_quantized_model wrote locally; only load quantized models you made.
+    state_dict = torch.load(os.path.join(model_dir, QUANTIZED_WEIGHTS_NAME), map_location="cpu", weights_only=False)
+    model.load_state_dict(state_dict)
+    model.eval()
+    return model
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model_dir", type=str, required=True, help="Merged fp32/fp16 model to quantize")
+    parser.add_argument("--output_dir", type=str, required=True, help="Output directory for the quantized model")
+    parser.add_argument("--scheme", type=str, default="int8", choices=sorted(QUANTIZATION_SCHEMES), help="Weight quantization scheme")
+    args = parser.parse_args()
+
+    print(f"Loading model: {args.model_dir}")
+    model = AutoModelForCausalLM.from_pretrained(
+        args.model_dir,
+        torch_dtype=torch.float32,
+        trust_remote_code=True,
+    )
+    tokenizer = AutoTokenizer.from_pretrained(args.model_dir, trust_remote_code=True)
+
+    print(f"Quantizing Linear layers to {args.scheme}...")
+    model = quantize_model(model, args.scheme)
+
+    print(f"Saving quantized model to {args.output_dir}")
+    save_quantized_model(model, args.output_dir, args.scheme, tokenizer)
+
+    print("Quantization complete!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+import time
+from dataclasses import dataclass, asdict
+
+import torch
+from transformers import AutoModelForCausalLM
+
+try:
+    from transformers import DynamicCache
+except ImportError:  # Older transformers only return legacy tuple caches
+    DynamicCache = None
+
+@dataclass
+class SpeculativeStats:
+    """Counters collected during one speculative generation."""
+    proposed_tokens: int = 0
+    accepted_tokens: int = 0
+    target_forward_passes: int = 0
+    new_tokens: int = 0
+    elapsed_s: float = 0.0
+
+    @property
+    def acceptance_rate(self):
+        return self.accepted_tokens / self.proposed_tokens if self.proposed_tokens else 0.0
+
+    @property
+    def tokens_per_target_pass(self):
+        return self.new_tokens / self.target_forward_passes if self.target_forward_passes else 0.0
+
+    @property
+    def tokens_per_second(self):
+        return self.new_tokens / self.elapsed_s if self.elapsed_s else 0.0
+
+    def to_dict(self):
+        stats = asdict(self)
+        stats.update(
+            acceptance_rate=self.acceptance_rate,
+            tokens_per_target_pass=self.tokens_per_target_pass,
+            tokens_per_second=self.tokens_per_second,
+        )
+        return stats
+
+def load_draft_model(draft_model_path, device="cpu", torch_dtype=torch.float32):
+    """Load the small draft model; it must share the main model's tokenizer."""
+    model = AutoModelForCausalLM.from_pretrained(draft_model_path, torch_dtype=torch_dtype, trust_remote_code=True)
+    return model.to(device).eval()
+
+def _cache_length(cache):
+    if cache is None:
+        return 0
+    if hasattr(cache, "get_seq_length"):
+        return cache.get_seq_length()
+    return cache[0][0].shape[-2]
+
+def _crop_cache(cache, length):
+    """Drop cached positions beyond `length` (the rejected draft tokens)."""
+    if cache is None or _cache_length(cache) <= length:
+        return cache
+    if hasattr(cache, "crop"):
+        cache.crop(length)
+        return cache
+    return tuple(tuple(t[..., :length, :] for t in layer) for layer in cache)
+
+def _forward(model, input_ids, cache):
+    """Run the uncached suffix of input_ids through model, returning logits and the extended cache."""
+    if cache is None and DynamicCache is not None:
+        cache = DynamicCache()
+    outputs = model(input_ids=input_ids, past_key_values=cache, use_cache=True)
+    return outputs.logits, outputs.past_key_values
+
+def _penalize_repetition(logits, context, penalty):
+    """Apply generate()'s repetition penalty to the logits of tokens already in context.
+
+    As in transformers' RepetitionPenaltyLogitsProcessor, a seen token's
+    positive logit is divided by the penalty and a negative one multiplied.
+    """
+    if penalty == 1.0:
+        return logits
+    logits = logits.float()
+    score = logits.gather(-1, context)
+    score = torch.where(score < 0, score * penalty, score / penalty)
+    return logits.scatter(-1, context, score)
+
+def _probs(logits, do_sample, temperature, top_k, top_p):
+    """Turn logits into the (warped) distribution tokens are drawn from."""
+    logits = logits.float()
+    if not do_sample:
+        return torch.nn.functional.one_hot(logits.argmax(-1), logits.shape[-1]).float()
+    logits = logits / max(temperature, 1e-5)
+    if top_k:
+        kth = torch.topk(logits, min(top_k, logits.shape[-1]), dim=-1).values[..., -1, None]
+        logits = logits.masked_fill(logits < kth, float("-inf"))
+    if top_p and top_p < 1.0:
+        sorted_logits, sorted_idx = torch.sort(logits, descending=True, dim=-1)
+        cumulative = sorted_logits.softmax(-1).cumsum(-1)
+        remove = cumulative - sorted_logits.softmax(-1) > top_p
+        logits = logits.masked_fill(remove.scatter(-1, sorted_idx, remove), float("-inf"))
+    return logits.softmax(-1)
+
+def speculative_generate(model, draft_model, input_ids, max_new_tokens=256, num_draft_tokens=4,
+                         do_sample=False, temperature=1.0, top_k=0, top_p=1.0, eos_token_id=None,
+                         repetition_penalty=1.0):
+    """Generate with a draft model proposing tokens that the main model verifies.
+
+    Each round the draft model proposes `num_draft_tokens` tokens, the main
+    model scores all of them in one forward pass, and the longest acceptable
+    prefix is kept plus one token from the main model. Greedy decoding gives
+    exactly the main model's greedy output; sampling uses the standard
+    speculative sampling acceptance rule so the output distribution is the
+    main model's. The repetition penalty is applied to both models' logits,
+    so the output matches generate() with the same penalty. Only batch size
+    1 is supported.
+    """
+    if input_ids.shape[0] != 1:
+        raise ValueError("speculative_generate only supports batch size 1")
+    eos_ids = set([eos_token_id] if isinstance(eos_token_id, int) else (eos_token_id or []))
+    stats = SpeculativeStats()
+    start = time.perf_counter()
+
+    ids = input_ids
+    prompt_length = ids.shape[1]
+    target_cache, draft_cache = None, None
+
+    with torch.no_grad():
+        while ids.shape[1] - prompt_length < max_new_tokens:
+            remaining = max_new_tokens - (ids.shape[1] - prompt_length)
+            k = min(num_draft_tokens, remaining - 1)
+
+            # Draft k tokens autoregressively with the small model
+            draft_tokens, draft_probs = [], []
+            draft_input = ids[:, _cache_length(draft_cache):]
+            for _ in range(k):
+                logits, draft_cache = _forward(draft_model, draft_input, draft_cache)
+                context = torch.cat([ids] + draft_tokens, dim=1)
+                logits = _penalize_repetition(logits[:, -1], context, repetition_penalty)
+                probs = _probs(logits, do_sample, temperature, top_k, top_p)
+                token = torch.multinomial(probs, 1) if do_sample else probs.argmax(-1, keepdim=True)
+                draft_tokens.append(token)
+                draft_probs.append(probs)
+                draft_input = token
+            drafts = torch.cat(draft_tokens, dim=1) if draft_tokens else ids[:, :0]
+
+            # Score the last accepted token and every draft token in one pass of the main model
+            target_input = torch.cat([ids[:, _cache_length(target_cache):], drafts], dim=1)
+            logits, target_cache = _forward(model, target_input, target_cache)
+            logits = logits[:, -(k + 1):]
+            if repetition_penalty != 1.0:
+                # Position j predicts the token after the accepted ids and the first j drafts
+                logits = torch.stack([
+                    _penalize_repetition(logits[:, j], torch.cat([ids, drafts[:, :j]], dim=1), repetition_penalty)
+                    for j in range(k + 1)
+                ], dim=1)
+            target_probs = _probs(logits, do_sample, temperature, top_k, top_p)
+            stats.target_forward_passes += 1
+            stats.proposed_tokens += k
+
+            # Keep the longest prefix of drafts the main model agrees with
+            accepted = 0
+            next_token = None
+            for i in range(k):
+                token = drafts[0, i]
+                p = target_probs[0, i, token]
+                q = draft_probs[i][0, token]
+                if do_sample:
+                    if torch.rand(()) < torch.clamp(p / q, max=1.0):
+                        accepted += 1
+                        continue
+                    residual = torch.clamp(target_probs[0, i] - draft_probs[i][0], min=0)
+                    residual_mass = residual.sum()
+                    if residual_mass > 0:
+                        next_token = torch.multinomial(residual / residual_mass, 1)
+                    else:
+                        # The two distributions agree here, so the main model's is the residual
+                        next_token = torch.multinomial(target_probs[0, i], 1)
+                elif p > 0:
+                    accepted += 1
+                    continue
+                else:
+                    next_token = target_probs[0, i].argmax(-1, keepdim=True)
+                break
+            if next_token is None:
+                # All drafts accepted: the main model contributes one bonus token
+                bonus = target_probs[0, k]
+                next_token = torch.multinomial(bonus, 1) if do_sample else bonus.argmax(-1, keepdim=True)
+            stats.accepted_tokens += accepted
+
+            new_tokens = torch.cat([drafts[:, :accepted], next_token.view(1, 1).to(ids.device)], dim=1)
+            hit_eos = [j for j, t in enumerate(new_tokens[0].tolist()) if t in eos_ids]
+            if hit_eos:
+                new_tokens = new_tokens[:, :hit_eos[0] + 1]
+            ids = torch.cat([ids, new_tokens], dim=1)
+
+            # Roll both caches back to the accepted sequence (minus the last token, fed next round)
+            target_cache = _crop_cache(target_cache, ids.shape[1] - 1)
+            draft_cache = _crop_cache(draft_cache, ids.shape[1] - 1)
+            if hit_eos:
+                break
+
+    stats.new_tokens = ids.shape[1] - prompt_length
+    stats.elapsed_s = time.perf_counter() - start
+    return ids, stats
+
+def measure_speedup(model, draft_model, input_ids, max_new_tokens=256, num_draft_tokens=4, eos_token_id=None,
+                    pad_token_id=None):
+    """Time greedy decoding with and without the draft model on the same prompt."""
+    start = time.perf_counter()
+    with torch.no_grad():
+        baseline = model.generate(
+            input_ids=input_ids,
+            attention_mask=torch.ones_like(input_ids),
+            max_new_tokens=max_new_tokens,
+            do_sample=False,
+            eos_token_id=eos_token_id,
+            pad_token_id=pad_token_id,
+        )
+    baseline_s = time.perf_counter() - start
+    baseline_tokens = baseline.shape[1] - input_ids.shape[1]
+
+    _, stats = speculative_generate(
+        model, draft_model, input_ids,
+        max_new_tokens=max_new_tokens,
+        num_draft_tokens=num_draft_tokens,
+        eos_token_id=eos_token_id,
+    )
+    baseline_tps = baseline_tokens / baseline_s if baseline_s else 0.0
+    return {
+        "baseline_s": baseline_s,
+        "baseline_tokens_per_second": baseline_tps,
+        "speculative": stats.to_dict(),
+        "speedup": stats.tokens_per_second / baseline_tps if baseline_tps else 0.0,
+    }
@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 # coding=utf-8
 
+import os
 import json
 import argparse
 import logging
@@ -19,8 +20,9 @@ from transformers import (
     set_seed,
     Trainer,
 )
-from datasets import load_dataset
+from datasets import DatasetDict, load_dataset
 from peft import LoraConfig
+from prompt_template import prompt_template
 
 logger = logging.getLogger(__name__)
 
@@ -80,15 +82,9 @@ def load_training_config(config_path: str) -> TrainingConfig:
     config_dict['greater_is_better'] = str(config_dict.get('greater_is_better', False)).lower() == 'true'
     return TrainingConfig(**config_dict)
 
-def format_instruction(example):
-    """Format the instruction, input, and output into a prompt."""
-    # Simplified formatting - adjust based on your actual data structure
-    # This assumes 'instruction', 'input', 'output' keys exist
-    prompt = f"### Instruction:\n{example.get('instruction', '')}"
-    if example.get("input"):
-        prompt += f"\n\n### Input:\n{example['input']}"
-    prompt += f"\n\n### Response:\n{example.get('output', '')}" # Include output for training
-    return prompt
+def dataset_builder(path: str) -> str:
+    """load_dataset builder for a data file: build_corpus.py writes Parquet or Arrow corpora, anything else is JSON/JSONL."""
+    return {".parquet": "parquet", ".arrow": "arrow"}.get(os.path.splitext(path)[1].lower(), "json")
 
 def preprocess_function(examples, tokenizer):
     """Preprocess the examples for training."""
@@ -106,14 +102,17 @@ def preprocess_function(examples, tokenizer):
     # and you need to handle labels carefully (masking prompt tokens)
     # The original preprocess function was attempting this, let's adapt it:
 
-    prompts = [format_instruction({"instruction": instruction, "input": inp, "output": out})
-               for instruction, inp, out in zip(examples["instruction"], examples.get("input", [None]*len(examples["instruction"])), examples["output"])]
-
-    tokenized_examples = tokenizer(
-        prompts,
-        truncation=True,
+    # Prompts are assembled from pre-tokenized template segments, exactly as
+    # inference.py and evaluate.py assemble them at generation time
+    num_examples = len(examples["instruction"])
+    input_ids, _ = prompt_template(tokenizer).encode_examples(
+        examples["instruction"], examples.get("input", [None] * num_examples), examples["output"]
+    )
+    max_length = tokenizer.model_max_length # Ensure tokenizer has this set
+    tokenized_examples = tokenizer.pad(
+        {"input_ids": [ids[:max_length] for ids in input_ids]},
         padding="max_length",
-        max_length=tokenizer.model_max_length, # Ensure tokenizer has this set
+        max_length=max_length,
         # return_tensors="pt", # Trainer handles tensor conversion
     )
     # For standard Trainer, labels are usually same as input_ids for LM fine-tuning
@@ -124,7 +123,7 @@ def preprocess_function(examples, tokenizer):
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--base_model", type=str, required=True, help="Base model to fine-tune")
-    parser.add_argument("--data_path", type=str, required=True, help="Path to training data JSONL")
+    parser.add_argument("--data_path", type=str, required=True, help="Path to training data (JSONL, or a .parquet/.arrow corpus from build_corpus.py)")
     parser.add_argument("--eval_data_path", type=str, default=None, help="Path to evaluation data JSONL")
     parser.add_argument("--output_dir", type=str, required=True, help="Output directory for model")
     parser.add_argument("--config_path", type=str, required=True, help="Path to training configuration JSON")
@@ -190,17 +189,24 @@ def main():
         data_files = {"train": args.data_path} # Use parsed arg
         if args.eval_data_path: # Use parsed arg
             data_files["validation"] = args.eval_data_path
-        dataset = load_dataset("json", data_files=data_files)
+        # Each split gets its own builder, so a Parquet/Arrow corpus can be paired with a JSONL eval file
+        dataset = DatasetDict({
+            split: load_dataset(dataset_builder(path), data_files=path)["train"]
+            for split, path in data_files.items()
+        })
         print("Dataset loaded:", dataset)
 
         print("Preprocessing dataset...")
         # Ensure preprocess function is defined above or imported
-        tokenized_dataset = dataset.map(
-            lambda examples: preprocess_function(examples, tokenizer),
-            batched=True,
-            # Dynamically get column names from the first available split
-            remove_columns=list(dataset.values())[0].column_names,
-        )
+        tokenized_dataset = DatasetDict({
+            split: split_dataset.map(
+                lambda examples: preprocess_function(examples, tokenizer),
+                batched=True,
+                # Splits may come from different formats (e.g. a corpus with id/source columns and a plain JSONL)
+                remove_columns=split_dataset.column_names,
+            )
+            for split, split_dataset in dataset.items()
+        })
         print("Dataset preprocessed:", tokenized_dataset)
     except Exception as e:
         logger.error(f"Error loading or processing dataset: {e}", exc_info=True) # Add traceback